@@ -0,0 +1,162 @@
+"""
+Бюджеты запросов к API для команд CLI и их проверка на моках
+
+Число запросов - главная характеристика производительности скриптов: лимит
+Yougile 50 req/min превращает каждый лишний запрос в секунду ожидания. Для
+каждой команды объявлен бюджет - максимум вызовов каждого endpoint'а в
+зависимости от размера данных (Shape). Тесты (test_api_budget.py) запускают
+команды против моков и проверяют, что бюджет не превышен, поэтому случайный
+N+1 (запрос на каждую колонку или задачу) падает в CI.
+"""
+import json
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from config import API_BASE_URL
+from fake_server import FakeState
+from metrics import endpoint_template
+from pagination import MAX_PAGE_SIZE
+
+
+@dataclass
+class Shape:
+    """Размер данных компании, от которого зависит бюджет"""
+    projects: int = 1
+    boards: int = 3        # досок в каждом проекте
+    columns: int = 4       # колонок на каждой доске
+    tasks: int = 60        # задач в компании (поровну по всем колонкам)
+    file_tasks: int = 5    # задач в markdown файле (import, update_descriptions)
+    subtasks: int = 2      # подзадач у каждой задачи файла
+
+    @property
+    def all_boards(self) -> int:
+        return self.projects * self.boards
+
+    @property
+    def all_columns(self) -> int:
+        return self.all_boards * self.columns
+
+    @property
+    def column_tasks(self) -> int:
+        return math.ceil(self.tasks / self.all_columns) if self.all_columns else 0
+
+    @property
+    def board_tasks(self) -> int:
+        return self.column_tasks * self.columns
+
+    def scaled(self, factor: int) -> 'Shape':
+        """Та же компания в factor раз больше по каждому измерению"""
+        return Shape(self.projects, self.boards * factor, self.columns * factor, self.tasks * factor,
+                     self.file_tasks * factor, self.subtasks)
+
+
+def pages(items: int) -> int:
+    """Запросов на полный обход списка (пустой список - тоже один запрос)"""
+    return max(1, math.ceil(items / MAX_PAGE_SIZE))
+
+
+# Команда -> {"МЕТОД шаблон": максимум вызовов}; не указанные endpoint'ы вызываться не должны
+BUDGETS: Dict[str, Callable[[Shape], Dict[str, int]]] = {
+    "projects list": lambda s: {"GET projects": pages(s.projects)},
+    "boards list": lambda s: {"GET boards": pages(s.all_boards)},
+    "tasks list": lambda s: {"GET task-list": pages(s.tasks)},
+    # O(досок) запросов колонок + число задач компании + задачи по колонкам проекта
+    # или, если колонок больше, чем страниц, один обход списка задач компании
+    "show_structure": lambda s: {
+        "GET projects/{id}": 1,
+        "GET boards": pages(s.boards),
+        "GET columns": s.boards * pages(s.columns),
+        "GET task-list": 1 + (pages(s.tasks) if s.boards * s.columns > math.ceil(s.tasks / MAX_PAGE_SIZE)
+                              else s.boards * s.columns * pages(s.column_tasks)),
+    },
+    # Задачи доски - с фильтром по колонке (колонок на доске мало, задач компании - много)
+    "clear_board": lambda s: {
+        "GET boards/{id}": 1,
+        "GET columns": pages(s.columns),
+        "GET task-list": s.columns * pages(s.column_tasks),
+        "PUT tasks/{id}": s.board_tasks,
+    },
+    "import": lambda s: {
+        "GET columns": pages(s.columns),
+        "POST tasks": s.file_tasks * (1 + s.subtasks),
+        "PUT tasks/{id}": s.file_tasks,
+    },
+    # Повторный импорт того же файла по разнице: только задачи колонки
+    "import --sync unchanged": lambda s: {"GET task-list": pages(s.file_tasks)},
+    "update_descriptions": lambda s: {
+        "GET columns": pages(s.columns),
+        "GET task-list": s.columns * pages(s.column_tasks + s.file_tasks),
+        "GET tasks/{id}": s.file_tasks * s.subtasks,
+        "PUT tasks/{id}": s.file_tasks * (1 + s.subtasks),
+    },
+    "sync refresh": lambda s: {
+        "GET projects": pages(s.projects),
+        "GET boards": pages(s.all_boards),
+        "GET columns": pages(s.all_columns),
+        "GET users": 1,
+        "GET task-list": pages(s.tasks),
+    },
+}
+
+
+def over_budget(counts: Dict[str, int], budget: Dict[str, int]) -> List[str]:
+    """Превышения бюджета: ['GET task-list: 12 > 1', ...]"""
+    return [f"{endpoint}: {n} > {budget.get(endpoint, 0)}"
+            for endpoint, n in sorted(counts.items()) if n > budget.get(endpoint, 0)]
+
+
+def assert_within_budget(command: str, counts: Dict[str, int], shape: Shape):
+    """AssertionError, если команда сделала больше запросов, чем объявлено в BUDGETS"""
+    problems = over_budget(counts, BUDGETS[command](shape))
+    if problems:
+        raise AssertionError(f"{command}: превышен бюджет запросов ({shape}):\n  " + "\n  ".join(problems))
+
+
+class MockedApi:
+    """
+    Моки Yougile API (responses) поверх FakeState с подсчётом запросов
+
+    Пример:
+        with MockedApi() as api:
+            created = api.state.seed(boards=3, columns=4, tasks=60)
+            api.reset()
+            show_project_structure(created["projects"][0], client)
+            assert_within_budget("show_structure", api.counts, shape)
+    """
+
+    def __init__(self, state: Optional[FakeState] = None, base_url: str = API_BASE_URL):
+        self.state = state or FakeState()
+        self.base_url = base_url.rstrip('/')
+        self.counts: Counter = Counter()
+        self._mock = None
+
+    def __enter__(self) -> 'MockedApi':
+        import responses
+        self._mock = responses.RequestsMock(assert_all_requests_are_fired=False)
+        pattern = re.compile(re.escape(self.base_url) + r"/.*")
+        for method in ("GET", "POST", "PUT", "DELETE"):
+            self._mock.add_callback(method, pattern, callback=self._respond)
+        self._mock.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._mock.stop()
+        self._mock.reset()
+
+    def reset(self):
+        """Обнулить счётчики (например, после подготовки данных)"""
+        self.counts.clear()
+
+    def _respond(self, request):
+        parts = urlsplit(request.url)
+        endpoint = parts.path[len(urlsplit(self.base_url).path):].strip('/')
+        self.counts[f"{request.method} {endpoint_template(endpoint)}"] += 1
+        body = json.loads(request.body) if request.body else {}
+        status, result, _ = self.state.handle(request.method, endpoint, parse_qs(parts.query), body)
+        if status >= 400:
+            result = {"statusCode": status, "error": result}
+        return status, {"Content-Type": "application/json"}, json.dumps(result, ensure_ascii=False)
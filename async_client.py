@@ -0,0 +1,118 @@
+"""
+Асинхронный клиент для работы с Yougile API
+"""
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Iterable, List, Optional
+
+from yougile_client import YougileClient
+
+# Методы YougileClient, доступные в асинхронном варианте
+_RESOURCE_METHODS = (
+    "get", "post", "put", "delete",
+    "get_projects", "get_project", "create_project", "update_project", "delete_project",
+    "get_boards", "get_board", "create_board", "update_board", "delete_board",
+    "get_columns", "get_column", "create_column", "update_column", "delete_column",
+    "get_tasks", "get_task", "create_task", "update_task", "delete_task",
+    "get_users", "get_user",
+    "get_company",
+)
+
+
+class AsyncYougileClient:
+    """
+    Асинхронный клиент Yougile API на asyncio
+
+    Запросы выполняются синхронным YougileClient в пуле потоков, поэтому
+    все корутины используют один пул соединений requests.Session и один
+    ограничитель частоты. Независимые запросы, запущенные через
+    asyncio.gather, перекрывают сетевые задержки, а не складывают их.
+
+    Пример:
+        async with AsyncYougileClient() as client:
+            board, columns = await asyncio.gather(
+                client.get_board(board_id), client.get_columns())
+    """
+
+    def __init__(self, api_key: Optional[str] = None, client: Optional[YougileClient] = None,
+                 concurrency: Optional[int] = None, **client_kwargs):
+        """
+        Args:
+            api_key: API ключ (если не указан, берется из переменных окружения)
+            client: Готовый синхронный клиент (его пул и ограничитель будут общими)
+            concurrency: Максимум одновременных запросов (по умолчанию client.concurrency)
+            **client_kwargs: Параметры YougileClient, если client не передан
+        """
+        self._owns_client = client is None
+        self.client = client or YougileClient(api_key, concurrency=concurrency, **client_kwargs)
+        self.concurrency = concurrency or self.client.concurrency
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                            thread_name_prefix="yougile")
+
+    @property
+    def rate_limiter(self):
+        """Общий с синхронным клиентом ограничитель частоты"""
+        return self.client.rate_limiter
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Выполнить синхронную функцию в пуле потоков клиента"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(func, *args, **kwargs))
+
+    async def gather(self, calls: Iterable[Awaitable[Any]], return_exceptions: bool = False) -> List[Any]:
+        """
+        Выполнить корутины одновременно, сохранив порядок результатов
+
+        Args:
+            calls: Корутины (например, [client.get_board(id) for id in ids])
+            return_exceptions: Возвращать исключения в списке вместо проброса
+        """
+        return list(await asyncio.gather(*calls, return_exceptions=return_exceptions))
+
+    def close(self):
+        """Остановить пул потоков (и закрыть HTTP сессию, если клиент создан здесь)"""
+        self._executor.shutdown(wait=True)
+        if self._owns_client:
+            self.client.session.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.close()
+
+
+def _async_method(name: str):
+    sync_method = getattr(YougileClient, name)
+
+    @functools.wraps(sync_method)
+    async def method(self, *args, **kwargs):
+        return await self.run(getattr(self.client, name), *args, **kwargs)
+
+    return method
+
+
+for _name in _RESOURCE_METHODS:
+    setattr(AsyncYougileClient, _name, _async_method(_name))
+
+
+def run_concurrently(client: YougileClient, calls: Iterable[Callable[[], Any]],
+                     return_exceptions: bool = False) -> List[Any]:
+    """
+    Выполнить независимые вызовы клиента одновременно из синхронного кода
+
+    Args:
+        client: Синхронный клиент (его пул и ограничитель используются совместно)
+        calls: Функции без аргументов, например lambda: client.get_board(board_id)
+        return_exceptions: Возвращать исключения в списке вместо проброса
+
+    Returns:
+        Результаты в порядке calls
+    """
+    async def _run():
+        async with AsyncYougileClient(client=client) as async_client:
+            return await async_client.gather([async_client.run(call) for call in calls],
+                                             return_exceptions=return_exceptions)
+
+    return asyncio.run(_run())
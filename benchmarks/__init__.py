@@ -0,0 +1,3 @@
+"""
+Бенчмарки клиента Yougile API
+"""
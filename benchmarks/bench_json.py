@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Бенчмарк разбора и кодирования JSON на синтетической выгрузке задач
+
+Запуск:
+    python -m benchmarks.bench_json [--tasks 40000] [--page-size 1000] [--repeat 3]
+
+Сравнивается прежний путь (response.json() и json= в requests) с
+сериализаторами из serializer.py, которые работают прямо с байтами ответа.
+"""
+import argparse
+import gc
+import json
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+import requests
+
+from serializer import JsonSerializer, OrjsonSerializer, orjson
+
+
+def make_task(number: int, rng: random.Random) -> Dict[str, Any]:
+    """Задача, похожая на настоящую: длинное HTML описание, подзадачи, стикеры"""
+    paragraphs = "".join(
+        f"<p>Шаг {i}: {'проверить и обновить данные ' * rng.randint(3, 12)}</p>"
+        for i in range(rng.randint(2, 8))
+    )
+    return {
+        "id": f"{number:08d}-0000-4000-8000-{rng.getrandbits(48):012x}",
+        "title": f"Задача №{number}: импорт данных",
+        "columnId": f"column-{number % 20}",
+        "description": f"<h3>Описание</h3>{paragraphs}<ul><li>Критерий</li><li>Критерий</li></ul>",
+        "archived": False,
+        "completed": rng.random() < 0.3,
+        "deleted": False,
+        "subtasks": [f"subtask-{number}-{i}" for i in range(rng.randint(0, 5))],
+        "assigned": [f"user-{rng.randint(1, 50)}"],
+        "createdBy": "user-1",
+        "timestamp": 1_700_000_000_000 + number * 1000,
+        "stickers": {f"sticker-{i}": f"state-{rng.randint(1, 4)}" for i in range(3)},
+    }
+
+
+def make_pages(total: int, page_size: int, seed: int = 42) -> List[bytes]:
+    """Страницы task-list в том виде, в каком их отдаёт API"""
+    rng = random.Random(seed)
+    tasks = [make_task(i, rng) for i in range(total)]
+    pages = []
+    for offset in range(0, total, page_size):
+        content = tasks[offset:offset + page_size]
+        page = {
+            "paging": {"count": len(content), "limit": page_size, "offset": offset,
+                       "next": offset + page_size < total},
+            "content": content,
+        }
+        pages.append(json.dumps(page, ensure_ascii=False).encode('utf-8'))
+    return pages
+
+
+def as_response(body: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+
+def best_of(repeat: int, func: Callable[[], Any]) -> float:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарк JSON сериализаторов")
+    parser.add_argument('--tasks', type=int, default=40000, help='Количество задач (по умолчанию 40000)')
+    parser.add_argument('--page-size', type=int, default=1000, help='Размер страницы (по умолчанию 1000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Повторов, берётся лучший (по умолчанию 3)')
+    args = parser.parse_args()
+
+    print(f"Генерация {args.tasks} задач...")
+    pages = make_pages(args.tasks, args.page_size)
+    size_mb = sum(len(p) for p in pages) / 1024 / 1024
+    print(f"Страниц: {len(pages)}, объём: {size_mb:.1f} МБ\n")
+
+    # Каждый раз новые объекты Response: requests кэширует только _content, не разбор
+    def requests_json():
+        for body in pages:
+            as_response(body).json()
+
+    decoders = [("response.json()", requests_json)]
+    serializers = [JsonSerializer()] + ([OrjsonSerializer()] if orjson is not None else [])
+    for serializer in serializers:
+        decoders.append((f"{serializer.name}.loads(content)",
+                         lambda s=serializer: [s.loads(as_response(body).content) for body in pages]))
+
+    documents = [JsonSerializer().loads(body) for body in pages]
+    encoders = [("requests json=", lambda: [requests.Request("POST", "http://x", json=d).prepare()
+                                            for d in documents])]
+    for serializer in serializers:
+        encoders.append((f"{serializer.name}.dumps", lambda s=serializer: [s.dumps(d) for d in documents]))
+
+    for title, candidates in (("Разбор ответов", decoders), ("Кодирование тел запросов", encoders)):
+        print(title)
+        print(f"  {'Способ':<28} {'Время, с':>10} {'МБ/с':>10} {'Ускорение':>10}")
+        baseline = None
+        for name, func in candidates:
+            seconds = best_of(args.repeat, func)
+            baseline = baseline or seconds
+            print(f"  {name:<28} {seconds:>10.3f} {size_mb / seconds:>10.1f} {baseline / seconds:>9.1f}x")
+        print()
+
+    if orjson is None:
+        print("orjson не установлен: pip install orjson")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,375 @@
+#!/usr/bin/env python3
+"""
+Бенчмарки клиента и скриптов против локального fake_server.py
+
+Запуск:
+    python -m benchmarks.suite                    # сравнить с baseline
+    python -m benchmarks.suite --save-baseline    # записать новый baseline
+    python -m benchmarks.suite --check            # код выхода 1 при регрессии
+    python -m benchmarks.suite --only pagination import
+
+Для каждой операции выводятся время, число запросов к API (по данным сервера)
+и пиковая память (tracemalloc). Сервер работает в отдельном процессе, чтобы
+его потоки и память не искажали измерения клиента.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+# Число запросов детерминировано и хранится в репозитории
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Время и память зависят от машины: baseline снимается локально и не коммитится
+LOCAL_BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.local.json")
+
+# Поля результата, попадающие в каждый из файлов baseline
+CALL_FIELDS = ("calls", "calls_by_endpoint")
+LOCAL_FIELDS = ("seconds", "peak_mb")
+
+# Допустимый рост времени и памяти относительно baseline (число запросов должно совпадать)
+TOLERANCE = 0.25
+# Разница во времени меньше этой не считается регрессией (шум измерений)
+MIN_SECONDS_DELTA = 0.1
+
+
+# === Синтетические данные ===
+
+def make_markdown_text(paragraphs: int, rng: random.Random) -> str:
+    """Markdown описание: абзацы, списки, жирный текст и блоки кода"""
+    parts = []
+    for i in range(paragraphs):
+        kind = i % 4
+        if kind == 0:
+            parts.append(f"Шаг {i}: **проверить** данные и {'обновить записи ' * rng.randint(2, 8)}")
+        elif kind == 1:
+            parts.append("\n".join(f"- пункт {j} <важно> & срочно" for j in range(rng.randint(2, 6))))
+        elif kind == 2:
+            parts.append("\n".join(f"{j + 1}. действие {j}" for j in range(rng.randint(2, 5))))
+        else:
+            parts.append("```\n" + "\n".join(f"run --step {j}" for j in range(rng.randint(2, 6))) + "\n```")
+    return "\n\n".join(parts)
+
+
+def make_markdown_file(tasks: int, subtasks: int, seed: int = 42) -> str:
+    """Файл задач в формате parse_markdown_tasks"""
+    rng = random.Random(seed)
+    lines = []
+    for t in range(1, tasks + 1):
+        lines.append(f"## Задача {t}: Импорт данных {t}")
+        lines.append(f"**Заголовок:** Задача импорта №{t}")
+        lines.append(f"**Описание:** Перенести **данные** блока {t} - {'проверить поля ' * rng.randint(1, 6)}")
+        lines.append("**Подзадачи:**")
+        for s in range(1, subtasks + 1):
+            lines.append(f"### Подзадача {t}.{s}: Шаг {s} задачи {t}")
+            lines.append("**Описание:**")
+            lines.append("```")
+            lines.append(make_markdown_text(rng.randint(2, 6), rng))
+            lines.append("```")
+        lines.append("")
+    return "\n".join(lines)
+
+
+# === Сервер в отдельном процессе ===
+
+def _serve(connection, latency: float):
+    from fake_server import FakeYougileServer
+    server = FakeYougileServer(latency=latency, rate_limit=None)
+    server.start()
+    connection.send(server.url)
+    while True:
+        command, arguments = connection.recv()
+        if command == "seed":
+            connection.send(server.state.seed(**arguments))
+        elif command == "calls":
+            connection.send({f"{method} {template}": n for (method, template), n in server.calls.items()})
+        elif command == "reset":
+            server.reset_stats()
+            connection.send(None)
+        else:
+            server.stop()
+            connection.send(None)
+            return
+
+
+class ServerProcess:
+    """FakeYougileServer в дочернем процессе, управление через Pipe"""
+
+    def __init__(self, latency: float = 0.0):
+        self._connection, child = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(target=_serve, args=(child, latency), daemon=True)
+        self._process.start()
+        self.url = self._connection.recv()
+
+    def call(self, command: str, **arguments) -> Any:
+        self._connection.send((command, arguments))
+        return self._connection.recv()
+
+    def close(self):
+        self.call("stop")
+        self._process.join(timeout=5)
+
+
+@contextlib.contextmanager
+def pointed_at(url: str):
+    """Все YougileClient() внутри скриптов обращаются к fake серверу без лимита частоты"""
+    with patch.multiple("yougile_client", API_BASE_URL=url, YOUGILE_API_KEY="bench",
+                        RATE_LIMIT_REQUESTS=10 ** 9, RATE_LIMIT_STATE=None, CACHE_DIR=None,
+                        PAGING_STATS_FILE=None, STATS_FILE=None):
+        yield
+
+
+# === Измерение ===
+
+def measure(func: Callable[[], Any], server: Optional[ServerProcess], repeat: int = 1) -> Dict[str, Any]:
+    """
+    Запросы к API и пик памяти - по первому запуску под tracemalloc; время - лучшее
+    из остальных repeat запусков (tracemalloc заметно замедляет код). При repeat=1
+    (операции, меняющие данные) время берётся из единственного запуска.
+    """
+    timings = []
+    calls: Dict[str, int] = {}
+    peak = 0
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        for attempt in range(repeat + 1 if repeat > 1 else 1):
+            gc.collect()
+            if server:
+                server.call("reset")
+            if attempt == 0:
+                tracemalloc.start()
+            started = time.perf_counter()
+            with contextlib.redirect_stdout(devnull):
+                func()
+            elapsed = time.perf_counter() - started
+            if attempt == 0:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                calls = server.call("calls") if server else {}
+            if attempt > 0 or repeat == 1:
+                timings.append(elapsed)
+    return {
+        "seconds": round(min(timings), 4),
+        "calls": sum(calls.values()),
+        "calls_by_endpoint": dict(sorted(calls.items())),
+        "peak_mb": round(peak / 1024 / 1024, 2),
+    }
+
+
+def run_suite(params: Dict[str, Any], only: Optional[List[str]] = None,
+              progress: Callable[[str], None] = lambda line: None) -> Dict[str, Dict[str, Any]]:
+    """
+    Выполнить бенчмарки
+
+    Args:
+        params: Размеры данных (см. DEFAULT_PARAMS)
+        only: Выполнить только эти операции
+        progress: Вывод хода выполнения
+
+    Returns:
+        {операция: {"seconds", "calls", "calls_by_endpoint", "peak_mb"}}
+    """
+    from clear_board import clear_board
+    from import_tasks import create_tasks_in_yougile, markdown_to_html, parse_markdown_tasks
+    from show_structure import show_project_structure
+    from update_descriptions import update_task_descriptions
+    from yougile_client import YougileClient
+
+    wanted = set(only or OPERATIONS)
+    results: Dict[str, Dict[str, Any]] = {}
+    repeat = params["repeat"]
+
+    def run(name: str, func: Callable[[], Any], server=None, times: int = 1):
+        if name in wanted:
+            progress(f"  {name}...")
+            results[name] = measure(func, server, times)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "tasks.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_markdown_file(params["markdown_tasks"], params["subtasks"]))
+        document = make_markdown_text(params["markdown_paragraphs"], random.Random(7))
+
+        run("parse_markdown_tasks", lambda: parse_markdown_tasks(path), times=repeat)
+        run("markdown_to_html", lambda: markdown_to_html(document), times=repeat)
+        parsed = parse_markdown_tasks(path)
+
+    if not wanted & {"pagination", "show_structure", "import", "update_descriptions", "clear_board"}:
+        return results
+
+    server = ServerProcess(params["latency"])
+    try:
+        created = server.call("seed", projects=1, boards=params["boards"], columns=params["columns"],
+                              tasks=params["tasks"])
+        project_id = created["projects"][0]
+        with pointed_at(server.url):
+            run("pagination", lambda: YougileClient().get_tasks(all_pages=True), server, repeat)
+            run("show_structure", lambda: show_project_structure(project_id), server, repeat)
+
+            # Отдельная доска для импорта, обновления описаний и очистки
+            setup = YougileClient()
+            board_id = setup.create_board("Импорт", projectId=project_id)["id"]
+            column_id = setup.create_column("Backlog", board_id)["id"]
+            to_import = parsed[:params["import_tasks"]]
+            run("import", lambda: create_tasks_in_yougile(to_import, board_id, column_id), server)
+            run("update_descriptions", lambda: update_task_descriptions(to_import, board_id), server)
+            run("clear_board", lambda: clear_board(board_id, confirm=False), server)
+    finally:
+        server.close()
+    return results
+
+
+OPERATIONS = ("parse_markdown_tasks", "markdown_to_html", "pagination", "show_structure",
+              "import", "update_descriptions", "clear_board")
+
+DEFAULT_PARAMS = {
+    "tasks": 20000,             # задач в компании (pagination, show_structure)
+    "boards": 4,
+    "columns": 5,
+    "import_tasks": 100,        # задач для import / update_descriptions / clear_board
+    "subtasks": 3,              # подзадач у каждой задачи файла
+    "markdown_tasks": 5000,     # задач в файле для parse_markdown_tasks
+    "markdown_paragraphs": 20000,  # блоков в документе для markdown_to_html
+    "latency": 0.0,
+    "repeat": 5,
+}
+
+
+# === Baseline ===
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float = TOLERANCE) -> Dict[str, List[str]]:
+    """
+    Регрессии по операциям: больше запросов, время или память сверх допуска
+
+    Время и память сравниваются, только если они есть в baseline (локальном).
+    """
+    regressions: Dict[str, List[str]] = {}
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        problems = []
+        if "calls" in previous and current["calls"] > previous["calls"]:
+            problems.append(f"запросов {previous['calls']} → {current['calls']}")
+        if ("seconds" in previous and current["seconds"] > previous["seconds"] * (1 + tolerance)
+                and current["seconds"] - previous["seconds"] >= MIN_SECONDS_DELTA):
+            problems.append(f"время {previous['seconds']:.3f}с → {current['seconds']:.3f}с")
+        if ("peak_mb" in previous and current["peak_mb"] > previous["peak_mb"] * (1 + tolerance)
+                and current["peak_mb"] - previous["peak_mb"] >= 1):
+            problems.append(f"память {previous['peak_mb']:.1f} → {current['peak_mb']:.1f} МБ")
+        if problems:
+            regressions[name] = problems
+    return regressions
+
+
+def _delta(current: float, previous: Optional[float]) -> str:
+    if not previous:
+        return ""
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def format_results(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]]) -> str:
+    lines = [f"{'Операция':<22} {'Время, с':>9} {'Δ':>6} {'Запросов':>9} {'Δ':>6} {'Память, МБ':>11} {'Δ':>6}"]
+    for name, current in results.items():
+        previous = baseline.get(name, {})
+        lines.append(f"{name:<22} {current['seconds']:>9.3f} {_delta(current['seconds'], previous.get('seconds')):>6} "
+                     f"{current['calls']:>9} {_delta(current['calls'], previous.get('calls')):>6} "
+                     f"{current['peak_mb']:>11.2f} {_delta(current['peak_mb'], previous.get('peak_mb')):>6}")
+    return "\n".join(lines)
+
+
+def load_baseline(path: str, params: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Результаты baseline (пусто, если файла нет или он снят с другими параметрами)"""
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if data.get("params") != params:
+        print(f"⚠️  Baseline снят с другими параметрами, сравнение пропущено: {data.get('params')}")
+        return {}
+    return data.get("results", {})
+
+
+def merge_baselines(calls: Dict[str, Dict[str, Any]],
+                    local: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Число запросов из общего baseline, время и память - из локального"""
+    merged: Dict[str, Dict[str, Any]] = {}
+    for name in {**local, **calls}:
+        merged[name] = {**{k: v for k, v in local.get(name, {}).items() if k in LOCAL_FIELDS},
+                        **{k: v for k, v in calls.get(name, {}).items() if k in CALL_FIELDS}}
+    return merged
+
+
+def save_baseline(path: str, params: Dict[str, Any], results: Dict[str, Dict[str, Any]],
+                  fields: tuple, partial: bool = False):
+    """
+    Записать поля fields результатов в файл baseline
+
+    Args:
+        partial: Выполнена часть операций - остальные записи файла сохраняются
+    """
+    saved = {}
+    if partial and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            saved = json.load(f).get("results", {})
+    saved.update({name: {k: result[k] for k in fields} for name, result in results.items()})
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"params": params, "results": saved}, f, ensure_ascii=False, indent=2)
+        f.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Бенчмарки клиента и скриптов против fake_server.py")
+    parser.add_argument('--only', nargs='+', choices=OPERATIONS, help='Выполнить только эти операции')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='Baseline числа запросов (по умолчанию benchmarks/baseline.json)')
+    parser.add_argument('--local-baseline', default=LOCAL_BASELINE_FILE,
+                        help='Baseline времени и памяти этой машины (по умолчанию benchmarks/baseline.local.json)')
+    parser.add_argument('--save-baseline', action='store_true', help='Записать результаты как новый baseline')
+    parser.add_argument('--check', action='store_true', help='Код выхода 1, если есть регрессии')
+    for name, value in DEFAULT_PARAMS.items():
+        parser.add_argument(f"--{name.replace('_', '-')}", type=type(value), default=value,
+                            help=f'(по умолчанию {value})')
+    args = parser.parse_args()
+    params = {name: getattr(args, name) for name in DEFAULT_PARAMS}
+
+    print(f"Бенчмарки: {', '.join(args.only or OPERATIONS)}")
+    results = run_suite(params, args.only, progress=print)
+    local = load_baseline(args.local_baseline, params)
+    baseline = merge_baselines(load_baseline(args.baseline, params), local)
+
+    print()
+    print(format_results(results, baseline))
+
+    if args.save_baseline:
+        save_baseline(args.baseline, params, results, CALL_FIELDS, partial=bool(args.only))
+        save_baseline(args.local_baseline, params, results, LOCAL_FIELDS, partial=bool(args.only))
+        print(f"\n✓ Baseline сохранён: {args.baseline} (запросы), {args.local_baseline} (время, память)")
+        return
+
+    if not local:
+        print(f"\nℹ️  Локального baseline нет ({args.local_baseline}): время и память не сравниваются.")
+        print("   Снимите его на этой машине до изменений: python -m benchmarks.suite --save-baseline")
+
+    regressions = compare(results, baseline)
+    if regressions:
+        print("\n✗ Регрессии:")
+        for name, problems in regressions.items():
+            print(f"   {name}: {'; '.join(problems)}")
+        if args.check:
+            sys.exit(1)
+    elif baseline:
+        print("\n✓ Регрессий нет")
+
+
+if __name__ == "__main__":
+    main()
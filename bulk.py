@@ -0,0 +1,263 @@
+"""
+Массовые операции: пул потоков, результаты по каждому элементу, прогресс и остановка при ошибках
+"""
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Optional, TextIO, Tuple
+
+from planner import format_duration
+
+OK = "ok"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+# Остановка по умолчанию: больше половины операций завершились ошибкой
+# (обычно это не случайный сбой, а неверный ключ, доска или права)
+DEFAULT_FAILURE_RATE = 0.5
+# Доля ошибок проверяется только после стольких операций
+DEFAULT_MIN_SAMPLE = 20
+
+
+class Skip(Exception):
+    """Операция пропущена (например, задача не найдена); текст - причина"""
+
+
+@dataclass
+class ItemResult:
+    """Результат операции над одним элементом"""
+    index: int
+    item: Any
+    status: str
+    value: Any = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == OK
+
+
+@dataclass
+class BulkReport:
+    """Итоги массовой операции"""
+    total: Optional[int] = None
+    results: List[ItemResult] = field(default_factory=list)
+    ok: int = 0
+    failed: int = 0
+    skipped: int = 0
+    elapsed: float = 0.0
+    aborted: Optional[str] = None
+
+    @property
+    def done(self) -> int:
+        return self.ok + self.failed + self.skipped
+
+    @property
+    def throughput(self) -> float:
+        """Операций в секунду"""
+        return self.done / self.elapsed if self.elapsed > 0 else 0.0
+
+    def eta(self) -> Optional[float]:
+        """Оставшееся время в секундах (None, если неизвестно число операций или темп)"""
+        if self.total is None or not self.throughput:
+            return None
+        return max(0, self.total - self.done) / self.throughput
+
+    def add(self, result: ItemResult):
+        self.results.append(result)
+        if result.status == OK:
+            self.ok += 1
+        elif result.status == FAILED:
+            self.failed += 1
+        else:
+            self.skipped += 1
+
+    def failures(self) -> List[ItemResult]:
+        return [r for r in self.results if r.status == FAILED]
+
+
+class BulkExecutor:
+    """
+    Выполнение потока независимых операций в пуле потоков
+
+    Операции - пары (элемент, функция без аргументов). Функции обычно вызывают
+    методы YougileClient, поэтому темп запросов задаёт общий ограничитель
+    частоты клиента, а размер пула - его concurrency. Поток операций читается
+    лениво (в работе не больше 2 x concurrency), результаты передаются в
+    on_result в исходном порядке из основного потока - вывод не перемешивается.
+
+    Функция может бросить Skip, чтобы пометить элемент пропущенным. Если
+    ошибок больше порога, новые операции не запускаются, уже начатые
+    завершаются и попадают в отчёт, report.aborted содержит причину.
+    """
+
+    def __init__(self, client=None, concurrency: Optional[int] = None,
+                 max_failures: Optional[int] = None,
+                 max_failure_rate: Optional[float] = DEFAULT_FAILURE_RATE,
+                 min_sample: int = DEFAULT_MIN_SAMPLE,
+                 on_result: Optional[Callable[[ItemResult], None]] = None,
+                 progress: Optional[TextIO] = None, progress_interval: float = 10.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            client: YougileClient, чьи concurrency и ограничитель используют операции
+            concurrency: Потоков (по умолчанию client.concurrency, без клиента - 1)
+            max_failures: Остановиться после стольких ошибок (None - не ограничено)
+            max_failure_rate: Остановиться, если доля ошибок выше (None - не проверять)
+            min_sample: Минимум завершённых операций для проверки доли ошибок
+            on_result: Вызывается для каждого результата в порядке операций
+            progress: Куда выводить темп и оставшееся время (по умолчанию stderr)
+            progress_interval: Как часто выводить прогресс, секунды (0 - не выводить)
+            clock: Источник времени (для тестов)
+        """
+        self.concurrency = max(1, concurrency or getattr(client, 'concurrency', 1))
+        self.max_failures = max_failures
+        self.max_failure_rate = max_failure_rate
+        self.min_sample = min_sample
+        self.on_result = on_result
+        self.progress = progress
+        self.progress_interval = progress_interval
+        self.clock = clock
+
+    def run(self, operations: Iterable[Tuple[Any, Callable[[], Any]]],
+            total: Optional[int] = None) -> BulkReport:
+        """
+        Выполнить операции
+
+        Args:
+            operations: Пары (элемент, функция без аргументов)
+            total: Число операций для оценки оставшегося времени (по умолчанию len(operations))
+
+        Returns:
+            BulkReport с результатами в порядке операций
+        """
+        if total is None and hasattr(operations, '__len__'):
+            total = len(operations)
+        report = BulkReport(total=total)
+        started = self.clock()
+        last_progress = started
+        pending = iter(enumerate(operations))
+        window: deque = deque()
+        exhausted = False
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as pool:
+            try:
+                while True:
+                    while not exhausted and report.aborted is None and len(window) < self.concurrency * 2:
+                        entry = next(pending, None)
+                        if entry is None:
+                            exhausted = True
+                        else:
+                            index, (item, func) = entry
+                            window.append((index, item, pool.submit(_call, func)))
+                    if not window:
+                        break
+
+                    index, item, future = window.popleft()
+                    if future.cancelled():
+                        continue
+                    status, value, error, latency = future.result()
+                    result = ItemResult(index, item, status, value, error, latency)
+                    report.add(result)
+                    now = self.clock()
+                    report.elapsed = now - started
+                    if self.on_result:
+                        self.on_result(result)
+                    if report.aborted is None:
+                        report.aborted = self._abort_reason(report)
+                        if report.aborted:
+                            # Ещё не начатые отменяем, уже начатые дожидаемся
+                            for _, _, queued in window:
+                                queued.cancel()
+
+                    if self.progress_interval and now - last_progress >= self.progress_interval:
+                        last_progress = now
+                        self._print_progress(report)
+            finally:
+                for _, _, future in window:
+                    future.cancel()
+
+        report.elapsed = self.clock() - started
+        return report
+
+    def _abort_reason(self, report: BulkReport) -> Optional[str]:
+        if self.max_failures is not None and report.failed >= self.max_failures:
+            return f"ошибок {report.failed} (порог {self.max_failures})"
+        finished = report.ok + report.failed
+        if (self.max_failure_rate is not None and finished >= self.min_sample
+                and report.failed / finished > self.max_failure_rate):
+            return f"ошибок {report.failed} из {finished} (порог {self.max_failure_rate:.0%})"
+        return None
+
+    def _print_progress(self, report: BulkReport):
+        done = f"{report.done}/{report.total} ({report.done / report.total:.0%})" if report.total else f"{report.done}"
+        eta = report.eta()
+        remaining = f", осталось ~{format_duration(eta)}" if eta is not None else ""
+        print(f"   ⏱ {done}, {report.throughput:.1f} оп/с{remaining}", file=self.progress or sys.stderr)
+
+
+class Turns:
+    """
+    Шаги, которые должны выполниться строго по порядку внутри одновременных операций
+
+    Например, задачи появляются на доске в порядке создания: операции импорта
+    идут параллельно, но создание (или перенос в колонку) самой задачи ждёт
+    своей очереди. Номера очереди - 0, 1, 2, ... без пропусков: очередь
+    передаётся дальше и при ошибке шага, а операция, которая до шага не
+    дойдёт, должна вызвать skip, иначе следующие будут ждать её вечно.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._next = 0
+        self._skipped = set()
+
+    @contextmanager
+    def turn(self, number: int):
+        with self._cond:
+            self._cond.wait_for(lambda: self._next >= number)
+        try:
+            yield
+        finally:
+            self.skip(number)
+
+    def skip(self, number: int):
+        """Отдать очередь без выполнения шага (повторный вызов ничего не меняет)"""
+        with self._cond:
+            if number >= self._next:
+                self._skipped.add(number)
+                while self._next in self._skipped:
+                    self._skipped.discard(self._next)
+                    self._next += 1
+                self._cond.notify_all()
+
+
+def _call(func: Callable[[], Any]) -> Tuple[str, Any, Optional[BaseException], float]:
+    started = time.perf_counter()
+    try:
+        value = func()
+    except Skip as e:
+        return SKIPPED, None, e, time.perf_counter() - started
+    except Exception as e:
+        return FAILED, None, e, time.perf_counter() - started
+    return OK, value, None, time.perf_counter() - started
+
+
+def print_summary(report: BulkReport, ok_label: str = "Успешно"):
+    """Итоги в стиле скриптов: ✓ успешно / ⚠️ пропущено / ✗ ошибок, темп и причина остановки"""
+    print(f"{'='*60}")
+    print(f"✓ {ok_label}: {report.ok}")
+    if report.skipped:
+        print(f"⚠️  Пропущено: {report.skipped}")
+    if report.failed:
+        print(f"✗ Ошибок: {report.failed}")
+    if report.done:
+        print(f"⏱ {format_duration(report.elapsed)}, {report.throughput:.1f} оп/с")
+    if report.aborted:
+        print(f"✗ Остановлено: {report.aborted}")
+    print(f"{'='*60}")
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Дисковый кэш ответов Yougile API для редко меняющихся ресурсов
+"""
+import hashlib
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+
+from hooks import RequestContext, RequestHook
+
+# Время жизни записей по ресурсам (секунды). Ресурсы без TTL не кэшируются
+DEFAULT_TTLS = {
+    "projects": 3600,
+    "boards": 3600,
+    "columns": 600,
+    "users": 3600,
+    "companies": 3600,
+}
+
+# Изменение ресурса делает устаревшими и зависимые от него ответы
+# (например, GET boards/{id} содержит колонки доски)
+DEPENDENT_RESOURCES = {
+    "columns": ("boards",),
+}
+
+# Endpoint'ы, относящиеся к одному ресурсу
+RESOURCE_ALIASES = {
+    "task-list": "tasks",
+}
+
+
+def resource_of(endpoint: str) -> str:
+    """Ресурс, к которому относится endpoint: 'boards/123' -> 'boards'"""
+    name = endpoint.strip('/').split('?', 1)[0].split('/', 1)[0]
+    return RESOURCE_ALIASES.get(name, name)
+
+
+class CacheEntry:
+    """Закэшированный ответ"""
+
+    def __init__(self, data: Any, stored_at: float, ttl: float,
+                 etag: Optional[str] = None, last_modified: Optional[str] = None):
+        self.data = data
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.etag = etag
+        self.last_modified = last_modified
+
+    def is_fresh(self, now: float) -> bool:
+        return now - self.stored_at < self.ttl
+
+    @property
+    def validators(self) -> Dict[str, str]:
+        """Заголовки условного запроса для ревалидации"""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    Кэш GET-ответов на диске с ключом endpoint + параметры
+
+    Свежие записи (моложе TTL ресурса) возвращаются без запроса к API.
+    Для устаревших записей с ETag/Last-Modified клиент отправляет условный
+    запрос и при ответе 304 продлевает запись. Успешная запись (POST/PUT/DELETE)
+    через тот же клиент удаляет все записи изменённого ресурса.
+
+    Каждое удаление увеличивает поколение ресурса. GET запоминает поколение
+    до запроса (generation) и передаёт его в put/touch: ответ, начатый до
+    записи и полученный после неё, не сохраняется - иначе устаревшие данные
+    жили бы в кэше весь TTL.
+    """
+
+    def __init__(self, directory: str, ttls: Optional[Mapping[str, float]] = None,
+                 clock: Callable[[], float] = time.time):
+        """
+        Args:
+            directory: Каталог кэша
+            ttls: Время жизни по ресурсам (по умолчанию DEFAULT_TTLS)
+            clock: Источник времени (для тестов)
+        """
+        self.directory = directory
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._generations: Dict[str, int] = {}
+
+    def ttl_for(self, endpoint: str) -> float:
+        """TTL ресурса endpoint (0 - не кэшируется)"""
+        return self.ttls.get(resource_of(endpoint), 0)
+
+    def _path(self, endpoint: str, params: Optional[Mapping[str, Any]]) -> str:
+        key = json.dumps([endpoint.strip('/'), sorted((params or {}).items())],
+                         ensure_ascii=False, default=str)
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, resource_of(endpoint), f"{digest}.json")
+
+    def get(self, endpoint: str, params: Optional[Mapping[str, Any]] = None) -> Optional[CacheEntry]:
+        """Найти запись (свежую или устаревшую) или None"""
+        if not self.ttl_for(endpoint):
+            return None
+        try:
+            with open(self._path(endpoint, params), 'r', encoding='utf-8') as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return CacheEntry(raw.get('data'), raw.get('stored_at', 0), self.ttl_for(endpoint),
+                          raw.get('etag'), raw.get('last_modified'))
+
+    def is_fresh(self, entry: CacheEntry) -> bool:
+        return entry.is_fresh(self._clock())
+
+    def generation(self, endpoint: str) -> int:
+        """Поколение ресурса endpoint - запоминается перед запросом для put/touch"""
+        with self._lock:
+            return self._generations.get(resource_of(endpoint), 0)
+
+    def put(self, endpoint: str, params: Optional[Mapping[str, Any]], data: Any,
+            headers: Optional[Mapping[str, str]] = None, generation: Optional[int] = None):
+        """
+        Сохранить ответ, если ресурс кэшируемый
+
+        Args:
+            generation: Поколение ресурса до запроса; если с тех пор ресурс
+                        изменён (invalidate), ответ не сохраняется
+        """
+        if not self.ttl_for(endpoint):
+            return
+        headers = headers or {}
+        self._write(endpoint, params, {
+            'endpoint': endpoint,
+            'stored_at': self._clock(),
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+            'data': data,
+        }, generation)
+
+    def touch(self, endpoint: str, params: Optional[Mapping[str, Any]], entry: CacheEntry,
+              generation: Optional[int] = None):
+        """Продлить запись после ответа 304 Not Modified (generation - как у put)"""
+        self._write(endpoint, params, {
+            'endpoint': endpoint,
+            'stored_at': self._clock(),
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'data': entry.data,
+        }, generation)
+
+    def invalidate(self, endpoint: str):
+        """Удалить записи ресурса endpoint и зависимых от него ресурсов"""
+        resource = resource_of(endpoint)
+        for name in (resource,) + DEPENDENT_RESOURCES.get(resource, ()):
+            with self._lock:
+                self._generations[name] = self._generations.get(name, 0) + 1
+                shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def clear(self):
+        """Удалить весь кэш"""
+        with self._lock:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _write(self, endpoint: str, params: Optional[Mapping[str, Any]], payload: Dict[str, Any],
+               generation: Optional[int] = None):
+        path = self._path(endpoint, params)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            # Проверка и запись под одной блокировкой: invalidate не вклинится между ними
+            if generation is not None and self._generations.get(resource_of(endpoint), 0) != generation:
+                return
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+
+
+if __name__ == "__main__":
+    from config import CACHE_DIR
+
+    if len(sys.argv) < 2 or sys.argv[1] != 'clear':
+        print("Использование: python cache.py clear")
+        sys.exit(1)
+
+    if not CACHE_DIR:
+        print("✗ Кэш не включён (переменная YOUGILE_CACHE_DIR не задана)")
+        sys.exit(1)
+
+    ResponseCache(CACHE_DIR).clear()
+    print(f"✓ Кэш очищен: {CACHE_DIR}")
+
+
+class CacheHook(RequestHook):
+    """
+    Хук клиента, отвечающий на GET из ResponseCache
+
+    Свежая запись возвращается без запроса (ctx.result в before_request),
+    для устаревшей с валидаторами отправляется условный запрос, и ответ 304
+    заменяется сохранённым телом. Успешная запись инвалидирует ресурс.
+    """
+
+    def __init__(self, cache: ResponseCache):
+        self.cache = cache
+
+    def before_request(self, ctx: RequestContext):
+        if ctx.method != "GET" or ctx.attempt > 1:
+            return
+        # Запись, выполненная во время этого GET, не даст сохранить его ответ
+        ctx.data['cache_generation'] = self.cache.generation(ctx.endpoint)
+        cached = self.cache.get(ctx.endpoint, ctx.kwargs.get("params"))
+        if cached is None:
+            return
+        if self.cache.is_fresh(cached):
+            ctx.result = cached.data
+            return
+        ctx.data['cached'] = cached
+        if cached.validators:
+            ctx.kwargs["headers"] = {**(ctx.kwargs.get("headers") or {}), **cached.validators}
+
+    def after_response(self, ctx: RequestContext, response):
+        cached = ctx.data.get('cached')
+        if response.status_code == 304 and cached is not None:
+            self.cache.touch(ctx.endpoint, ctx.kwargs.get("params"), cached,
+                             ctx.data.get('cache_generation'))
+            ctx.result = cached.data
+
+    def on_result(self, ctx: RequestContext, result: Any):
+        if ctx.method == "GET":
+            self.cache.put(ctx.endpoint, ctx.kwargs.get("params"), result,
+                           ctx.response.headers, ctx.data.get('cache_generation'))
+        else:
+            self.cache.invalidate(ctx.endpoint)
@@ -4,10 +4,12 @@
 """
 import sys
 from yougile_client import YougileClient
+from bulk import BulkExecutor, print_summary
 from config import require_board_context
+from planner import format_plan, plan_clear_board
 
 
-def clear_board(board_id=None, confirm=True, archive=True):
+def clear_board(board_id=None, confirm=True, archive=True, dry_run=False, max_failures=None):
     """
     Удалить все задачи с доски
     
@@ -15,6 +17,12 @@ def clear_board(board_id=None, confirm=True, archive=True):
         board_id: ID доски (если None, используется текущая доска из контекста)
         confirm: Запрашивать подтверждение перед удалением
         archive: Если True, архивирует задачи вместо удаления (по умолчанию)
+        dry_run: Только загрузить задачи и показать план (запросы к API и время)
+        max_failures: Остановиться после стольких ошибок (по умолчанию - если ошибок
+                      больше половины, см. bulk.DEFAULT_FAILURE_RATE)
+    
+    Returns:
+        bulk.BulkReport с результатом по каждой задаче (None, если ничего не делалось)
     """
     client = YougileClient()
     
@@ -26,20 +34,18 @@ def clear_board(board_id=None, confirm=True, archive=True):
     board = client.get_board(board_id)
     print(f"\n📋 Доска: {board['title']}")
     
-    # Получаем все колонки и находим ID колонок этой доски
-    all_columns = client.get_columns()
-    board_column_ids = {col['id'] for col in all_columns if col.get('boardId') == board_id}
+    # Колонки доски из индекса клиента (фильтр boardId на стороне сервера)
+    board_columns = client.index.columns_of(board_id)
     
-    if not board_column_ids:
+    if not board_columns:
         print("✓ На доске нет колонок и задач")
         return
     
-    print(f"📊 Колонок на доске: {len(board_column_ids)}")
+    print(f"📊 Колонок на доске: {len(board_columns)}")
     
-    # Получаем все задачи и фильтруем по колонкам этой доски
-    print("⏳ Загружаем все задачи...")
-    all_tasks = client.get_tasks(all_pages=True)
-    tasks = [task for task in all_tasks if task.get('columnId') in board_column_ids]
+    # Получаем задачи только колонок этой доски
+    print("⏳ Загружаем задачи доски...")
+    tasks = client.index.tasks_of_board(board_id)
     
     if not tasks:
         print("✓ На доске нет задач")
@@ -47,6 +53,10 @@ def clear_board(board_id=None, confirm=True, archive=True):
     
     print(f"⚠️  Найдено задач: {len(tasks)}")
     
+    if dry_run:
+        print(f"\n{format_plan(plan_clear_board(len(tasks), archive=archive), concurrency=client.concurrency)}")
+        return
+    
     # Запрашиваем подтверждение
     action_word = "архивировать" if archive else "удалить"
     if confirm:
@@ -56,30 +66,29 @@ def clear_board(board_id=None, confirm=True, archive=True):
             return
     
     # Удаляем или архивируем задачи
-    processed_count = 0
-    failed_count = 0
-    
     action_verb = "Архивация" if archive else "Удаление"
     print(f"\n{action_verb} задач:")
-    for task in tasks:
-        try:
-            if archive:
-                client.update_task(task['id'], archived=True)
-            else:
-                client.delete_task(task['id'])
-            processed_count += 1
+    
+    def process(task):
+        if archive:
+            return client.update_task(task['id'], archived=True)
+        return client.delete_task(task['id'])
+    
+    def show(result):
+        task = result.item
+        if result.ok:
             status = "Архивирована" if archive else "Удалена"
             print(f"  ✓ {status}: {task.get('title', task['id'])}")
-        except Exception as e:
-            failed_count += 1
-            print(f"  ✗ Ошибка при обработке {task.get('title', task['id'])}: {e}")
-    
-    print(f"\n{'='*60}")
-    success_word = "архивировано" if archive else "удалено"
-    print(f"✓ Успешно {success_word}: {processed_count}")
-    if failed_count > 0:
-        print(f"✗ Ошибок: {failed_count}")
-    print(f"{'='*60}")
+        else:
+            print(f"  ✗ Ошибка при обработке {task.get('title', task['id'])}: {result.error}")
+    
+    # Задачи независимы - обрабатываем одновременно в пределах лимита запросов
+    executor = BulkExecutor(client, max_failures=max_failures, on_result=show)
+    report = executor.run([(task, lambda task=task: process(task)) for task in tasks])
+    
+    print()
+    print_summary(report, "Успешно " + ("архивировано" if archive else "удалено"))
+    return report
 
 
 if __name__ == "__main__":
@@ -89,11 +98,14 @@ if __name__ == "__main__":
     parser.add_argument('--board-id', help='ID доски (по умолчанию из контекста)')
     parser.add_argument('--yes', action='store_true', help='Не запрашивать подтверждение')
     parser.add_argument('--delete', action='store_true', help='Удалить навсегда вместо архивации')
+    parser.add_argument('--dry-run', action='store_true', help='Только показать план: запросы к API и время')
+    parser.add_argument('--max-failures', type=int, help='Остановиться после N ошибок')
     
     args = parser.parse_args()
     
     try:
-        clear_board(board_id=args.board_id, confirm=not args.yes, archive=not args.delete)
+        clear_board(board_id=args.board_id, confirm=not args.yes, archive=not args.delete,
+                    dry_run=args.dry_run, max_failures=args.max_failures)
     except KeyboardInterrupt:
         print("\n✗ Прервано пользователем")
         sys.exit(1)
@@ -7,8 +7,46 @@ from dotenv import load_dotenv
 # Загрузка переменных окружения
 load_dotenv()
 
-# Базовый URL API
-API_BASE_URL = "https://yougile.com/api-v2"
+# Базовый URL API (можно указать локальный fake_server.py для тестов производительности)
+API_BASE_URL = os.getenv("YOUGILE_API_URL", "https://yougile.com/api-v2").rstrip("/")
+
+# Лимит запросов API: не более 50 запросов в минуту на компанию
+RATE_LIMIT_REQUESTS = int(os.getenv("YOUGILE_RATE_LIMIT", "50"))
+RATE_LIMIT_PERIOD = 60.0
+
+# Файл общего для процессов состояния лимита (SQLite, см. rate_limiter.SharedRateLimiter):
+# скрипты с одним API ключом делят бюджет. По умолчанию у каждого процесса свой лимит
+RATE_LIMIT_STATE = os.getenv("YOUGILE_RATE_LIMIT_STATE")
+
+# Приоритет процесса в общей очереди лимита (больший получает запросы первым)
+RATE_LIMIT_PRIORITY = int(os.getenv("YOUGILE_PRIORITY", "0"))
+
+# Максимальное число попыток запроса при временных ошибках (429, 5xx, сеть)
+RETRY_MAX_ATTEMPTS = int(os.getenv("YOUGILE_RETRY_ATTEMPTS", "4"))
+
+# Максимальное число одновременных запросов (размер пула соединений)
+CONCURRENCY = int(os.getenv("YOUGILE_CONCURRENCY", "8"))
+
+# Таймаут HTTP запроса в секундах
+REQUEST_TIMEOUT = float(os.getenv("YOUGILE_TIMEOUT", "30"))
+
+# Средняя задержка ответа API в секундах для оценки времени массовых операций (planner.py)
+EXPECTED_LATENCY = float(os.getenv("YOUGILE_EXPECTED_LATENCY", "0.3"))
+
+# Файл с подобранными размерами страниц и задержками (по умолчанию не сохраняется)
+PAGING_STATS_FILE = os.getenv("YOUGILE_PAGING_STATS")
+
+# Каталог дискового кэша ответов API (по умолчанию кэш выключен)
+CACHE_DIR = os.getenv("YOUGILE_CACHE_DIR")
+
+# Файл для выгрузки статистики запросов при выходе (.json или .prom; по умолчанию не выгружается)
+STATS_FILE = os.getenv("YOUGILE_STATS_FILE")
+
+# Файл локального зеркала данных компании (SQLite, см. sync.py)
+MIRROR_PATH = os.getenv("YOUGILE_MIRROR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "yougile_mirror.db"))
+
+# Задачи колонки, обновлённые зеркалом не раньше стольких секунд назад, sync.py refresh не перечитывает
+MIRROR_MAX_AGE = float(os.getenv("YOUGILE_MIRROR_MAX_AGE", "300"))
 
 # Учетные данные
 YOUGILE_LOGIN = os.getenv("YOUGILE_LOGIN")
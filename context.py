@@ -5,6 +5,8 @@
 import sys
 import argparse
 from yougile_client import YougileClient
+from sync import LocalMirror
+from exceptions import YougileError
 from config import YOUGILE_CURRENT_PROJECT_ID, YOUGILE_CURRENT_BOARD_ID, update_env_file
 
 
@@ -19,7 +21,7 @@ def show_context(client: YougileClient):
             project = client.get_project(YOUGILE_CURRENT_PROJECT_ID)
             print(f"📁 Проект: {project.get('title', 'Без названия')}")
             print(f"   ID: {YOUGILE_CURRENT_PROJECT_ID}")
-        except:
+        except YougileError:
             print(f"📁 Проект: {YOUGILE_CURRENT_PROJECT_ID} (не найден)")
     else:
         print("📁 Проект: не установлен")
@@ -31,7 +33,7 @@ def show_context(client: YougileClient):
             board = client.get_board(YOUGILE_CURRENT_BOARD_ID)
             print(f"📋 Доска: {board.get('title', 'Без названия')}")
             print(f"   ID: {YOUGILE_CURRENT_BOARD_ID}")
-        except:
+        except YougileError:
             print(f"📋 Доска: {YOUGILE_CURRENT_BOARD_ID} (не найдена)")
     else:
         print("📋 Доска: не установлена")
@@ -105,8 +107,8 @@ def set_board(client: YougileClient, board_id: str = None, board_name: str = Non
             sys.exit(1)
         
         print(f"Поиск доски '{board_name}' в текущем проекте...")
-        all_boards = client.get_boards()
-        project_boards = [b for b in all_boards if b.get('projectId') == YOUGILE_CURRENT_PROJECT_ID]
+        project_boards = [b for b in client.get_boards(project_id=YOUGILE_CURRENT_PROJECT_ID)
+                          if b.get('projectId', YOUGILE_CURRENT_PROJECT_ID) == YOUGILE_CURRENT_PROJECT_ID]
         
         # Поиск по точному совпадению
         found = [b for b in project_boards if b.get('title', '').lower() == board_name.lower()]
@@ -187,8 +189,8 @@ def select_interactively(client: YougileClient):
         sys.exit(1)
     
     # Выбор доски
-    all_boards = client.get_boards()
-    project_boards = [b for b in all_boards if b.get('projectId') == project_id]
+    project_boards = [b for b in client.get_boards(project_id=project_id)
+                      if b.get('projectId', project_id) == project_id]
     
     if not project_boards:
         print("В этом проекте нет досок")
@@ -221,6 +223,8 @@ def select_interactively(client: YougileClient):
 
 def main():
     parser = argparse.ArgumentParser(description="Управление рабочим контекстом Yougile")
+    parser.add_argument('--offline', action='store_true',
+                        help='Искать проекты и доски в локальном зеркале (sync.py)')
     subparsers = parser.add_subparsers(dest='command', help='Команды')
     
     # Команда: show
@@ -242,9 +246,9 @@ def main():
     if not args.command:
         args.command = 'show'
     
-    # Инициализация клиента
+    # Инициализация клиента (поиск может работать с локальным зеркалом)
     try:
-        client = YougileClient()
+        client = LocalMirror() if args.offline else YougileClient()
     except Exception as e:
         print(f"✗ Ошибка инициализации клиента: {e}")
         print("\nЗапустите auth.py для получения API ключа:")
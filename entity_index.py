@@ -0,0 +1,263 @@
+"""
+Индекс связей сущностей компании: проект → доски → колонки → задачи
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+
+class EntityIndex:
+    """
+    Граф сущностей с доступом O(1): колонка → доска, доска → проект,
+    доска → колонки, проект → доски, колонка → ID задач
+
+    Индекс создаётся один раз на клиента (client.index) и заполняется лениво:
+    колонки доски запрашиваются при первом обращении к ней (фильтр boardId
+    на стороне сервера), задачи колонок - при первом обращении к их задачам.
+    Клиент сообщает индексу о своих изменениях (создание, перемещение,
+    архивация и удаление задач, колонок и досок), поэтому повторно
+    запрашивать списки не нужно.
+    """
+
+    def __init__(self, client):
+        """
+        Args:
+            client: YougileClient (или объект с тем же интерфейсом чтения, например LocalMirror)
+        """
+        self._client = client
+        self._lock = threading.RLock()
+        self._boards: Dict[str, Dict[str, Any]] = {}
+        self._columns: Dict[str, Dict[str, Any]] = {}
+        self._board_project: Dict[str, Optional[str]] = {}
+        self._column_board: Dict[str, Optional[str]] = {}
+        self._project_boards: Dict[str, List[str]] = {}
+        self._board_columns: Dict[str, List[str]] = {}
+        # Активные (не архивные и не удалённые) задачи загруженных колонок
+        self._column_tasks: Dict[str, Set[str]] = {}
+        self._task_column: Dict[str, str] = {}
+
+    # === Загрузка ===
+
+    def load(self):
+        """Загрузить все доски и колонки компании (два списка вместо запросов по доскам)"""
+        boards = self._client.get_boards()
+        columns = self._client.get_columns()
+        with self._lock:
+            for board in boards:
+                if board.get('projectId'):
+                    self._project_boards.setdefault(board['projectId'], [])
+                self._board_columns.setdefault(board['id'], [])
+                self._add_board(board)
+            for column in columns:
+                self._add_column(column)
+
+    def _add_board(self, board: Dict[str, Any]):
+        board_id = board['id']
+        project_id = board.get('projectId')
+        self._boards[board_id] = board
+        old_project = self._board_project.get(board_id)
+        if old_project is not None and old_project != project_id and old_project in self._project_boards:
+            self._project_boards[old_project].remove(board_id)
+        self._board_project[board_id] = project_id
+        boards = self._project_boards.get(project_id)
+        if boards is not None and board_id not in boards:
+            boards.append(board_id)
+
+    def _add_column(self, column: Dict[str, Any]):
+        column_id = column['id']
+        board_id = column.get('boardId')
+        self._columns[column_id] = column
+        old_board = self._column_board.get(column_id)
+        if old_board is not None and old_board != board_id and old_board in self._board_columns:
+            self._board_columns[old_board].remove(column_id)
+        self._column_board[column_id] = board_id
+        columns = self._board_columns.get(board_id)
+        if columns is not None and column_id not in columns:
+            columns.append(column_id)
+
+    # === Структура ===
+
+    def boards_of(self, project_id: str) -> List[Dict[str, Any]]:
+        """Доски проекта"""
+        with self._lock:
+            board_ids = self._project_boards.get(project_id)
+        if board_ids is None:
+            boards = [b for b in self._client.get_boards(project_id=project_id)
+                      if b.get('projectId', project_id) == project_id]
+            with self._lock:
+                self._project_boards[project_id] = []
+                for board in boards:
+                    self._add_board(dict(board, projectId=project_id))
+                board_ids = self._project_boards[project_id]
+        with self._lock:
+            return [self._boards[board_id] for board_id in board_ids]
+
+    def columns_of(self, board_id: str) -> List[Dict[str, Any]]:
+        """Колонки доски"""
+        with self._lock:
+            column_ids = self._board_columns.get(board_id)
+        if column_ids is None:
+            columns = [c for c in self._client.get_columns(board_id=board_id)
+                       if c.get('boardId', board_id) == board_id]
+            with self._lock:
+                self._board_columns[board_id] = []
+                for column in columns:
+                    self._add_column(dict(column, boardId=board_id))
+                column_ids = self._board_columns[board_id]
+        with self._lock:
+            return [self._columns[column_id] for column_id in column_ids]
+
+    def column_ids_of(self, board_id: str) -> Set[str]:
+        """ID колонок доски"""
+        return {column['id'] for column in self.columns_of(board_id)}
+
+    def board_of(self, column_id: str) -> Optional[str]:
+        """ID доски колонки"""
+        with self._lock:
+            if column_id in self._column_board:
+                return self._column_board[column_id]
+        column = self._client.get_column(column_id)
+        with self._lock:
+            self._add_column(column)
+            return self._column_board[column_id]
+
+    def project_of(self, board_id: str) -> Optional[str]:
+        """ID проекта доски"""
+        with self._lock:
+            if board_id in self._board_project:
+                return self._board_project[board_id]
+        board = self._client.get_board(board_id)
+        with self._lock:
+            self._add_board(board)
+            return self._board_project[board_id]
+
+    def column_by_name(self, board_id: str, name: str) -> Optional[Dict[str, Any]]:
+        """Колонка доски по названию (без учёта регистра, допускается частичное совпадение)"""
+        columns = self.columns_of(board_id)
+        name = name.lower()
+        exact = next((c for c in columns if c.get('title', '').lower() == name), None)
+        return exact or next((c for c in columns if name in c.get('title', '').lower()), None)
+
+    # === Задачи ===
+
+    def load_tasks(self, column_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        Загрузить задачи колонок (одним вызовом get_tasks по списку колонок)
+
+        Returns:
+            Задачи этих колонок (в индекс попадают только активные)
+        """
+        column_ids = list(column_ids)
+        if not column_ids:
+            return []
+        wanted = set(column_ids)
+        tasks = [t for t in self._client.get_tasks(column_id=column_ids) if t.get('columnId') in wanted]
+        with self._lock:
+            for column_id in column_ids:
+                self._column_tasks[column_id] = set()
+            for task in tasks:
+                self._task_column[task['id']] = task['columnId']
+                if not task.get('archived') and not task.get('deleted'):
+                    self._column_tasks[task['columnId']].add(task['id'])
+        return tasks
+
+    def tasks_of_board(self, board_id: str) -> List[Dict[str, Any]]:
+        """Загрузить задачи всех колонок доски"""
+        return self.load_tasks([column['id'] for column in self.columns_of(board_id)])
+
+    def task_ids(self, column_id: str) -> Set[str]:
+        """ID активных задач колонки"""
+        with self._lock:
+            if column_id in self._column_tasks:
+                return set(self._column_tasks[column_id])
+        self.load_tasks([column_id])
+        with self._lock:
+            return set(self._column_tasks[column_id])
+
+    def board_task_ids(self, board_id: str) -> Set[str]:
+        """ID активных задач доски"""
+        column_ids = [c['id'] for c in self.columns_of(board_id)]
+        with self._lock:
+            missing = [cid for cid in column_ids if cid not in self._column_tasks]
+        if missing:
+            self.load_tasks(missing)
+        with self._lock:
+            return set().union(*(self._column_tasks[cid] for cid in column_ids))
+
+    # === Изменения, сделанные клиентом ===
+
+    def task_created(self, task_id: Optional[str], column_id: Optional[str]):
+        if not task_id or not column_id:
+            return
+        with self._lock:
+            self._task_column[task_id] = column_id
+            if column_id in self._column_tasks:
+                self._column_tasks[column_id].add(task_id)
+
+    def task_updated(self, task_id: str, changes: Dict[str, Any]):
+        with self._lock:
+            old_column = self._task_column.get(task_id)
+            new_column = changes.get('columnId') or old_column
+            if changes.get('archived') or changes.get('deleted'):
+                if old_column in self._column_tasks:
+                    self._column_tasks[old_column].discard(task_id)
+                if new_column:
+                    self._task_column[task_id] = new_column
+                return
+            if new_column is None:
+                return
+            if old_column in self._column_tasks:
+                self._column_tasks[old_column].discard(task_id)
+            self._task_column[task_id] = new_column
+            if new_column in self._column_tasks:
+                self._column_tasks[new_column].add(task_id)
+
+    def task_deleted(self, task_id: str):
+        with self._lock:
+            column_id = self._task_column.pop(task_id, None)
+            if column_id in self._column_tasks:
+                self._column_tasks[column_id].discard(task_id)
+
+    def column_created(self, column: Dict[str, Any]):
+        if not column.get('id'):
+            return
+        with self._lock:
+            self._add_column(column)
+            self._column_tasks.setdefault(column['id'], set())
+
+    def column_updated(self, column_id: str, changes: Dict[str, Any]):
+        with self._lock:
+            if column_id in self._columns:
+                self._add_column(dict(self._columns[column_id], **changes))
+
+    def column_deleted(self, column_id: str):
+        with self._lock:
+            self._columns.pop(column_id, None)
+            board_id = self._column_board.pop(column_id, None)
+            if column_id in self._board_columns.get(board_id, ()):
+                self._board_columns[board_id].remove(column_id)
+            for task_id in self._column_tasks.pop(column_id, ()):
+                self._task_column.pop(task_id, None)
+
+    def board_created(self, board: Dict[str, Any]):
+        if not board.get('id'):
+            return
+        with self._lock:
+            self._add_board(board)
+            self._board_columns.setdefault(board['id'], [])
+
+    def board_updated(self, board_id: str, changes: Dict[str, Any]):
+        with self._lock:
+            if board_id in self._boards:
+                self._add_board(dict(self._boards[board_id], **changes))
+
+    def board_deleted(self, board_id: str):
+        with self._lock:
+            self._boards.pop(board_id, None)
+            project_id = self._board_project.pop(board_id, None)
+            if board_id in self._project_boards.get(project_id, ()):
+                self._project_boards[project_id].remove(board_id)
+            for column_id in list(self._board_columns.pop(board_id, ())):
+                self._columns.pop(column_id, None)
+                self._column_board.pop(column_id, None)
+                for task_id in self._column_tasks.pop(column_id, ()):
+                    self._task_column.pop(task_id, None)
@@ -0,0 +1,55 @@
+"""
+Исключения клиента Yougile API
+"""
+from typing import Any, Optional
+
+
+class YougileError(Exception):
+    """Базовое исключение для ошибок работы с Yougile API"""
+
+
+class TransportError(YougileError):
+    """Ошибка сети: соединение, таймаут и т.п. (ответа от сервера нет)"""
+
+    def __init__(self, message: str, original: Optional[Exception] = None):
+        super().__init__(message)
+        self.original = original
+
+
+class APIError(YougileError):
+    """Сервер ответил кодом ошибки"""
+
+    def __init__(self, message: str, status_code: int, response: Any = None,
+                 error: Optional[str] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.response = response
+        self.error = error
+
+
+class NotFound(APIError):
+    """Ресурс не найден (404)"""
+
+
+class RateLimited(APIError):
+    """Превышен лимит запросов (429)"""
+
+    def __init__(self, message: str, status_code: int = 429, response: Any = None,
+                 error: Optional[str] = None, retry_after: Optional[float] = None):
+        super().__init__(message, status_code, response, error)
+        self.retry_after = retry_after
+
+
+class ServerError(APIError):
+    """Ошибка на стороне сервера (5xx)"""
+
+
+def error_for_status(status_code: int):
+    """Класс исключения, соответствующий HTTP статусу"""
+    if status_code == 404:
+        return NotFound
+    if status_code == 429:
+        return RateLimited
+    if status_code >= 500:
+        return ServerError
+    return APIError
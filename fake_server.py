@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Локальный заменитель Yougile API для нагрузочного тестирования без реального сервиса
+
+Запуск:
+    python fake_server.py --tasks 40000 --latency 0.05
+    YOUGILE_API_URL=http://127.0.0.1:8765/api-v2 YOUGILE_API_KEY=fake python tasks.py list
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from metrics import endpoint_template
+
+API_PREFIX = "/api-v2"
+
+# Ресурс -> (фильтры списка, обязательные поля при создании)
+RESOURCES = {
+    "projects": ((), ("title",)),
+    "boards": (("projectId",), ("title",)),
+    "columns": (("boardId",), ("title", "boardId")),
+    "tasks": (("columnId", "title"), ("title",)),
+    "users": ((), ("email",)),
+}
+
+MAX_LIMIT = 1000
+
+
+class FakeState:
+    """Данные компании в памяти"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.items: Dict[str, Dict[str, Dict[str, Any]]] = {name: {} for name in RESOURCES}
+        # Порядок задач в колонке (как на доске): новые задачи Yougile добавляет в начало
+        self.column_order: Dict[str, List[str]] = {}
+        self._clock = 0
+
+    def _timestamp(self) -> int:
+        # Миллисекунды, как у Yougile; строго возрастают, даже если часы не сдвинулись
+        self._clock = max(self._clock + 1, int(time.time() * 1000))
+        return self._clock
+
+    def create(self, resource: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            item = dict(data)
+            item.setdefault("id", str(uuid.uuid4()))
+            item.setdefault("timestamp", self._timestamp())
+            if resource == "tasks":
+                for flag in ("archived", "completed", "deleted"):
+                    item.setdefault(flag, False)
+                item.setdefault("subtasks", [])
+                if item.get("columnId"):
+                    self.column_order.setdefault(item["columnId"], []).insert(0, item["id"])
+            self.items[resource][item["id"]] = item
+            return item
+
+    def update(self, resource: str, item_id: str, changes: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            item = self.items[resource].get(item_id)
+            if item is None:
+                return None
+            old_column = item.get("columnId")
+            item.update(changes)
+            new_column = item.get("columnId")
+            if resource == "tasks" and "columnId" in changes and new_column != old_column:
+                if old_column and item_id in self.column_order.get(old_column, []):
+                    self.column_order[old_column].remove(item_id)
+                if new_column:
+                    self.column_order.setdefault(new_column, []).insert(0, item_id)
+            return item
+
+    def delete(self, resource: str, item_id: str) -> bool:
+        with self.lock:
+            item = self.items[resource].pop(item_id, None)
+            if item is None:
+                return False
+            if resource == "tasks" and item.get("columnId") in self.column_order:
+                self.column_order[item["columnId"]].remove(item_id)
+            return True
+
+    def get(self, resource: str, item_id: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.items[resource].get(item_id)
+
+    def list(self, resource: str, filters: Dict[str, str]) -> List[Dict[str, Any]]:
+        with self.lock:
+            items = [item for item in self.items[resource].values() if not item.get("deleted")]
+        for key, value in filters.items():
+            items = [item for item in items if str(item.get(key)) == value]
+        return items
+
+    def handle(self, method: str, endpoint: str, query: Dict[str, List[str]],
+               body: Dict[str, Any]) -> Tuple[int, Any, int]:
+        """
+        Обработать запрос к API
+
+        Args:
+            method: HTTP метод
+            endpoint: Путь без префикса API ('tasks/<id>', 'task-list', ...)
+            query: Параметры строки запроса (как из parse_qs)
+            body: Тело запроса
+
+        Returns:
+            (статус, тело ответа или текст ошибки, число элементов для задержки)
+        """
+        segments = endpoint.split("/")
+        name = segments[0]
+        reverse = name == "tasks" and len(segments) == 1 and method == "GET"
+        resource = "tasks" if name in ("task-list", "tasks") else name
+        if resource not in RESOURCES or len(segments) > 2:
+            return 404, "Not Found", 0
+        filters, required = RESOURCES[resource]
+
+        if len(segments) == 1:
+            if method == "GET":
+                return self._list_page(resource, query, filters, reverse)
+            if method == "POST" and name != "task-list":
+                missing = [field for field in required if not body.get(field)]
+                if missing:
+                    return 400, f"Обязательные поля: {', '.join(missing)}", 0
+                return 201, {"id": self.create(resource, body)["id"]}, 0
+            return 405, "Method Not Allowed", 0
+
+        item_id = segments[1]
+        if method == "GET":
+            item = self.get(resource, item_id)
+            return (200, item, 1) if item is not None else (404, "Not Found", 0)
+        if method == "PUT":
+            item = self.update(resource, item_id, body)
+            return (200, {"id": item_id}, 0) if item is not None else (404, "Not Found", 0)
+        if method == "DELETE":
+            return (200, {"id": item_id}, 0) if self.delete(resource, item_id) \
+                else (404, "Not Found", 0)
+        return 405, "Method Not Allowed", 0
+
+    def _list_page(self, resource: str, query: Dict[str, List[str]], filters: Tuple[str, ...],
+                   reverse: bool) -> Tuple[int, Any, int]:
+        try:
+            limit = int(query.get("limit", ["50"])[0])
+            offset = int(query.get("offset", ["0"])[0])
+        except ValueError:
+            return 400, "limit и offset должны быть числами", 0
+        if limit < 1 or limit > MAX_LIMIT or offset < 0:
+            return 400, f"limit должен быть от 1 до {MAX_LIMIT}", 0
+        items = self.list(resource, {key: query[key][0] for key in filters if key in query})
+        if reverse:
+            items.reverse()
+        page = items[offset:offset + limit]
+        return 200, {
+            "paging": {"count": len(items), "limit": limit, "offset": offset,
+                       "next": offset + limit < len(items)},
+            "content": page,
+        }, len(page)
+
+    def board_order(self, column_id: str) -> List[str]:
+        """Названия задач колонки сверху вниз, как их видно на доске"""
+        with self.lock:
+            return [self.items["tasks"][task_id]["title"] for task_id in self.column_order.get(column_id, [])
+                    if task_id in self.items["tasks"]]
+
+    def seed(self, projects: int = 1, boards: int = 2, columns: int = 4, tasks: int = 0,
+             users: int = 5, description_size: int = 2000, seed: int = 0) -> Dict[str, List[str]]:
+        """
+        Заполнить компанию синтетическими данными
+
+        Args:
+            projects: Проектов
+            boards: Досок в каждом проекте
+            columns: Колонок на каждой доске
+            tasks: Всего задач (распределяются по колонкам по кругу)
+            users: Пользователей
+            description_size: Примерная длина HTML описания задачи
+            seed: Зерно генератора
+
+        Returns:
+            {"projects": [...], "boards": [...], "columns": [...]} - ID созданных сущностей
+        """
+        rng = random.Random(seed)
+        created = {"projects": [], "boards": [], "columns": []}
+        for u in range(users):
+            self.create("users", {"email": f"user{u}@example.com", "realName": f"Пользователь {u}"})
+        for p in range(projects):
+            project = self.create("projects", {"title": f"Проект {p + 1}"})
+            created["projects"].append(project["id"])
+            for b in range(boards):
+                board = self.create("boards", {"title": f"Доска {p + 1}.{b + 1}", "projectId": project["id"]})
+                created["boards"].append(board["id"])
+                for c in range(columns):
+                    column = self.create("columns", {"title": f"Колонка {c + 1}", "boardId": board["id"]})
+                    created["columns"].append(column["id"])
+        paragraph = "<p>" + "Подробное описание шага задачи. " * 4 + "</p>"
+        repeat = max(1, description_size // len(paragraph))
+        for t in range(tasks):
+            column_id = created["columns"][t % len(created["columns"])] if created["columns"] else None
+            self.create("tasks", {
+                "title": f"Задача {t + 1}",
+                "columnId": column_id,
+                "description": paragraph * rng.randint(max(1, repeat // 2), repeat + 1),
+                "assigned": [],
+            })
+        return created
+
+
+class RateWindow:
+    """Скользящее окно запросов для одного API ключа"""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self.calls: deque = deque()
+
+    def check(self, now: float) -> Tuple[bool, int, float]:
+        """(разрешён ли запрос, осталось запросов, через сколько секунд освободится слот)"""
+        while self.calls and now - self.calls[0] >= self.period:
+            self.calls.popleft()
+        if len(self.calls) >= self.rate:
+            return False, 0, self.calls[0] + self.period - now
+        self.calls.append(now)
+        return True, self.rate - len(self.calls), 0.0
+
+
+class FakeYougileServer:
+    """
+    HTTP сервер с подмножеством Yougile API v2: projects, boards, columns,
+    tasks (task-list), users - списки с limit/offset и фильтрами, GET/POST/PUT/DELETE
+
+    Args:
+        host, port: Адрес (port=0 - свободный порт)
+        latency: Задержка каждого ответа в секундах
+        latency_per_item: Дополнительная задержка на каждый элемент страницы
+        rate_limit: Запросов на API ключ за rate_period (None - без ограничения)
+        rate_period: Окно ограничения в секундах
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 latency_per_item: float = 0.0, rate_limit: Optional[int] = 50, rate_period: float = 60.0):
+        self.state = FakeState()
+        self.latency = latency
+        self.latency_per_item = latency_per_item
+        self.rate_limit = rate_limit
+        self.rate_period = rate_period
+        # Обработанные запросы по (метод, шаблон endpoint'а) и число ответов 429
+        self.calls: Counter = Counter()
+        self.rejected = 0
+        self._windows: Dict[str, RateWindow] = {}
+        self._stats_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Базовый URL API для YOUGILE_API_URL / YougileClient(base_url=...)"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-yougile", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> 'FakeYougileServer':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.calls.clear()
+            self.rejected = 0
+
+    def total_calls(self) -> int:
+        with self._stats_lock:
+            return sum(self.calls.values())
+
+    def _admit(self, api_key: str) -> Tuple[bool, Dict[str, str]]:
+        if not self.rate_limit:
+            return True, {}
+        with self._stats_lock:
+            window = self._windows.setdefault(api_key, RateWindow(self.rate_limit, self.rate_period))
+            allowed, remaining, retry_after = window.check(time.monotonic())
+            if not allowed:
+                self.rejected += 1
+        headers = {"X-RateLimit-Limit": str(self.rate_limit), "X-RateLimit-Remaining": str(remaining)}
+        if not allowed:
+            headers["Retry-After"] = str(max(1, math.ceil(retry_after)))
+        return allowed, headers
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки и тело пишутся отдельно: без TCP_NODELAY каждый ответ ждал бы delayed ACK (~40 мс)
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                self._dispatch("GET")
+
+            def do_POST(self):
+                self._dispatch("POST")
+
+            def do_PUT(self):
+                self._dispatch("PUT")
+
+            def do_DELETE(self):
+                self._dispatch("DELETE")
+
+            def _reply(self, status: int, body: Any = None, headers: Optional[Dict[str, str]] = None):
+                payload = b"" if body is None else json.dumps(body, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _error(self, status: int, message: str, headers: Optional[Dict[str, str]] = None):
+                self._reply(status, {"statusCode": status, "error": message}, headers)
+
+            def _dispatch(self, method: str):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw_body = self.rfile.read(length) if length else b""
+                parts = urlsplit(self.path)
+                path = parts.path
+                if not path.startswith(API_PREFIX + "/"):
+                    return self._error(404, "Not Found")
+                endpoint = path[len(API_PREFIX) + 1:].strip("/")
+
+                auth = self.headers.get("Authorization", "")
+                if not auth.startswith("Bearer "):
+                    return self._error(401, "Unauthorized")
+
+                allowed, limit_headers = server._admit(auth)
+                if not allowed:
+                    return self._error(429, "Too Many Requests", limit_headers)
+
+                with server._stats_lock:
+                    server.calls[(method, endpoint_template(endpoint))] += 1
+
+                try:
+                    body = json.loads(raw_body) if raw_body else {}
+                except ValueError:
+                    return self._error(400, "Invalid JSON")
+
+                status, result, items = server.state.handle(method, endpoint, parse_qs(parts.query), body)
+                delay = server.latency + server.latency_per_item * items
+                if delay:
+                    time.sleep(delay)
+                if status >= 400:
+                    return self._error(status, result, limit_headers)
+                self._reply(status, result, limit_headers)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный заменитель Yougile API")
+    parser.add_argument('--host', default='127.0.0.1', help='Адрес (по умолчанию 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8765, help='Порт (по умолчанию 8765)')
+    parser.add_argument('--latency', type=float, default=0.05, help='Задержка ответа в секундах (по умолчанию 0.05)')
+    parser.add_argument('--rate-limit', type=int, default=50, help='Запросов в минуту на ключ (0 - без ограничения)')
+    parser.add_argument('--projects', type=int, default=1, help='Проектов')
+    parser.add_argument('--boards', type=int, default=2, help='Досок в проекте')
+    parser.add_argument('--columns', type=int, default=4, help='Колонок на доске')
+    parser.add_argument('--tasks', type=int, default=1000, help='Задач всего')
+    args = parser.parse_args()
+
+    server = FakeYougileServer(args.host, args.port, latency=args.latency, rate_limit=args.rate_limit or None)
+    created = server.state.seed(args.projects, args.boards, args.columns, args.tasks)
+    server.start()
+    print(f"✓ Fake Yougile API: {server.url}")
+    print(f"  Проектов: {len(created['projects'])}, досок: {len(created['boards'])}, "
+          f"колонок: {len(created['columns'])}, задач: {args.tasks}")
+    print(f"  Первая доска: {created['boards'][0] if created['boards'] else '-'}")
+    print(f"\nYOUGILE_API_URL={server.url} YOUGILE_API_KEY=fake python tasks.py list --limit 10")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
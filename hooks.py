@@ -0,0 +1,161 @@
+"""
+Хуки жизненного цикла запроса клиента (before_request / after_response / on_error / on_result)
+"""
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+import requests
+
+
+class RequestContext:
+    """Один запрос клиента (все его попытки), передаётся во все хуки"""
+
+    __slots__ = ('method', 'endpoint', 'attempt', 'kwargs', 'retry_guard', 'no_retry',
+                 'limiter_wait', 'started', 'elapsed', 'response', 'result', 'data')
+
+    def __init__(self, method: str, endpoint: str, kwargs: Dict[str, Any],
+                 retry_guard: Optional[Callable[[], Any]] = None,
+                 no_retry: Optional[Callable[[Exception], bool]] = None):
+        self.method = method
+        self.endpoint = endpoint
+        # Номер текущей попытки (1 - первая, больше 1 - повтор)
+        self.attempt = 1
+        # Параметры requests: хук before_request может их изменить (например, заголовки)
+        self.kwargs = kwargs
+        # Для POST - проверка перед повтором, не создан ли объект (см. YougileClient._request)
+        self.retry_guard = retry_guard
+        # Ошибки, которые вызывающий код запретил повторять
+        self.no_retry = no_retry
+        self.limiter_wait = 0.0
+        self.started = 0.0
+        self.elapsed = 0.0
+        # Последний HTTP ответ
+        self.response: Optional[requests.Response] = None
+        # Ответ без обращения к сети или вместо тела ответа/ошибки: если хук
+        # задал его, клиент сразу возвращает это значение
+        self.result: Any = None
+        # Место для состояния хуков между фазами и попытками
+        self.data: Dict[str, Any] = {}
+
+
+class RequestHook:
+    """
+    Базовый класс хука: переопределите нужные методы
+
+    before_request вызывается перед каждой попыткой (до ожидания ограничителя
+    частоты), after_response - для каждого полученного HTTP ответа (в том числе
+    4xx/5xx), on_error - если попытка завершилась исключением (ошибка сети или
+    HTTP), on_result - один раз с разобранным телом успешного ответа.
+
+    Хук может ответить сам: ctx.result, заданный в before_request, отменяет
+    попытку (остальные before_request не вызываются), в after_response -
+    заменяет разбор тела, в on_error - заменяет исключение. on_error,
+    вернувший True, запрашивает повтор. Так устроены встроенные хуки клиента:
+    cache.CacheHook, retry.RetryHook и metrics.MetricsHook.
+    Хуки вызываются в потоке запроса и не должны бросать исключения.
+    """
+
+    def before_request(self, ctx: RequestContext):
+        pass
+
+    def after_response(self, ctx: RequestContext, response: requests.Response):
+        pass
+
+    def on_error(self, ctx: RequestContext, error: Exception) -> Optional[bool]:
+        pass
+
+    def on_result(self, ctx: RequestContext, result: Any):
+        pass
+
+
+class HookChain:
+    """
+    Цепочка хуков клиента
+
+    Для каждой фазы хранится список только переопределённых методов, поэтому
+    хук, реализующий одну фазу, не замедляет остальные. Пустая цепочка ложна:
+    клиент проверяет её одним условием и не создаёт RequestContext. У клиента
+    по умолчанию в цепочке встроенные хуки повторов и статистики, пустой она
+    бывает без них (retry_policy=NO_RETRY, metrics=False, без кэша).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._hooks: List[RequestHook] = []
+        self._before: tuple = ()
+        self._after: tuple = ()
+        self._error: tuple = ()
+        self._result: tuple = ()
+
+    def add(self, hook: RequestHook) -> RequestHook:
+        """Добавить хук в конец цепочки"""
+        with self._lock:
+            self._hooks.append(hook)
+            self._rebuild()
+        return hook
+
+    def remove(self, hook: RequestHook):
+        """Удалить хук (если его нет - ничего не происходит)"""
+        with self._lock:
+            if hook in self._hooks:
+                self._hooks.remove(hook)
+                self._rebuild()
+
+    def _rebuild(self):
+        # Кортежи заменяются целиком: потоки запросов читают их без блокировки
+        def overridden(name):
+            return tuple(getattr(hook, name) for hook in self._hooks
+                         if getattr(type(hook), name, None) is not getattr(RequestHook, name))
+        self._before = overridden('before_request')
+        self._after = overridden('after_response')
+        self._error = overridden('on_error')
+        self._result = overridden('on_result')
+
+    def __bool__(self) -> bool:
+        return bool(self._hooks)
+
+    def __len__(self) -> int:
+        return len(self._hooks)
+
+    def before_request(self, ctx: RequestContext):
+        for hook in self._before:
+            hook(ctx)
+            if ctx.result is not None:
+                return
+
+    def after_response(self, ctx: RequestContext, response: requests.Response):
+        for hook in self._after:
+            hook(ctx, response)
+
+    def on_error(self, ctx: RequestContext, error: Exception) -> bool:
+        """Вызвать все on_error; True - хотя бы один хук запросил повтор"""
+        retry = False
+        for hook in self._error:
+            if hook(ctx, error):
+                retry = True
+        return retry
+
+    def on_result(self, ctx: RequestContext, result: Any):
+        for hook in self._result:
+            hook(ctx, result)
+
+
+class TraceHook(RequestHook):
+    """Вывод каждого запроса: метод, endpoint, статус, время, ожидание лимита"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        self.stream = stream
+
+    def _write(self, line: str):
+        print(line, file=self.stream or sys.stderr)
+
+    def after_response(self, ctx: RequestContext, response: requests.Response):
+        retry = f" (попытка {ctx.attempt})" if ctx.attempt > 1 else ""
+        wait = f", лимит {ctx.limiter_wait:.1f}с" if ctx.limiter_wait >= 0.05 else ""
+        self._write(f"   → {ctx.method} {ctx.endpoint} {response.status_code} "
+                    f"{ctx.elapsed:.2f}с{wait}{retry}")
+
+    def on_error(self, ctx: RequestContext, error: Exception):
+        if getattr(error, 'status_code', None) is None:
+            self._write(f"   → {ctx.method} {ctx.endpoint} ошибка сети: {error}")
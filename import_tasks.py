@@ -6,8 +6,20 @@ import sys
 import re
 import time
 import html
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
 from yougile_client import YougileClient
-from config import require_board_context
+from async_client import run_concurrently
+from exceptions import NotFound
+from hooks import TraceHook
+from metrics import format_table
+from bulk import BulkExecutor, Skip, SKIPPED, Turns, print_summary
+from journal import ImportJournal, tasks_fingerprint
+from planner import format_plan, plan_import, plan_sync
+from config import require_board_context, EXPECTED_LATENCY
 
 
 def markdown_to_html(text):
@@ -243,7 +255,118 @@ def parse_markdown_tasks(filepath):
     return tasks
 
 
-def create_tasks_in_yougile(tasks, board_id, column_id, delay=1.5):
+# Что делать с задачей файла при импорте по разнице (--sync)
+CREATE = "create"
+UPDATE = "update"
+UNCHANGED = "unchanged"
+
+
+def content_hash(task_data):
+    """Хэш содержимого задачи из файла: название, описание и подзадачи"""
+    content = [task_data['title'], task_data.get('description', ''),
+               [[s['title'], s.get('description', '')] for s in task_data.get('subtasks', [])]]
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+@dataclass
+class TaskChange:
+    """Разница между задачей файла и доской"""
+    index: int
+    task: Dict[str, Any]
+    action: str
+    board_task: Optional[Dict[str, Any]] = None
+    description: bool = False
+    # ID подзадачи на доске для каждой подзадачи файла (None - создать)
+    subtask_ids: List[Optional[str]] = field(default_factory=list)
+    # Позиции подзадач файла, у которых на доске другое описание
+    changed_subtasks: List[int] = field(default_factory=list)
+    # Подзадачи доски, которых нет в файле (остаются связанными)
+    other_subtasks: List[str] = field(default_factory=list)
+
+    @property
+    def new_subtasks(self) -> int:
+        return sum(1 for subtask_id in self.subtask_ids if subtask_id is None)
+
+
+def diff_import(client, tasks, column_id, known=None):
+    """
+    Сравнить задачи файла с колонкой: что создать, что обновить, что уже совпадает
+    
+    Задачи сопоставляются по названию, описания - после конвертации в HTML.
+    Если хэш задачи совпал с known, файл не менялся с прошлого импорта этой
+    задачи - она не сравнивается (и правки на доске не перезаписываются).
+    Подзадачи запрашиваются только у остальных задач.
+    
+    Args:
+        client: YougileClient
+        tasks: Список задач из parse_markdown_tasks
+        column_id: ID колонки импорта
+        known: ID задачи -> content_hash, записанные журналом прошлого импорта
+    
+    Returns:
+        list[TaskChange] в порядке файла
+    """
+    known = known or {}
+    board = {}
+    for task in client.get_tasks(column_id=column_id):
+        if not task.get('archived'):
+            board.setdefault(task['title'], task)
+    
+    changes = []
+    to_check = []
+    for index, task_data in enumerate(tasks):
+        board_task = board.get(task_data['title'])
+        if board_task is None:
+            changes.append(TaskChange(index, task_data, CREATE))
+            continue
+        change = TaskChange(index, task_data, UNCHANGED, board_task)
+        changes.append(change)
+        if known.get(board_task['id']) == content_hash(task_data):
+            continue
+        change.description = ((board_task.get('description') or '').strip()
+                              != markdown_to_html(task_data.get('description', '')).strip())
+        if task_data.get('subtasks') or board_task.get('subtasks'):
+            to_check.append(change)
+    
+    # Подзадачи изменившихся задач - одновременно, удалённые пропускаем
+    subtask_ids = [subtask_id for change in to_check for subtask_id in change.board_task.get('subtasks') or []]
+    fetched = run_concurrently(client, [lambda subtask_id=subtask_id: client.get_task(subtask_id)
+                                        for subtask_id in subtask_ids], return_exceptions=True)
+    board_subtasks = {}
+    for subtask_id, subtask in zip(subtask_ids, fetched):
+        if isinstance(subtask, NotFound):
+            continue
+        if isinstance(subtask, Exception):
+            raise subtask
+        board_subtasks[subtask_id] = subtask
+    
+    for change in to_check:
+        by_title = {}
+        for subtask_id in change.board_task.get('subtasks') or []:
+            if subtask_id in board_subtasks:
+                by_title.setdefault(board_subtasks[subtask_id]['title'], board_subtasks[subtask_id])
+        used = set()
+        for position, subtask_data in enumerate(change.task.get('subtasks', [])):
+            board_subtask = by_title.get(subtask_data['title'])
+            if board_subtask is None or board_subtask['id'] in used:
+                change.subtask_ids.append(None)
+                continue
+            used.add(board_subtask['id'])
+            change.subtask_ids.append(board_subtask['id'])
+            if ((board_subtask.get('description') or '').strip()
+                    != markdown_to_html(subtask_data.get('description', '')).strip()):
+                change.changed_subtasks.append(position)
+        change.other_subtasks = [subtask_id for subtask_id in change.board_task.get('subtasks') or []
+                                 if subtask_id not in used]
+    
+    for change in changes:
+        if change.action == UNCHANGED and (change.description or change.changed_subtasks or change.new_subtasks):
+            change.action = UPDATE
+    return changes
+
+
+def create_tasks_in_yougile(tasks, board_id, column_id, delay=0, hooks=(), max_failures=None,
+                            journal=None, changes=None, parallel=False):
     """
     Создает задачи и подзадачи в Yougile
     
@@ -251,138 +374,353 @@ def create_tasks_in_yougile(tasks, board_id, column_id, delay=1.5):
         tasks: Список задач из parse_markdown_tasks
         board_id: ID доски
         column_id: ID колонки для создания задач
-        delay: Задержка между запросами в секундах (по умолчанию 1.5)
+        delay: Дополнительная задержка между запросами в секундах (по умолчанию 0,
+               темп запросов задаёт ограничитель частоты клиента)
+        hooks: Хуки запросов клиента (например, hooks.TraceHook() для трассировки)
+        max_failures: Остановиться после стольких неудачных задач (по умолчанию - если
+                      ошибок больше половины, см. bulk.DEFAULT_FAILURE_RATE)
+        journal: journal.ImportJournal - каждое создание и связывание записывается;
+                 если журнал от прерванного запуска, созданное им повторно не создаётся
+        changes: Результат diff_import - создаются только новые задачи, изменённые
+                 обновляются, совпадающие пропускаются (импорт по разнице, --sync)
+        parallel: Создавать задачи одновременно вне колонки и затем переносить их
+                  в колонку по очереди (--parallel): по очереди идёт только перенос,
+                  связь с подзадачами отправляется тем же запросом. Требует journal:
+                  задачу, не перенесённую в колонку, переносит продолжение по журналу
+    
+    Returns:
+        bulk.BulkReport с результатом по каждой задаче (в порядке создания)
+    
+    Raises:
+        ValueError: parallel без journal
     
     Note:
         Задачи создаются в обратном порядке, чтобы в итоге они отображались
         на доске в правильном порядке (сверху вниз, как в исходном файле).
         Это связано с тем, что Yougile добавляет новые задачи в начало колонки.
+        С parallel в том же обратном порядке задачи переносятся в колонку:
+        порядок держится на том, что перенос (PUT columnId) тоже ставит задачу
+        в начало колонки - это проверено только на fake_server.py.
     """
+    if parallel and journal is None:
+        raise ValueError("parallel требует журнал: без него задача, не перенесённая в колонку, "
+                         "останется вне доски")
     client = YougileClient()
+    for hook in hooks:
+        client.add_hook(hook)
     
     print(f"\n{'='*60}")
-    print(f"Создание {len(tasks)} задач на доске")
-    print(f"Задержка между запросами: {delay}с (лимит: 50 req/min)")
+    if changes is None:
+        print(f"Создание {len(tasks)} задач на доске")
+    else:
+        counts = {action: sum(1 for c in changes if c.action == action) for action in (CREATE, UPDATE, UNCHANGED)}
+        print(f"Импорт по разнице: создать {counts[CREATE]}, обновить {counts[UPDATE]}, "
+              f"без изменений {counts[UNCHANGED]}")
+    limiter = client.rate_limiter
+    print(f"Лимит запросов: {limiter.rate} req/{limiter.period:g}s (всплеск до {limiter.capacity:g})")
+    if delay:
+        print(f"Дополнительная задержка между запросами: {delay}с")
+    if parallel:
+        print("Задачи создаются одновременно, по очереди - только перенос в колонку")
+        print("⚠️  Порядок на доске держится на том, что перенос ставит задачу в начало колонки;"
+              " проверено только на fake_server.py - сверьте порядок после импорта")
     print(f"{'='*60}\n")
     
-    created_tasks = 0
-    created_subtasks = 0
-    failed = 0
+    def pause():
+        if delay:
+            time.sleep(delay)
     
-    # Создаем задачи в ОБРАТНОМ порядке, чтобы первая задача из файла
-    # оказалась вверху списка на доске
-    for task_data in reversed(tasks):
+    def once(key, make, find):
+        """Создать через журнал (ровно один раз) или напрямую, если журнала нет"""
+        if journal is None:
+            return make()['id'], False
+        return journal.once(key, make, find)
+    
+    def find(title, column=None):
+        """Задача, создание которой оборвалось: не занятая журналом и не старше его начала"""
+        return find_created_task(client, title, column, exclude=journal.created_ids(),
+                                 created_after=journal.header.get('started'))
+    
+    def create_subtask(key, subtask_data):
+        """Подзадача создаётся БЕЗ columnId (чтобы не дублировалась на доске)"""
+        subtask_id, resumed = once(
+            key,
+            lambda: client.post('tasks', {
+                'title': subtask_data['title'],
+                'description': markdown_to_html(subtask_data.get('description', ''))
+            }),
+            lambda: find(subtask_data['title'])
+        )
+        if not resumed:
+            pause()
+        return subtask_id, resumed
+    
+    def create(index, task_data, turn):
+        """Задача, её подзадачи и связь с ними; ошибка подзадачи не прерывает задачу"""
         try:
-            # Создаем основную задачу
-            task_title = task_data['title']
-            task_desc = task_data.get('description', '')
-            
-            # Конвертируем описание в HTML
-            task_desc_html = markdown_to_html(task_desc)
-            
-            print(f"📝 Создаю задачу: {task_title}")
-            
-            task = client.create_task(
-                title=task_title,
-                column_id=column_id,
-                description=task_desc_html
+            return create_task(index, task_data, turn)
+        finally:
+            # Если до очереди дело не дошло (ошибка создания), следующие не ждут
+            turns.skip(turn)
+    
+    def create_task(index, task_data, turn):
+        key = str(index)
+        description = markdown_to_html(task_data.get('description', ''))
+        if parallel:
+            # Задача создаётся вне колонки одновременно с остальными,
+            # по очереди выполняется только перенос в колонку
+            task_id, resumed = once(
+                key,
+                lambda: client.post('tasks', {'title': task_data['title'], 'description': description}),
+                lambda: find(task_data['title'])
             )
-            
-            created_tasks += 1
-            task_id = task['id']
-            
-            # Задержка после создания задачи
-            time.sleep(delay)
-            
-            # Создаем подзадачи
-            subtasks = task_data.get('subtasks', [])
-            if subtasks:
-                print(f"   └─ Подзадач: {len(subtasks)}")
-                
-                subtask_ids = []
-                for subtask_data in subtasks:
-                    try:
-                        subtask_title = subtask_data['title']
-                        subtask_desc = subtask_data.get('description', '')
-                        
-                        # Конвертируем описание подзадачи в HTML
-                        subtask_desc_html = markdown_to_html(subtask_desc)
-                        
-                        # Создаем подзадачу БЕЗ columnId (чтобы не дублировалась на доске)
-                        # Используем прямой POST запрос без columnId
-                        subtask = client.post('tasks', {
-                            'title': subtask_title,
-                            'description': subtask_desc_html
-                        })
-                        
-                        subtask_ids.append(subtask['id'])
-                        created_subtasks += 1
-                        print(f"      ✓ {subtask_title}")
-                        
-                        # Задержка после каждой подзадачи
-                        time.sleep(delay)
-                        
-                    except Exception as e:
-                        failed += 1
-                        print(f"      ✗ Ошибка создания подзадачи {subtask_title}: {e}")
-                        # Если rate limit, ждём дольше
-                        if '429' in str(e):
-                            print(f"      ⏸ Rate limit - пауза 60 секунд...")
-                            time.sleep(60)
-                
-                # Связываем подзадачи с родительской задачей
-                if subtask_ids:
+        else:
+            # Задачи встают на доске в порядке создания - создаём их строго по очереди,
+            # подзадачи и связывание предыдущих задач в это время продолжаются
+            with turns.turn(turn):
+                task_id, resumed = once(
+                    key,
+                    lambda: client.create_task(title=task_data['title'], column_id=column_id,
+                                               description=description),
+                    lambda: find(task_data['title'], column_id)
+                )
+        if not resumed:
+            pause()
+        
+        lines = []
+        errors = 0
+        reused = 0
+        subtask_ids = []
+        linked = False
+        subtasks = task_data.get('subtasks', [])
+        already_linked = journal is not None and key in journal.linked
+        # Подзадачи независимы - создаются одновременно, связывание ждёт все их ID
+        futures = [subtask_pool.submit(create_subtask, f"{key}/{position}", subtask_data)
+                   for position, subtask_data in enumerate(subtasks)]
+        for subtask_data, future in zip(subtasks, futures):
+            subtask_title = subtask_data['title']
+            try:
+                subtask_id, subtask_resumed = future.result()
+                subtask_ids.append(subtask_id)
+                if subtask_resumed:
+                    reused += 1
+                else:
+                    lines.append(f"      ✓ {subtask_title}")
+            except Exception as e:
+                errors += 1
+                lines.append(f"      ✗ Ошибка создания подзадачи {subtask_title}: {e}")
+        
+        if parallel:
+            if key in journal.placed:
+                turns.skip(turn)
+            else:
+                # Перенос в колонку ставит задачу наверх - переносим в обратном порядке
+                # файла; если все подзадачи готовы, связь уходит тем же запросом
+                fields = {'columnId': column_id}
+                if subtask_ids and not errors and not already_linked:
+                    fields['subtasks'] = subtask_ids
+                with turns.turn(turn):
+                    if unplaced:
+                        # Перенесённая после неудачного переноса задача встала бы выше
+                        # не перенесённой: расстановку продолжит --resume в порядке файла
+                        unplaced.append(task_id)
+                        raise RuntimeError("не перенесена в колонку: не удался перенос предыдущей задачи")
                     try:
-                        client.update_task(task_id, subtasks=subtask_ids)
-                        print(f"      → Связано {len(subtask_ids)} подзадач с родительской задачей")
-                        time.sleep(delay)
-                    except Exception as e:
-                        failed += 1
-                        print(f"      ✗ Ошибка связывания подзадач: {e}")
-                        if '429' in str(e):
-                            print(f"      ⏸ Rate limit - пауза 60 секунд...")
-                            time.sleep(60)
-            
-            print()
-            
-        except Exception as e:
-            failed += 1
-            print(f"✗ Ошибка создания задачи {task_title}: {e}\n")
-            if '429' in str(e):
-                print(f"⏸ Rate limit - пауза 60 секунд...")
-                time.sleep(60)
+                        client.update_task(task_id, **fields)
+                    except Exception:
+                        # Задача создана, но вне колонки - перенесёт продолжение по журналу
+                        unplaced.append(task_id)
+                        raise
+                    journal.mark_placed(key)
+                    if 'subtasks' in fields:
+                        journal.mark_linked(key, subtask_ids)
+                pause()
+                if 'subtasks' in fields:
+                    linked = True
+                    lines.append(f"      → Связано {len(subtask_ids)} подзадач с родительской задачей")
+        
+        # Связываем подзадачи с родительской задачей (если не связаны при переносе)
+        if subtask_ids and already_linked:
+            lines.append("      → Подзадачи уже связаны прошлым запуском")
+        elif subtask_ids and not linked:
+            try:
+                client.update_task(task_id, subtasks=subtask_ids)
+                linked = True
+                lines.append(f"      → Связано {len(subtask_ids)} подзадач с родительской задачей")
+                # Связь с частью подзадач повторится при продолжении - уже со всеми
+                if journal is not None and len(subtask_ids) == len(subtasks):
+                    journal.mark_linked(key, subtask_ids)
+                pause()
+            except Exception as e:
+                errors += 1
+                lines.append(f"      ✗ Ошибка связывания подзадач: {e}")
+        
+        if journal is not None and not errors:
+            journal.mark_content(task_id, content_hash(task_data))
+        return {'id': task_id, 'resumed': resumed, 'subtasks': len(subtask_ids) - reused,
+                'reused_subtasks': reused, 'linked': linked, 'errors': errors, 'lines': lines}
+    
+    def update_subtask(subtask_id, subtask_data):
+        """Новая подзадача (subtask_id None) или новое описание существующей; возвращает ID"""
+        description = markdown_to_html(subtask_data.get('description', ''))
+        if subtask_id is None:
+            subtask_id = client.post('tasks', {'title': subtask_data['title'], 'description': description})['id']
+        else:
+            client.update_task(subtask_id, description=description)
+        pause()
+        return subtask_id
+    
+    def update(change):
+        """Описания и недостающие подзадачи задачи, которая уже есть на доске"""
+        task_data = change.task
+        task_id = change.board_task['id']
+        lines = []
+        
+        # Подзадачи - одновременно с описанием задачи
+        subtask_ids = list(change.subtask_ids)
+        futures = {position: subtask_pool.submit(update_subtask, subtask_ids[position], subtask_data)
+                   for position, subtask_data in enumerate(task_data.get('subtasks', []))
+                   if subtask_ids[position] is None or position in change.changed_subtasks}
+        if change.description:
+            client.update_task(task_id, description=markdown_to_html(task_data.get('description', '')))
+            lines.append("      ✓ Описание")
+            pause()
+        for position, future in futures.items():
+            title = task_data['subtasks'][position]['title']
+            lines.append(f"      ✓ {title}" if subtask_ids[position] is None else f"      ✓ {title} (описание)")
+            subtask_ids[position] = future.result()
+        
+        # Новые подзадачи - в порядке файла, подзадачи доски не из файла остаются
+        if change.new_subtasks:
+            client.update_task(task_id, subtasks=subtask_ids + change.other_subtasks)
+            lines.append(f"      → Связано {len(subtask_ids)} подзадач с родительской задачей")
+            pause()
+        
+        if journal is not None:
+            journal.mark_content(task_id, content_hash(task_data))
+        return {'id': task_id, 'resumed': False, 'updated': True, 'subtasks': change.new_subtasks,
+                'reused_subtasks': 0, 'linked': bool(change.new_subtasks), 'errors': 0, 'lines': lines}
+    
+    def unchanged(change):
+        if journal is not None:
+            journal.mark_content(change.board_task['id'], content_hash(change.task))
+        raise Skip("без изменений")
+    
+    def show(result):
+        task_title = result.item['title']
+        if result.status == SKIPPED:
+            print(f"= Без изменений: {task_title}")
+            return
+        if not result.ok:
+            print(f"✗ Ошибка импорта задачи {task_title}: {result.error}\n")
+            return
+        value = result.value
+        if value.get('updated'):
+            print(f"✎ Обновлена задача: {task_title}")
+            print("\n".join(value['lines'] + [""]))
+            return
+        if value['resumed'] and not (value['subtasks'] or value['linked'] or value['errors']):
+            print(f"↷ Уже создана: {task_title}")
+            return
+        print(f"{'↷ Продолжена' if value['resumed'] else '📝 Создана'} задача: {task_title}")
+        subtasks = result.item.get('subtasks', [])
+        if subtasks:
+            print(f"   └─ Подзадач: {len(subtasks)}"
+                  + (f" (создано прошлым запуском: {value['reused_subtasks']})" if value['reused_subtasks'] else ""))
+        for line in value['lines']:
+            print(line)
+        print()
+    
+    # Создаем задачи в ОБРАТНОМ порядке, чтобы первая задача из файла
+    # оказалась вверху списка на доске (очередь создания задач - turns).
+    # С --delay запросы идут по одному, как раньше
+    concurrency = 1 if delay else client.concurrency
+    turns = Turns()
+    unplaced = []
+    executor = BulkExecutor(client, concurrency=concurrency, max_failures=max_failures, on_result=show)
+    if changes is None:
+        operations = [(task_data, lambda index=index, task_data=task_data, turn=turn: create(index, task_data, turn))
+                      for turn, (index, task_data) in enumerate(reversed(list(enumerate(tasks))))]
+    else:
+        turn_of = {c.index: turn for turn, c in enumerate(c for c in reversed(changes) if c.action == CREATE)}
+        run = {CREATE: lambda c: create(c.index, c.task, turn_of[c.index]), UPDATE: update, UNCHANGED: unchanged}
+        operations = [(change.task, lambda change=change: run[change.action](change))
+                      for change in reversed(changes)]
+    with ThreadPoolExecutor(max_workers=concurrency) as subtask_pool:
+        report = executor.run(operations)
     
     # Итоги
-    print(f"{'='*60}")
-    print(f"✓ Задач создано: {created_tasks}")
-    print(f"✓ Подзадач создано: {created_subtasks}")
-    if failed > 0:
-        print(f"✗ Ошибок: {failed}")
-    print(f"{'='*60}")
+    created = [r.value for r in report.results if r.ok]
+    subtask_errors = sum(value['errors'] for value in created)
+    resumed = sum(1 for value in created if value['resumed'])
+    print_summary(report, "Задач создано" if not (resumed or changes) else "Задач обработано")
+    if resumed:
+        print(f"↷ Создано прошлым запуском: {resumed} задач, "
+              f"{sum(value['reused_subtasks'] for value in created)} подзадач")
+    print(f"✓ Подзадач создано: {sum(value['subtasks'] for value in created)}")
+    if subtask_errors:
+        print(f"✗ Ошибок подзадач и связывания: {subtask_errors}")
+    if unplaced:
+        print(f"⚠️  Созданы, но не перенесены в колонку ({len(unplaced)}): {', '.join(unplaced)}")
+    if journal is not None:
+        if not report.failed and not report.aborted and not subtask_errors:
+            journal.finish()
+        else:
+            print(f"ℹ️  Продолжить импорт: --resume (журнал {journal.path})")
+        journal.close()
+    
+    # Куда ушло время: запросы по endpoint'ам
+    print(f"\n{format_table(client.stats(), limit=10)}")
+    return report
+
 
+# Допуск на расхождение часов машины и сервера при поиске оборванных созданий
+CLOCK_SKEW_MS = 60 * 1000
 
-def get_column_by_name(board_id, column_name):
+
+def find_created_task(client, title, column_id=None, exclude=(), created_after=None):
+    """
+    Найти задачу, создание которой оборвалось (запрос ушёл, ответ не получен)
+    
+    Args:
+        client: YougileClient
+        title: Название задачи
+        column_id: Колонка задачи (None - подзадача, создаётся без колонки)
+        exclude: ID, которые уже заняты другими записями журнала
+        created_after: Начало импорта (timestamp в мс) - более старые задачи с тем же
+                       названием созданы не этим импортом (допуск на расхождение
+                       часов - CLOCK_SKEW_MS)
+    
+    Returns:
+        dict: Последняя подходящая задача или None
+    """
+    params = {"title": title}
+    if column_id:
+        params["columnId"] = column_id
+    matches = [task for task in client.paginator.get_all('task-list', params=params)
+               if task.get('title') == title and task.get('columnId') == column_id
+               and task['id'] not in exclude
+               and (created_after is None or task.get('timestamp', created_after) >= created_after - CLOCK_SKEW_MS)]
+    return matches[-1] if matches else None
+
+
+def get_column_by_name(board_id, column_name, client=None):
     """
     Получить ID колонки по названию
     
     Args:
         board_id: ID доски
         column_name: Название колонки (например, "Backlog")
+        client: YougileClient (по умолчанию создаётся новый)
     
     Returns:
         str: ID колонки или None
     """
-    client = YougileClient()
-    
-    # Получаем все колонки
-    all_columns = client.get_columns()
+    client = client or YougileClient()
     
-    # Фильтруем по доске и названию
-    for col in all_columns:
-        if col.get('boardId') == board_id and column_name.lower() in col.get('title', '').lower():
-            return col['id']
-    
-    return None
+    # Колонки доски из индекса клиента: точное совпадение, иначе частичное
+    column = client.index.column_by_name(board_id, column_name)
+    return column['id'] if column else None
 
 
 if __name__ == "__main__":
@@ -395,9 +733,20 @@ if __name__ == "__main__":
     parser.add_argument('--dry-run', action='store_true', help='Только показать что будет создано')
     parser.add_argument('--start-from', type=int, default=0, help='Начать с задачи номер N (нумерация с 0)')
     parser.add_argument('--limit', type=int, help='Создать только N задач')
-    parser.add_argument('--delay', type=float, default=1.5, help='Задержка между запросами в секундах (по умолчанию 1.5)')
+    parser.add_argument('--delay', type=float, default=0, help='Дополнительная задержка между запросами в секундах (по умолчанию 0)')
+    parser.add_argument('--trace', action='store_true', help='Выводить каждый запрос к API (статус, время, ожидание лимита)')
+    parser.add_argument('--max-failures', type=int, help='Остановиться после N неудачных задач')
+    parser.add_argument('--resume', action='store_true', help='Продолжить прерванный импорт по журналу')
+    parser.add_argument('--journal', help='Файл журнала импорта (по умолчанию <файл>.journal)')
+    parser.add_argument('--sync', action='store_true',
+                        help='Импорт по разнице: создать только новые задачи, обновить изменённые')
+    parser.add_argument('--parallel', action='store_true',
+                        help='Создавать задачи одновременно, затем расставить их в колонке по порядку '
+                             '(порядок после переноса проверен только на fake_server.py)')
     
     args = parser.parse_args()
+    if args.sync and args.resume:
+        parser.error("--sync и --resume нельзя использовать вместе")
     
     try:
         # Получаем ID доски
@@ -430,33 +779,91 @@ if __name__ == "__main__":
         print(f"✓ Всего подзадач: {total_subtasks}")
         print()
         
-        if args.dry_run:
+        if args.dry_run and not args.sync:
             print("DRY RUN - показываю структуру:\n")
             for task in tasks:
                 print(f"📝 {task['title']}")
                 for subtask in task.get('subtasks', []):
                     print(f"   └─ {subtask['title']}")
                 print()
+            print(format_plan(plan_import(tasks, parallel=args.parallel), latency=EXPECTED_LATENCY + args.delay))
             sys.exit(0)
         
-        # Получаем ID колонки
-        print(f"🔍 Поиск колонки: {args.column}")
-        column_id = get_column_by_name(board_id, args.column)
+        # Журнал: что уже создано (для --resume после сбоя)
+        journal = ImportJournal(args.journal or f"{args.file}.journal")
+        fingerprint = tasks_fingerprint(tasks)
         
-        if not column_id:
-            print(f"✗ Колонка '{args.column}' не найдена на доске")
-            sys.exit(1)
+        if args.resume:
+            if not journal.unfinished:
+                print(f"✗ В журнале {journal.path} нет прерванного импорта")
+                sys.exit(1)
+            if not journal.matches(fingerprint) or journal.header.get('board_id') != board_id:
+                print("✗ Журнал относится к другому импорту (проверьте файл, доску, --start-from и --limit)")
+                sys.exit(1)
+            if journal.header.get('mode') == 'sync':
+                print("✗ Прерван импорт по разнице - запустите --sync ещё раз")
+                sys.exit(1)
+            # Колонка и способ импорта известны из журнала - повторно не ищем
+            column_id = journal.header['column_id']
+            args.parallel = journal.header.get('parallel', False)
+            print(f"↷ Продолжение импорта: уже создано {len(journal.created)} задач и подзадач, "
+                  f"не подтверждено {len(journal.pending)}\n")
+        else:
+            # Импорт по разнице сам видит, что уже создано, - журнал ему не помеха
+            if journal.unfinished and not args.sync:
+                print(f"✗ Найден журнал прерванного импорта: {journal.path}")
+                print("  Продолжите его с --resume или удалите файл, чтобы начать заново")
+                sys.exit(1)
+            
+            # Получаем ID колонки
+            print(f"🔍 Поиск колонки: {args.column}")
+            column_id = get_column_by_name(board_id, args.column)
+            
+            if not column_id:
+                print(f"✗ Колонка '{args.column}' не найдена на доске")
+                sys.exit(1)
+            
+            print(f"✓ Колонка найдена: {column_id}\n")
         
-        print(f"✓ Колонка найдена: {column_id}\n")
+        changes = None
+        if args.sync:
+            # Хэши задач, импортированных в эту колонку прошлым запуском
+            known = journal.hashes if journal.header and journal.header.get('column_id') == column_id else {}
+            print("🔍 Сравнение с доской...")
+            changes = diff_import(YougileClient(), tasks, column_id, known)
+            for change in changes:
+                if change.action == CREATE:
+                    print(f"   + {change.task['title']}")
+                elif change.action == UPDATE:
+                    print(f"   ~ {change.task['title']}")
+            print(f"\n{format_plan(plan_sync(changes), latency=EXPECTED_LATENCY + args.delay)}\n")
+            if args.dry_run:
+                sys.exit(0)
+            if all(change.action == UNCHANGED for change in changes):
+                print("✓ Доска совпадает с файлом")
+                sys.exit(0)
         
         # Подтверждение
-        response = input(f"Создать {len(tasks)} задач ({total_subtasks} подзадач) в колонке '{args.column}'? (yes/no): ")
+        if args.sync:
+            question = "Применить изменения"
+        else:
+            action = "Продолжить импорт" if args.resume else "Создать"
+            question = f"{action} {len(tasks)} задач ({total_subtasks} подзадач) в колонке '{args.column}'"
+        response = input(f"{question}? (yes/no): ")
         if response.lower() not in ['yes', 'y', 'да', 'д']:
             print("✗ Отменено")
             sys.exit(0)
         
+        if not args.resume:
+            journal.start(file=args.file, board_id=board_id, column_id=column_id,
+                          fingerprint=fingerprint, tasks=len(tasks), mode='sync' if args.sync else 'import',
+                          parallel=args.parallel)
+        
         # Создаем задачи
-        create_tasks_in_yougile(tasks, board_id, column_id, delay=args.delay)
+        create_tasks_in_yougile(tasks, board_id, column_id, delay=args.delay,
+                                hooks=[TraceHook()] if args.trace else (),
+                                max_failures=args.max_failures, journal=journal, changes=changes,
+                                parallel=args.parallel)
         
     except KeyboardInterrupt:
         print("\n✗ Прервано пользователем")
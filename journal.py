@@ -0,0 +1,162 @@
+"""
+Журнал импорта: что уже создано, чтобы продолжить прерванный импорт без дублей
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+
+def tasks_fingerprint(tasks: List[Dict]) -> str:
+    """Отпечаток списка задач: продолжать можно только тот же самый импорт"""
+    titles = [[t['title']] + [s['title'] for s in t.get('subtasks', [])] for t in tasks]
+    return hashlib.sha256(json.dumps(titles, ensure_ascii=False).encode('utf-8')).hexdigest()[:16]
+
+
+class ImportJournal:
+    """
+    Журнал с упреждающей записью (JSON Lines, fsync после каждой записи)
+
+    Перед созданием задачи пишется намерение (intent), после - её ID
+    (created), после связывания подзадач - linked. По журналу прерванного
+    запуска видно, что уже создано (повторно не создаётся), что связано
+    (не связывается снова) и какие создания оборвались на середине: ответ
+    на POST не получен, и задача могла появиться - её нужно поискать.
+    При параллельном импорте задача создаётся вне колонки и переносится
+    в неё по порядку - после переноса пишется placed.
+    Для полностью импортированных задач записывается хэш содержимого
+    (content): import_tasks --sync по нему пропускает неизменённые задачи.
+
+    Ключи - позиции в списке задач: "3" - задача, "3/1" - её подзадача.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Файл журнала (читается, если уже существует)
+        """
+        self.path = path
+        self.header: Optional[Dict[str, Any]] = None
+        self.created: Dict[str, str] = {}
+        self.pending: Set[str] = set()
+        self.linked: Set[str] = set()
+        self.placed: Set[str] = set()
+        self.hashes: Dict[str, str] = {}
+        self.finished = False
+        self._lock = threading.Lock()
+        self._file = None
+        if os.path.exists(path):
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Запись оборвалась при аварийном завершении - дальше ничего нет
+                    break
+                self._apply(record)
+
+    def _apply(self, record: Dict[str, Any]):
+        op = record.get('op')
+        if op == 'start':
+            self.header = {k: v for k, v in record.items() if k != 'op'}
+        elif op == 'intent':
+            self.pending.add(record['key'])
+        elif op == 'created':
+            self.pending.discard(record['key'])
+            self.created[record['key']] = record['id']
+        elif op == 'linked':
+            self.linked.add(record['key'])
+        elif op == 'placed':
+            self.placed.add(record['key'])
+        elif op == 'content':
+            self.hashes[record['id']] = record['hash']
+        elif op == 'finished':
+            self.finished = True
+
+    def _write(self, record: Dict[str, Any]):
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._apply(record)
+
+    @property
+    def unfinished(self) -> bool:
+        """Журнал прерванного запуска"""
+        return self.header is not None and not self.finished
+
+    def matches(self, fingerprint: str) -> bool:
+        return self.header is not None and self.header.get('fingerprint') == fingerprint
+
+    def start(self, **header):
+        """
+        Начать новый журнал (старый перезаписывается)
+
+        В заголовок пишется время начала (started, мс как timestamp задач
+        Yougile): при продолжении задачи старше него не считаются созданными
+        этим импортом.
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+            self._file = open(self.path, 'w', encoding='utf-8')
+        self.header, self.created, self.pending, self.linked, self.placed = None, {}, set(), set(), set()
+        self.hashes, self.finished = {}, False
+        self._write({'op': 'start', 'started': int(time.time() * 1000), **header})
+
+    def once(self, key: str, create: Callable[[], Dict[str, Any]],
+             find: Optional[Callable[[], Optional[Dict[str, Any]]]] = None) -> Tuple[str, bool]:
+        """
+        Создать объект ровно один раз
+
+        Args:
+            key: Ключ в журнале
+            create: Создание (POST), возвращает объект с 'id'
+            find: Поиск объекта, если прошлый запуск оборвался на его создании
+
+        Returns:
+            (ID, True если объект создан прошлым запуском)
+        """
+        if key in self.created:
+            return self.created[key], True
+        if key in self.pending and find is not None:
+            found = find()
+            if found is not None:
+                self._write({'op': 'created', 'key': key, 'id': found['id']})
+                return found['id'], True
+        self._write({'op': 'intent', 'key': key})
+        result = create()
+        self._write({'op': 'created', 'key': key, 'id': result['id']})
+        return result['id'], False
+
+    def created_ids(self) -> Set[str]:
+        """ID всех созданных объектов (снимок - журнал могут дополнять другие потоки)"""
+        with self._lock:
+            return set(self.created.values())
+
+    def mark_linked(self, key: str, subtask_ids: List[str]):
+        self._write({'op': 'linked', 'key': key, 'subtasks': subtask_ids})
+
+    def mark_placed(self, key: str):
+        self._write({'op': 'placed', 'key': key})
+
+    def mark_content(self, task_id: str, digest: str):
+        """Задача на доске совпадает с файлом (хэш из import_tasks.content_hash)"""
+        self._write({'op': 'content', 'id': task_id, 'hash': digest})
+
+    def finish(self):
+        """Импорт завершён - журнал больше не нужен для продолжения"""
+        self._write({'op': 'finished'})
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,285 @@
+"""
+Статистика запросов клиента по шаблонам endpoint'ов
+"""
+import atexit
+import json
+import math
+import os
+import random
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from hooks import RequestContext, RequestHook
+
+# Сегменты пути, которые являются идентификаторами (UUID, числа, длинные hex)
+_ID_SEGMENT = re.compile(r'^(?:[0-9a-fA-F]{8}-[0-9a-fA-F-]{27}|\d+|[0-9a-fA-F]{16,})$')
+
+# Границы корзин гистограммы задержек для Prometheus (секунды)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Размер выборки задержек для расчёта перцентилей на каждый endpoint
+RESERVOIR_SIZE = 10000
+
+
+def endpoint_template(endpoint: str) -> str:
+    """Шаблон endpoint'а: 'tasks/0b1c...-...' -> 'tasks/{id}'"""
+    segments = endpoint.strip('/').split('?', 1)[0].split('/')
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment for segment in segments)
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Перцентиль по ближайшему рангу (значения отсортированы)"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+class EndpointStats:
+    """Статистика одного метода + шаблона endpoint'а"""
+
+    def __init__(self):
+        self.count = 0
+        self.statuses: Counter = Counter()
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.retries = 0
+        self.limiter_wait = 0.0
+        self.latency_total = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.samples: List[float] = []
+
+    def observe_latency(self, seconds: float, rng: random.Random):
+        self.latency_total += seconds
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        # Reservoir sampling: перцентили по равномерной выборке при любом числе вызовов
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            index = rng.randrange(self.count)
+            if index < RESERVOIR_SIZE:
+                self.samples[index] = seconds
+
+    def merge(self, other: 'EndpointStats'):
+        self.count += other.count
+        self.statuses.update(other.statuses)
+        self.bytes_sent += other.bytes_sent
+        self.bytes_received += other.bytes_received
+        self.retries += other.retries
+        self.limiter_wait += other.limiter_wait
+        self.latency_total += other.latency_total
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.samples = (self.samples + other.samples)[-RESERVOIR_SIZE:]
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        return {
+            'count': self.count,
+            'statuses': {str(status): n for status, n in sorted(self.statuses.items(), key=str)},
+            'bytes_sent': self.bytes_sent,
+            'bytes_received': self.bytes_received,
+            'retries': self.retries,
+            'limiter_wait_seconds': round(self.limiter_wait, 6),
+            'latency_seconds': {
+                'total': round(self.latency_total, 6),
+                'p50': round(percentile(ordered, 0.50), 6),
+                'p95': round(percentile(ordered, 0.95), 6),
+                'p99': round(percentile(ordered, 0.99), 6),
+                'max': round(ordered[-1], 6) if ordered else 0.0,
+            },
+        }
+
+
+class ClientMetrics:
+    """
+    Статистика запросов клиента
+
+    Для каждой пары (метод, шаблон endpoint'а) учитываются: число HTTP попыток,
+    коды ответов (ошибки сети - как 'error'), переданные и полученные байты,
+    повторы, время ожидания ограничителя частоты и задержки (гистограмма
+    и перцентили p50/p95/p99).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints: Dict[Tuple[str, str], EndpointStats] = {}
+        self._rng = random.Random(0)
+
+    def _stats(self, method: str, endpoint: str) -> EndpointStats:
+        key = (method, endpoint_template(endpoint))
+        stats = self._endpoints.get(key)
+        if stats is None:
+            stats = self._endpoints[key] = EndpointStats()
+        return stats
+
+    def record(self, method: str, endpoint: str, status: Any, seconds: float,
+               bytes_sent: int = 0, bytes_received: int = 0, limiter_wait: float = 0.0):
+        """
+        Учесть одну HTTP попытку
+
+        Args:
+            method: HTTP метод
+            endpoint: Endpoint (идентификаторы заменяются на {id})
+            status: Код ответа или 'error' для ошибки сети
+            seconds: Длительность запроса (без ожидания ограничителя)
+            bytes_sent: Размер тела запроса
+            bytes_received: Размер тела ответа
+            limiter_wait: Время ожидания ограничителя перед запросом
+        """
+        with self._lock:
+            stats = self._stats(method, endpoint)
+            stats.count += 1
+            stats.statuses[status] += 1
+            stats.bytes_sent += bytes_sent
+            stats.bytes_received += bytes_received
+            stats.limiter_wait += limiter_wait
+            stats.observe_latency(seconds, self._rng)
+
+    def record_retry(self, method: str, endpoint: str):
+        """Учесть повтор запроса"""
+        with self._lock:
+            self._stats(method, endpoint).retries += 1
+
+    def merge(self, other: 'ClientMetrics'):
+        """Добавить статистику другого клиента"""
+        with other._lock:
+            items = [(key, stats) for key, stats in other._endpoints.items()]
+        with self._lock:
+            for key, stats in items:
+                self._endpoints.setdefault(key, EndpointStats()).merge(stats)
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Статистика в виде {'GET task-list': {...}, ...}, по убыванию общего времени"""
+        with self._lock:
+            items = [(f"{method} {template}", stats.summary())
+                     for (method, template), stats in self._endpoints.items()]
+        items.sort(key=lambda item: -(item[1]['latency_seconds']['total'] + item[1]['limiter_wait_seconds']))
+        return dict(items)
+
+    def to_json(self) -> str:
+        return json.dumps(self.snapshot(), ensure_ascii=False, indent=2)
+
+    def to_prometheus(self) -> str:
+        """Статистика в текстовом формате Prometheus"""
+        with self._lock:
+            items = sorted(self._endpoints.items())
+            lines = [
+                "# HELP yougile_requests_total HTTP attempts by endpoint and status",
+                "# TYPE yougile_requests_total counter",
+            ]
+            for (method, template), stats in items:
+                for status, n in sorted(stats.statuses.items(), key=str):
+                    lines.append(f'yougile_requests_total{{method="{method}",endpoint="{template}",'
+                                 f'status="{status}"}} {n}')
+            for name, attribute, help_text in (
+                    ("yougile_retries_total", "retries", "Retried requests"),
+                    ("yougile_request_bytes_total", "bytes_sent", "Request body bytes"),
+                    ("yougile_response_bytes_total", "bytes_received", "Response body bytes"),
+                    ("yougile_rate_limit_wait_seconds_total", "limiter_wait", "Time spent waiting on the rate limiter")):
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} counter")
+                for (method, template), stats in items:
+                    lines.append(f'{name}{{method="{method}",endpoint="{template}"}} {getattr(stats, attribute)}')
+            lines.append("# HELP yougile_request_duration_seconds HTTP request latency")
+            lines.append("# TYPE yougile_request_duration_seconds histogram")
+            for (method, template), stats in items:
+                labels = f'method="{method}",endpoint="{template}"'
+                cumulative = 0
+                for bound, n in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += n
+                    lines.append(f'yougile_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+                lines.append(f'yougile_request_duration_seconds_sum{{{labels}}} {stats.latency_total}')
+                lines.append(f'yougile_request_duration_seconds_count{{{labels}}} {stats.count}')
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        """Записать статистику в файл: .prom / .txt - Prometheus, иначе JSON"""
+        text = self.to_prometheus() if path.endswith(('.prom', '.txt')) else self.to_json()
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+class MetricsHook(RequestHook):
+    """Хук клиента, записывающий каждую HTTP попытку в ClientMetrics"""
+
+    def __init__(self, metrics: ClientMetrics):
+        self.metrics = metrics
+
+    def before_request(self, ctx: RequestContext):
+        if ctx.attempt > 1:
+            self.metrics.record_retry(ctx.method, ctx.endpoint)
+
+    def after_response(self, ctx: RequestContext, response):
+        self.metrics.record(ctx.method, ctx.endpoint, response.status_code, ctx.elapsed,
+                            bytes_sent=_body_size(ctx), bytes_received=len(response.content),
+                            limiter_wait=ctx.limiter_wait)
+
+    def on_error(self, ctx: RequestContext, error: Exception):
+        # HTTP ошибки уже учтены в after_response, здесь - только ошибки сети
+        if getattr(error, 'status_code', None) is None:
+            self.metrics.record(ctx.method, ctx.endpoint, "error", ctx.elapsed,
+                                bytes_sent=_body_size(ctx), limiter_wait=ctx.limiter_wait)
+
+
+def _body_size(ctx: RequestContext) -> int:
+    return len(ctx.kwargs.get("data") or b"")
+
+
+# Статистика всех клиентов процесса для выгрузки при выходе. Ссылки сильные:
+# скрипты создают короткоживущие клиенты, их запросы тоже должны попасть в файл
+_registered: List[ClientMetrics] = []
+_registered_lock = threading.Lock()
+_exit_path: Optional[str] = None
+
+
+def dump_at_exit(metrics: ClientMetrics, path: Optional[str]):
+    """
+    Выгрузить статистику в файл при завершении процесса
+
+    Статистика всех зарегистрированных клиентов объединяется в один файл.
+    """
+    global _exit_path
+    if not path:
+        return
+    with _registered_lock:
+        if not any(registered is metrics for registered in _registered):
+            _registered.append(metrics)
+    if _exit_path is None:
+        atexit.register(_dump_registered)
+    _exit_path = path
+
+
+def _dump_registered():
+    combined = ClientMetrics()
+    with _registered_lock:
+        registered = list(_registered)
+    for metrics in registered:
+        combined.merge(metrics)
+    if combined.snapshot():
+        directory = os.path.dirname(os.path.abspath(_exit_path))
+        os.makedirs(directory, exist_ok=True)
+        combined.dump(_exit_path)
+
+
+def format_table(snapshot: Dict[str, Dict[str, Any]], limit: Optional[int] = None) -> str:
+    """Таблица для вывода в консоль"""
+    rows: Iterable = list(snapshot.items())[:limit] if limit else snapshot.items()
+    lines = [f"{'Endpoint':<32} {'Вызовов':>8} {'Повторов':>9} {'Лимит, с':>9} "
+             f"{'Время, с':>9} {'p50':>7} {'p95':>7} {'p99':>7}"]
+    for name, stats in rows:
+        latency = stats['latency_seconds']
+        lines.append(f"{name:<32} {stats['count']:>8} {stats['retries']:>9} "
+                     f"{stats['limiter_wait_seconds']:>9.1f} {latency['total']:>9.1f} "
+                     f"{latency['p50']:>7.2f} {latency['p95']:>7.2f} {latency['p99']:>7.2f}")
+    return "\n".join(lines)
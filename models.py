@@ -0,0 +1,185 @@
+"""
+Компактные модели сущностей Yougile (__slots__, только нужные поля)
+"""
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Dict, Iterable, Optional, Tuple
+
+# Поле не загружено (в отличие от None - значения, пришедшего из API)
+_UNSET: Any = type("Unset", (), {"__repr__": lambda self: "<не загружено>"})()
+
+
+def _intern(value: Any) -> Any:
+    """Повторяющиеся ID (колонки, доски, пользователи) хранятся в одном экземпляре"""
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _same(value: Any) -> Any:
+    return value
+
+
+def _as_tuple(value: Any) -> Tuple[Any, ...]:
+    return tuple(_intern(item) for item in value) if value else ()
+
+
+class _Model:
+    """Общий разбор ответа API: только перечисленные поля, остальные не хранятся"""
+
+    __slots__ = ()
+
+    # Поле API -> (атрибут модели, преобразование)
+    API_FIELDS: ClassVar[Dict[str, Tuple[str, Callable[[Any], Any]]]] = {}
+    # Поля, которые не хранятся в модели, а загружаются при обращении
+    LAZY_FIELDS: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def check_fields(cls, fields: Iterable[str]) -> Tuple[str, ...]:
+        """Проверить имена полей API для проекции"""
+        fields = tuple(fields)
+        unknown = [name for name in fields if name not in cls.API_FIELDS and name not in cls.LAZY_FIELDS]
+        if unknown:
+            raise ValueError(f"Неизвестные поля {cls.__name__}: {', '.join(unknown)}")
+        if 'id' not in fields:
+            fields = ('id',) + fields
+        return fields
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any], fields: Optional[Iterable[str]] = None, **extra):
+        """
+        Создать модель из ответа API
+
+        Args:
+            data: Словарь из ответа API
+            fields: Какие поля API сохранить (по умолчанию все поля модели)
+            **extra: Дополнительные аргументы конструктора (например, loader)
+        """
+        names = cls.API_FIELDS if fields is None else fields
+        kwargs = {'id': data.get('id')}
+        for name in names:
+            if name in cls.API_FIELDS and name in data:
+                attribute, convert = cls.API_FIELDS[name]
+                kwargs[attribute] = convert(data[name])
+            elif name in cls.LAZY_FIELDS and name in data:
+                kwargs[f"_{name}"] = data[name]
+        return cls(**kwargs, **extra)
+
+
+@dataclass(slots=True)
+class Task(_Model):
+    """
+    Задача
+
+    Описание (HTML, обычно самое тяжёлое поле) хранится, только если его
+    запросили в fields; иначе при первом обращении к task.description
+    задача загружается через loader (client.get_task).
+    """
+
+    API_FIELDS: ClassVar = {
+        'id': ('id', _same),
+        'title': ('title', _same),
+        'columnId': ('column_id', _intern),
+        'archived': ('archived', bool),
+        'completed': ('completed', bool),
+        'deleted': ('deleted', bool),
+        'subtasks': ('subtasks', _as_tuple),
+        'assigned': ('assigned', _as_tuple),
+        'deadline': ('deadline', _same),
+        'timestamp': ('timestamp', _same),
+        'createdBy': ('created_by', _intern),
+    }
+    LAZY_FIELDS: ClassVar = ('description',)
+
+    id: str
+    title: Optional[str] = None
+    column_id: Optional[str] = None
+    archived: bool = False
+    completed: bool = False
+    deleted: bool = False
+    subtasks: Tuple[str, ...] = ()
+    assigned: Tuple[str, ...] = ()
+    deadline: Optional[Dict[str, Any]] = None
+    timestamp: Optional[int] = None
+    created_by: Optional[str] = None
+    _description: Any = field(default=_UNSET, repr=False, compare=False)
+    loader: Optional[Callable[[str], Dict[str, Any]]] = field(default=None, repr=False, compare=False)
+
+    @property
+    def description(self) -> Optional[str]:
+        """Описание задачи (загружается при первом обращении, если не было запрошено)"""
+        if self._description is _UNSET:
+            if self.loader is None:
+                return None
+            self._description = self.loader(self.id).get('description')
+        return self._description
+
+
+@dataclass(slots=True)
+class Column(_Model):
+    """Колонка"""
+
+    API_FIELDS: ClassVar = {
+        'id': ('id', _same),
+        'title': ('title', _same),
+        'boardId': ('board_id', _intern),
+        'color': ('color', _same),
+        'deleted': ('deleted', bool),
+    }
+
+    id: str
+    title: Optional[str] = None
+    board_id: Optional[str] = None
+    color: Optional[int] = None
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class Board(_Model):
+    """Доска"""
+
+    API_FIELDS: ClassVar = {
+        'id': ('id', _same),
+        'title': ('title', _same),
+        'projectId': ('project_id', _intern),
+        'deleted': ('deleted', bool),
+    }
+
+    id: str
+    title: Optional[str] = None
+    project_id: Optional[str] = None
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class Project(_Model):
+    """Проект"""
+
+    API_FIELDS: ClassVar = {
+        'id': ('id', _same),
+        'title': ('title', _same),
+        'timestamp': ('timestamp', _same),
+        'deleted': ('deleted', bool),
+    }
+
+    id: str
+    title: Optional[str] = None
+    timestamp: Optional[int] = None
+    deleted: bool = False
+
+
+@dataclass(slots=True)
+class User(_Model):
+    """Пользователь компании"""
+
+    API_FIELDS: ClassVar = {
+        'id': ('id', _same),
+        'email': ('email', _same),
+        'realName': ('real_name', _same),
+        'isAdmin': ('is_admin', bool),
+        'status': ('status', _same),
+    }
+
+    id: str
+    email: Optional[str] = None
+    real_name: Optional[str] = None
+    is_admin: bool = False
+    status: Optional[str] = None
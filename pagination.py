@@ -0,0 +1,331 @@
+"""
+Постраничное получение списков Yougile API с адаптивным размером страницы
+"""
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+import requests
+
+from exceptions import APIError, TransportError, YougileError
+
+# Максимальный размер страницы, который принимает Yougile API
+MAX_PAGE_SIZE = 1000
+# Меньше этого страница не уменьшается
+MIN_PAGE_SIZE = 10
+# Если страница грузится дольше, следующие обходы начинают с меньшей страницы
+SLOW_PAGE_SECONDS = 10.0
+# Коды ответа, после которых имеет смысл запросить страницу меньшего размера
+SHRINK_STATUSES = frozenset({413, 414, 502, 504})
+
+
+def is_page_size_error(error: Exception) -> bool:
+    """Ошибка из-за слишком большой страницы (объём ответа или таймаут)"""
+    if isinstance(error, TransportError):
+        return isinstance(error.original, requests.exceptions.Timeout)
+    return isinstance(error, APIError) and error.status_code in SHRINK_STATUSES
+
+
+class PageSizeTuner:
+    """
+    Размер страницы и статистика задержек по каждому endpoint
+
+    Для каждого endpoint хранится текущий размер страницы и средняя (EWMA)
+    задержка загрузки страницы каждого размера. Обход начинается с наибольшего
+    размера, который принимает API, и уменьшается после ошибок объёма/таймаута
+    или слишком медленных страниц. Если указан путь к файлу, состояние
+    сохраняется и следующие запуски скриптов начинают с подобранного размера.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_size: int = MAX_PAGE_SIZE,
+                 min_size: int = MIN_PAGE_SIZE, slow_seconds: float = SLOW_PAGE_SECONDS):
+        """
+        Args:
+            path: JSON файл для сохранения состояния между запусками (None - только в памяти)
+            max_size: Начальный (максимальный) размер страницы
+            min_size: Минимальный размер страницы
+            slow_seconds: Порог задержки страницы, после которого размер уменьшается
+        """
+        self.path = path
+        self.max_size = max_size
+        self.min_size = min(min_size, max_size)
+        self.slow_seconds = slow_seconds
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self._state = json.load(f)
+            except (OSError, ValueError):
+                self._state = {}
+
+    def page_size(self, endpoint: str) -> int:
+        """Размер страницы для следующего обхода endpoint"""
+        with self._lock:
+            size = self._state.get(endpoint, {}).get('size', self.max_size)
+        return max(self.min_size, min(self.max_size, int(size)))
+
+    def latency(self, endpoint: str) -> Dict[int, float]:
+        """Средняя задержка страницы (секунды) по размерам страницы"""
+        with self._lock:
+            latency = self._state.get(endpoint, {}).get('latency', {})
+            return {int(size): seconds for size, seconds in latency.items()}
+
+    def record(self, endpoint: str, page_size: int, seconds: float):
+        """Учесть задержку загрузки страницы"""
+        with self._lock:
+            state = self._state.setdefault(endpoint, {'size': self.max_size, 'latency': {}})
+            key = str(page_size)
+            previous = state['latency'].get(key)
+            state['latency'][key] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+            if state['latency'][key] > self.slow_seconds and page_size <= state['size']:
+                state['size'] = max(self.min_size, page_size // 2)
+
+    def shrink(self, endpoint: str, page_size: int) -> Optional[int]:
+        """
+        Уменьшить размер страницы после ошибки
+
+        Returns:
+            Новый размер или None, если меньше уже нельзя
+        """
+        if page_size <= self.min_size:
+            return None
+        new_size = max(self.min_size, page_size // 2)
+        with self._lock:
+            state = self._state.setdefault(endpoint, {'size': self.max_size, 'latency': {}})
+            state['size'] = min(state['size'], new_size)
+        self.save()
+        return new_size
+
+    def save(self):
+        """Сохранить состояние в файл (если он задан)"""
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._state, ensure_ascii=False, indent=2)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
+
+
+class Paginator:
+    """
+    Общий обход списков для всех list-endpoint'ов клиента
+
+    Понимает оба формата ответа API: список или {"paging": ..., "content": [...]}.
+    Страница, на которой сервер вернул ошибку объёма или таймаут, делится
+    пополам и запрашивается заново меньшими частями.
+    """
+
+    def __init__(self, get: Callable[..., Any],
+                 map_concurrently: Callable[[Callable[[Any], Any], List[Any]], List[Any]],
+                 tuner: Optional[PageSizeTuner] = None,
+                 get_page: Optional[Callable[[str, Dict[str, Any], List[float]], Any]] = None):
+        """
+        Args:
+            get: Функция GET запроса (endpoint, params=...)
+            map_concurrently: Функция параллельного map с сохранением порядка
+            tuner: Хранилище размеров страниц и задержек
+            get_page: GET страницы (endpoint, params, timing) без повторов ошибок объёма,
+                      добавляющий в timing время передачи каждой попытки - без ожидания
+                      ограничителя частоты и пауз между повторами. Без него страницы
+                      запрашиваются через get, а задержки не учитываются
+        """
+        self._get = get
+        self._get_page = get_page
+        self._map_concurrently = map_concurrently
+        self.tuner = tuner or PageSizeTuner()
+
+    def fetch_page(self, endpoint: str, params: Optional[Dict[str, Any]], offset: int,
+                   limit: int) -> Any:
+        """
+        Получить одну страницу; при ошибке объёма/таймаута - двумя половинами
+
+        Ошибка объёма не повторяется с тем же размером: страница сразу делится.
+        Страница минимального размера запрашивается с обычными повторами.
+
+        Returns:
+            Ответ API; для разделённой страницы content объединён, а paging
+            взят из второй половины
+        """
+        page_params = {**(params or {}), "limit": limit, "offset": offset}
+        if self._get_page is None:
+            return self._get(endpoint, params=page_params)
+        timing: List[float] = []
+        try:
+            result = self._get_page(endpoint, page_params, timing)
+        except YougileError as e:
+            if not is_page_size_error(e):
+                raise
+            half = self.tuner.shrink(endpoint, limit)
+            if half is None:
+                return self._get(endpoint, params=page_params)
+            first = self.fetch_page(endpoint, params, offset, half)
+            if not (isinstance(first, dict) and 'content' in first):
+                return first
+            if not first.get('paging', {}).get('next', False):
+                return first
+            step = page_step(first, half)
+            second = self.fetch_page(endpoint, params, offset + step, limit - step)
+            return {
+                'paging': dict(second.get('paging', {}), offset=offset, limit=limit),
+                'content': first['content'] + second.get('content', []),
+            }
+        # Пусто, если ответ взят из кэша или из одновременного такого же запроса
+        if timing:
+            self.tuner.record(endpoint, limit, timing[-1])
+        return result
+
+    def iterate(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                limit: Optional[int] = None,
+                transform: Optional[Callable[[Dict[str, Any]], Any]] = None) -> Iterator[Any]:
+        """
+        Генератор элементов: страницы запрашиваются последовательно по мере чтения
+
+        Память не растёт с длиной списка: дубликаты (элементы, сдвинувшиеся
+        на следующую страницу во время обхода) ищутся только среди id
+        предыдущей страницы.
+
+        Args:
+            transform: Преобразование элемента (например, в компактную модель)
+        """
+        limit = limit or self.tuner.page_size(endpoint)
+        previous: Set[Any] = set()
+        offset = 0
+
+        while True:
+            result = self.fetch_page(endpoint, params, offset, limit)
+
+            if not (isinstance(result, dict) and 'content' in result):
+                items = result if isinstance(result, list) else [result]
+                yield from (map(transform, items) if transform else items)
+                return
+
+            current: Set[Any] = set()
+            for item in result['content']:
+                item_id = item.get('id') if isinstance(item, dict) else None
+                if item_id is not None:
+                    if item_id in previous or item_id in current:
+                        continue
+                    current.add(item_id)
+                yield transform(item) if transform else item
+            previous = current
+
+            if not result.get('paging', {}).get('next', False):
+                return
+            offset += page_step(result, limit)
+
+    def get_all(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                limit: Optional[int] = None,
+                transform: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Any]:
+        """
+        Получить все страницы списка
+
+        Первая страница запрашивается отдельно. Если в `paging` есть общее
+        количество элементов, остальные смещения запрашиваются одновременно
+        (в пределах лимита запросов), иначе - последовательно по `paging.next`.
+        Страницы объединяются по порядку, дубликаты по id отбрасываются.
+
+        Args:
+            transform: Преобразование элемента; применяется к каждой странице
+                       сразу после получения, полные ответы не накапливаются
+        """
+        limit = limit or self.tuner.page_size(endpoint)
+        convert = (lambda items: [transform(item) for item in items]) if transform else (lambda items: items)
+        first = self.fetch_page(endpoint, params, 0, limit)
+
+        if not (isinstance(first, dict) and 'content' in first):
+            return convert(first if isinstance(first, list) else [first])
+
+        pages = [convert(first['content'])]
+        last = first
+        total = paging_total(first)
+        # Сервер может вернуть страницу меньше запрошенной - шаг по тому, что он отдал
+        step = page_step(first, limit)
+        offset = step
+
+        if last.get('paging', {}).get('next', False) and total is not None:
+            offsets = list(range(step, total, step))
+            results = self._map_concurrently(
+                lambda page_offset: self._page(endpoint, params, page_offset, limit, convert),
+                offsets
+            )
+            for page_offset, (content, paging, size) in zip(offsets, results):
+                pages.append(content)
+                last = {'paging': paging}
+                offset = page_offset + size
+
+        # Сервер не сообщил общее количество (или элементы добавились во время обхода)
+        while last.get('paging', {}).get('next', False):
+            content, paging, size = self._page(endpoint, params, offset, limit, convert)
+            last = {'paging': paging}
+            pages.append(content)
+            offset += size
+
+        self.tuner.save()
+        return merge_pages(pages)
+
+    def _page(self, endpoint: str, params: Optional[Dict[str, Any]], offset: int, limit: int,
+              convert: Callable[[List[Any]], List[Any]]) -> Tuple[List[Any], Dict[str, Any], int]:
+        """Страница в виде (преобразованные элементы, paging, шаг до следующей страницы)"""
+        result = self.fetch_page(endpoint, params, offset, limit)
+        return convert(result.get('content', [])), result.get('paging', {}), page_step(result, limit)
+
+
+def page_step(result: Dict[str, Any], requested: int) -> int:
+    """
+    Смещение до следующей страницы: размер страницы, который сервер вернул
+
+    Сервер может ограничить страницу меньшим размером, чем запрошено, - тогда
+    шаг по запрошенному limit пропустил бы элементы между страницами.
+    Берётся число элементов страницы; для пустой страницы с `next` -
+    `paging.limit` или запрошенный limit, чтобы обход не зациклился.
+    """
+    size = len(result.get('content', []))
+    if size:
+        return size
+    limit = (result.get('paging') or {}).get('limit')
+    return limit if isinstance(limit, int) and limit > 0 else requested
+
+
+def paging_total(result: Dict[str, Any]) -> Optional[int]:
+    """
+    Общее количество элементов списка по блоку `paging`, если его можно узнать
+
+    Берётся поле `total`, либо `count`, когда оно больше числа элементов,
+    уже полученных с первой страницы (т.е. это общее количество, а не размер страницы).
+    """
+    paging = result.get('paging') or {}
+    total = paging.get('total')
+    if isinstance(total, int):
+        return total
+    count = paging.get('count')
+    received = paging.get('offset', 0) + len(result.get('content', []))
+    if isinstance(count, int) and count > received:
+        return count
+    return None
+
+
+def merge_pages(pages: List[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Объединить страницы по порядку, отбросив дубликаты по id
+
+    Множество id не больше результата, который и так целиком в памяти;
+    потоковый обход (Paginator.iterate) сравнивает только соседние страницы.
+    """
+    merged = []
+    seen = set()
+    for page in pages:
+        for item in page:
+            item_id = item.get('id') if isinstance(item, dict) else getattr(item, 'id', None)
+            if item_id is not None:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+            merged.append(item)
+    return merged
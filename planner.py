@@ -0,0 +1,212 @@
+"""
+Оценка стоимости массовых операций: запросы к API, время и окна лимита
+"""
+import heapq
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from config import RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD, CONCURRENCY, EXPECTED_LATENCY
+
+
+@dataclass
+class Step:
+    """Этап операции: запросы по endpoint'ам и можно ли выполнять их одновременно"""
+    name: str
+    calls: Dict[str, int]
+    concurrent: bool = False
+
+    @property
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+
+@dataclass
+class Plan:
+    """План операции - этапы выполняются по очереди"""
+    title: str
+    steps: List[Step] = field(default_factory=list)
+
+    def calls_by_endpoint(self) -> Dict[str, int]:
+        calls: Dict[str, int] = {}
+        for step in self.steps:
+            for endpoint, n in step.calls.items():
+                calls[endpoint] = calls.get(endpoint, 0) + n
+        return calls
+
+    @property
+    def total_calls(self) -> int:
+        return sum(step.total for step in self.steps)
+
+
+@dataclass
+class Estimate:
+    """Ожидаемое время выполнения плана"""
+    seconds: float
+    windows: List[int]
+
+
+def simulate(plan: Plan, rate: int = RATE_LIMIT_REQUESTS, period: float = RATE_LIMIT_PERIOD,
+             burst: Optional[float] = None, concurrency: int = CONCURRENCY,
+             latency: float = EXPECTED_LATENCY) -> Estimate:
+    """
+    Смоделировать выполнение плана с ограничителем частоты клиента (token bucket)
+
+    Args:
+        plan: План операции
+        rate: Запросов за period
+        period: Период лимита в секундах
+        burst: Ёмкость ограничителя (по умолчанию rate, как у TokenBucket)
+        concurrency: Потоков для одновременных этапов (остальные - по одному запросу)
+        latency: Средняя задержка ответа API в секундах
+
+    Returns:
+        Estimate: время и число запросов в каждом окне period (окна отсчитываются от начала)
+    """
+    capacity = float(burst if burst is not None else rate)
+    refill = rate / period
+    tokens = capacity
+    last = 0.0
+    now = 0.0
+    starts: List[float] = []
+
+    for step in plan.steps:
+        workers = [now] * (max(1, concurrency) if step.concurrent else 1)
+        for _ in range(step.total):
+            ready = heapq.heappop(workers)
+            # Запросы проходят ограничитель по очереди: раньше предыдущего не начнётся
+            start = max(ready, last)
+            tokens = min(capacity, tokens + (start - last) * refill)
+            last = start
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                start += (1 - tokens) / refill
+                tokens = 0.0
+                last = start
+            starts.append(start)
+            heapq.heappush(workers, start + latency)
+        now = max(workers)
+
+    windows: List[int] = []
+    for start in starts:
+        index = int(start // period)
+        windows.extend([0] * (index + 1 - len(windows)))
+        windows[index] += 1
+    return Estimate(now, windows)
+
+
+def format_duration(seconds: float) -> str:
+    """12 с / 3 мин 10 с / 2 ч 5 мин"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} с"
+    minutes, seconds = divmod(seconds, 60)
+    if minutes < 60:
+        return f"{minutes} мин {seconds} с" if seconds else f"{minutes} мин"
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours} ч {minutes} мин" if minutes else f"{hours} ч"
+
+
+def format_plan(plan: Plan, rate: int = RATE_LIMIT_REQUESTS, period: float = RATE_LIMIT_PERIOD,
+                burst: Optional[float] = None, concurrency: int = CONCURRENCY,
+                latency: float = EXPECTED_LATENCY, max_windows: int = 10) -> str:
+    """Текст плана для dry-run: запросы, время и окна лимита"""
+    estimate = simulate(plan, rate, period, burst, concurrency, latency)
+    unlimited = simulate(plan, rate, period, float('inf'), concurrency, latency)
+    capacity = burst if burst is not None else rate
+    lines = [f"📊 План: {plan.title}", "   Запросы к API:"]
+    for endpoint, n in sorted(plan.calls_by_endpoint().items(), key=lambda item: -item[1]):
+        lines.append(f"      {endpoint:<24} {n:>7}")
+    lines.append(f"   Всего запросов: {plan.total_calls}")
+    lines.append(f"   Лимит: {rate} req/{period:g}s (всплеск до {capacity:g}), потоков: {concurrency}, "
+                 f"ответ API ~{latency:.2f}с")
+    lines.append(f"   Ожидаемое время: ~{format_duration(estimate.seconds)} "
+                 f"(из них из-за лимита ~{format_duration(estimate.seconds - unlimited.seconds)})")
+
+    if estimate.windows:
+        lines.append(f"   Окна лимита по {period:g}с: {len(estimate.windows)}")
+        for i, n in enumerate(estimate.windows[:max_windows], 1):
+            lines.append(f"      {i:>3}. с {format_duration((i - 1) * period):>10}: {n} запросов")
+        if len(estimate.windows) > max_windows:
+            lines.append(f"      ... ещё {len(estimate.windows) - max_windows} окон")
+
+    sequential = [step.name for step in plan.steps if not step.concurrent and step.total > 1]
+    if sequential and concurrency > 1:
+        parallel = simulate(Plan(plan.title, [Step(s.name, s.calls, True) for s in plan.steps]),
+                            rate, period, burst, concurrency, latency)
+        lines.append(f"   Этапы по одному запросу: {', '.join(sequential)}; "
+                     f"если выполнять их в {concurrency} потоков - ~{format_duration(parallel.seconds)}")
+    return "\n".join(lines)
+
+
+# === Планы скриптов ===
+
+def plan_import(tasks: List[Dict], column_lookup: bool = True, parallel: bool = False) -> Plan:
+    """
+    План import_tasks: задачи создаются по очереди (порядок на доске), их
+    подзадачи - одновременно, затем подзадачи связываются с задачей одним PUT.
+    С parallel (--parallel) всё создаётся одновременно, а по очереди идёт
+    перенос задач в колонку - тем же PUT, что и связывание.
+    Этапы моделируются один за другим, хотя при импорте они перекрываются, -
+    оценка получается сверху
+    """
+    subtasks = sum(len(t.get('subtasks', [])) for t in tasks)
+    linked = sum(1 for t in tasks if t.get('subtasks'))
+    steps = []
+    if column_lookup:
+        steps.append(Step("поиск колонки", {"GET columns": 1}))
+    if parallel:
+        steps.append(Step("создание задач и подзадач", {"POST tasks": len(tasks) + subtasks}, concurrent=True))
+        steps.append(Step("расстановка по порядку", {"PUT tasks/{id}": len(tasks)}))
+    else:
+        steps.append(Step("создание задач", {"POST tasks": len(tasks)}))
+    if subtasks and not parallel:
+        steps.append(Step("подзадачи и связывание", {"POST tasks": subtasks, "PUT tasks/{id}": linked},
+                          concurrent=True))
+    return Plan(f"импорт {len(tasks)} задач ({subtasks} подзадач)", steps)
+
+
+def plan_sync(changes: List) -> Plan:
+    """
+    План import_tasks --sync после сравнения с доской (import_tasks.diff_import):
+    новые задачи создаются как при импорте, изменённые обновляются по одной
+    """
+    creates = [c.task for c in changes if c.action == "create"]
+    updates = [c for c in changes if c.action == "update"]
+    steps = plan_import(creates, column_lookup=False).steps if creates else []
+    calls = {"POST tasks": sum(c.new_subtasks for c in updates),
+             "PUT tasks/{id}": sum(c.description + len(c.changed_subtasks) + bool(c.new_subtasks) for c in updates)}
+    calls = {endpoint: n for endpoint, n in calls.items() if n}
+    if calls:
+        steps.append(Step("обновление задач", calls))
+    unchanged = len(changes) - len(creates) - len(updates)
+    return Plan(f"импорт по разнице: создать {len(creates)}, обновить {len(updates)}, "
+                f"без изменений {unchanged}", steps)
+
+
+def plan_update_descriptions(tasks: List[Dict], board_columns: int = 1, task_pages: int = 1) -> Plan:
+    """
+    План update_descriptions (все задачи файла считаются найденными на доске):
+    задачи обновляются одновременно, подзадачи одной задачи - по очереди внутри неё
+
+    Args:
+        tasks: Задачи из parse_markdown_tasks
+        board_columns: Колонок на доске (задачи доски запрашиваются по колонкам)
+        task_pages: Страниц задач в каждой колонке
+    """
+    with_subtasks = [t for t in tasks if t.get('subtasks')]
+    subtasks = sum(len(t['subtasks']) for t in with_subtasks)
+    updates = sum(1 for t in tasks if t.get('description'))
+    updates += sum(1 for t in with_subtasks for s in t['subtasks'] if s.get('description'))
+    return Plan(f"обновление описаний {len(tasks)} задач", [
+        Step("задачи доски", {"GET columns": 1}),
+        Step("задачи колонок", {"GET task-list": board_columns * task_pages}, concurrent=True),
+        Step("обновление описаний", {"GET tasks/{id}": subtasks, "PUT tasks/{id}": updates}, concurrent=True),
+    ])
+
+
+def plan_clear_board(task_count: int, archive: bool = True) -> Plan:
+    """План clear_board после загрузки задач доски: по одному запросу на задачу, одновременно"""
+    endpoint = "PUT tasks/{id}" if archive else "DELETE tasks/{id}"
+    action = "архивация" if archive else "удаление"
+    return Plan(f"{action} {task_count} задач", [Step(action, {endpoint: task_count}, concurrent=True)])
@@ -0,0 +1,412 @@
+"""
+Ограничитель частоты запросов к Yougile API (token bucket)
+"""
+import atexit
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Mapping, Optional, Tuple
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    """
+    Разобрать заголовок Retry-After
+
+    Args:
+        value: Значение заголовка (секунды или HTTP-дата)
+        now: Текущее время (unix timestamp), по умолчанию time.time()
+
+    Returns:
+        Количество секунд ожидания или None, если заголовок не распознан
+    """
+    if value is None:
+        return None
+    value = str(value).strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date is None:
+        return None
+    now = time.time() if now is None else now
+    return max(0.0, date.timestamp() - now)
+
+
+class TokenBucket:
+    """
+    Потокобезопасный token bucket с ограничением скользящего окна
+
+    Бакет вмещает `burst` токенов и пополняется со скоростью `rate` токенов
+    за `period` секунд, поэтому при свободном бюджете запросы уходят сразу.
+    Дополнительно хранятся отметки последних `rate` запросов: в любом окне
+    длиной `period` уходит не больше `rate` запросов, даже сразу после всплеска.
+    """
+
+    def __init__(self, rate: int = 50, period: float = 60.0, burst: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            rate: Количество запросов за период (50 для Yougile)
+            period: Длина периода в секундах
+            burst: Ёмкость бакета (по умолчанию равна rate)
+            clock: Источник монотонного времени (для тестов)
+            sleep: Функция ожидания (для тестов)
+        """
+        if rate <= 0 or period <= 0:
+            raise ValueError("rate и period должны быть положительными")
+        self.rate = rate
+        self.period = float(period)
+        self.capacity = float(burst if burst is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._history = deque(maxlen=rate)
+        self.total_wait = 0.0
+
+    def _state(self):
+        """Доступ к состоянию бакета (в SharedRateLimiter - транзакция в общей базе)"""
+        return self._lock
+
+    @property
+    def refill_rate(self) -> float:
+        """Скорость пополнения (токенов в секунду)"""
+        return self.rate / self.period
+
+    def _refill(self, now: float):
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(self.capacity, self._tokens + elapsed * self.refill_rate)
+            self._updated = now
+
+    def _wait_time(self, now: float) -> float:
+        """Сколько нужно подождать до следующего токена (под блокировкой)"""
+        wait = max(0.0, self._blocked_until - now)
+        if self._tokens < 1:
+            wait = max(wait, (1 - self._tokens) / self.refill_rate)
+        if len(self._history) >= self.rate:
+            wait = max(wait, self._history[0] + self.period - now)
+        return wait
+
+    def try_acquire(self) -> bool:
+        """Взять токен без ожидания. Возвращает False, если бюджета нет"""
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            if self._wait_time(now) > 0:
+                return False
+            self._tokens -= 1
+            self._history.append(now)
+            return True
+
+    def acquire(self) -> float:
+        """
+        Взять токен, при необходимости дождавшись его
+
+        Returns:
+            Время ожидания в секундах
+        """
+        waited = 0.0
+        while True:
+            with self._state():
+                now = self._clock()
+                self._refill(now)
+                wait = self._wait_time(now)
+                if wait <= 0:
+                    self._tokens -= 1
+                    self._history.append(now)
+                    self.total_wait += waited
+                    return waited
+            self._sleep(wait)
+            waited += wait
+
+    def pause(self, seconds: float):
+        """Запретить запросы на `seconds` секунд (например, после 429)"""
+        with self._state():
+            now = self._clock()
+            self._blocked_until = max(self._blocked_until, now + seconds)
+
+    def drain(self):
+        """Сжечь все токены: следующий запрос дождётся пополнения"""
+        with self._state():
+            now = self._clock()
+            self._refill(now)
+            self._tokens = min(self._tokens, 0.0)
+
+    def update_from_headers(self, headers: Mapping[str, str], status_code: Optional[int] = None):
+        """
+        Подстроиться под заголовки ответа сервера
+
+        Учитываются X-RateLimit-Remaining, X-RateLimit-Reset и Retry-After.
+        Если сервер сообщает, что бюджета осталось меньше, чем думает бакет,
+        лишние токены сгорают; при нулевом остатке запросы ждут до сброса окна.
+        """
+        if not headers:
+            return
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+        remaining = _header_float(headers, 'X-RateLimit-Remaining', 'RateLimit-Remaining')
+        reset = _header_float(headers, 'X-RateLimit-Reset', 'RateLimit-Reset')
+        if reset is not None and reset > 1e9:
+            # Абсолютное время (unix timestamp) вместо количества секунд
+            reset = max(0.0, reset - time.time())
+
+        if retry_after is not None:
+            self.pause(retry_after)
+        elif status_code == 429:
+            if reset is not None:
+                self.pause(reset)
+            else:
+                self.drain()
+
+        if remaining is not None:
+            with self._state():
+                now = self._clock()
+                self._refill(now)
+                self._tokens = min(self._tokens, remaining)
+                if remaining < 1 and reset is not None:
+                    self._blocked_until = max(self._blocked_until, now + reset)
+
+
+_SHARED_SCHEMA = """
+CREATE TABLE IF NOT EXISTS buckets (
+    key TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    updated REAL NOT NULL,
+    blocked_until REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS grants (
+    key TEXT NOT NULL,
+    client TEXT NOT NULL,
+    ts REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS grants_key_ts ON grants (key, ts);
+CREATE TABLE IF NOT EXISTS waiters (
+    id TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    client TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    since REAL NOT NULL,
+    seen REAL NOT NULL
+);
+"""
+
+
+class SharedRateLimiter(TokenBucket):
+    """
+    Token bucket, общий для всех процессов на машине с одним API ключом
+
+    Токены, отметки запросов и пауза после 429 хранятся в SQLite и меняются
+    в транзакциях BEGIN IMMEDIATE, поэтому import_tasks.py и clear_board.py,
+    запущенные одновременно, делят один бюджет 50 req/min, а не превышают
+    его вместе и не ждут потом по минуте каждый.
+
+    Ожидающие токен запросы стоят в общей очереди: сначала больший priority,
+    при равном - процесс, дольше всех не получавший токен (процессы
+    чередуются независимо от числа потоков в каждом), затем по времени прихода.
+    Клиентам одного процесса нужен один общий экземпляр - см. shared_rate_limiter.
+    """
+
+    def __init__(self, path: str, key: str, rate: int = 50, period: float = 60.0,
+                 burst: Optional[int] = None, priority: int = 0,
+                 poll_interval: float = 0.05, stale_after: float = 10.0,
+                 client_id: Optional[str] = None,
+                 clock: Callable[[], float] = time.time,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            path: Файл базы SQLite с состоянием (один на машину)
+            key: API ключ - процессы с одним ключом делят бюджет (в базе хранится хэш)
+            rate: Количество запросов за период
+            period: Длина периода в секундах
+            burst: Ёмкость бакета (по умолчанию равна rate)
+            priority: Приоритет процесса - больший получает токены первым
+            poll_interval: Как часто ожидающий проверяет очередь, секунды
+            stale_after: Через сколько секунд без проверок ожидающий считается
+                         завершившимся (процесс убит) и удаляется из очереди
+            client_id: Участник очереди (по умолчанию - текущий процесс)
+            clock: Источник времени, общий для процессов - поэтому time.time (для тестов)
+            sleep: Функция ожидания (для тестов)
+        """
+        super().__init__(rate, period, burst, clock, sleep)
+        self.path = path
+        self.key = hashlib.sha256(key.encode('utf-8')).hexdigest()[:16]
+        self.priority = priority
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.client_id = client_id or _process_id()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SHARED_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    @contextmanager
+    def _state(self):
+        """Загрузить состояние из базы, дать его изменить и записать обратно одной транзакцией"""
+        with self._lock:
+            db = self._db
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                now = self._clock()
+                row = db.execute("SELECT tokens, updated, blocked_until FROM buckets WHERE key = ?",
+                                 (self.key,)).fetchone()
+                if row is None:
+                    self._tokens, self._updated, self._blocked_until = self.capacity, now, 0.0
+                else:
+                    self._tokens, self._updated, self._blocked_until = row
+                db.execute("DELETE FROM grants WHERE key = ? AND ts <= ?", (self.key, now - self.period))
+                recent = db.execute("SELECT ts FROM grants WHERE key = ? ORDER BY ts DESC LIMIT ?",
+                                    (self.key, self.rate)).fetchall()
+                self._history = deque((ts for (ts,) in reversed(recent)), maxlen=self.rate)
+                yield db
+                db.execute("INSERT OR REPLACE INTO buckets (key, tokens, updated, blocked_until) "
+                           "VALUES (?, ?, ?, ?)", (self.key, self._tokens, self._updated, self._blocked_until))
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def _grant(self, db, now: float):
+        self._tokens -= 1
+        self._history.append(now)
+        db.execute("INSERT INTO grants (key, client, ts) VALUES (?, ?, ?)", (self.key, self.client_id, now))
+
+    def _next_waiter(self, db) -> Optional[str]:
+        """Чья очередь получать токен"""
+        row = db.execute("""
+            SELECT w.id FROM waiters w WHERE w.key = ?
+            ORDER BY w.priority DESC,
+                     (SELECT MAX(g.ts) FROM grants g WHERE g.key = w.key AND g.client = w.client),
+                     w.since
+            LIMIT 1""", (self.key,)).fetchone()
+        return row[0] if row else None
+
+    def try_acquire(self) -> bool:
+        """Взять токен без ожидания. False, если бюджета нет или его уже ждут с тем же или большим приоритетом"""
+        with self._state() as db:
+            now = self._clock()
+            self._refill(now)
+            if self._wait_time(now) > 0:
+                return False
+            ahead = db.execute("SELECT 1 FROM waiters WHERE key = ? AND priority >= ? AND seen >= ? LIMIT 1",
+                               (self.key, self.priority, now - self.stale_after)).fetchone()
+            if ahead:
+                return False
+            self._grant(db, now)
+            return True
+
+    def acquire(self) -> float:
+        """
+        Встать в общую очередь и дождаться токена
+
+        Returns:
+            Время ожидания в секундах
+        """
+        waiter = uuid.uuid4().hex
+        since = self._clock()
+        waited = 0.0
+        try:
+            while True:
+                with self._state() as db:
+                    now = self._clock()
+                    self._refill(now)
+                    db.execute("INSERT OR REPLACE INTO waiters (id, key, client, priority, since, seen) "
+                               "VALUES (?, ?, ?, ?, ?, ?)",
+                               (waiter, self.key, self.client_id, self.priority, since, now))
+                    db.execute("DELETE FROM waiters WHERE key = ? AND seen < ?", (self.key, now - self.stale_after))
+                    wait = self._wait_time(now)
+                    if wait <= 0:
+                        if self._next_waiter(db) == waiter:
+                            self._grant(db, now)
+                            db.execute("DELETE FROM waiters WHERE id = ?", (waiter,))
+                            waiter = None
+                            self.total_wait += waited
+                            return waited
+                        wait = self.poll_interval
+                # Просыпаемся раньше, чем очередь сочтёт нас завершившимися
+                wait = min(wait, self.stale_after / 2)
+                self._sleep(wait)
+                waited += wait
+        finally:
+            if waiter is not None:
+                with self._lock:
+                    self._db.execute("DELETE FROM waiters WHERE id = ?", (waiter,))
+
+
+_process_ids: Dict[int, str] = {}
+_shared: Dict[Tuple[int, str, str], SharedRateLimiter] = {}
+_shared_lock = threading.Lock()
+
+
+def _process_id() -> str:
+    """Участник общей очереди - процесс (после fork у потомка свой)"""
+    pid = os.getpid()
+    return _process_ids.setdefault(pid, f"{pid}-{uuid.uuid4().hex[:8]}")
+
+
+def shared_rate_limiter(path: str, key: str, rate: int = 50, period: float = 60.0,
+                        priority: int = 0) -> SharedRateLimiter:
+    """
+    Общий ограничитель процесса для базы path и API ключа key
+
+    Все клиенты процесса получают один экземпляр: одно соединение с базой
+    и один участник очереди, а не несколько конкурирующих. Соединения
+    закрываются при выходе.
+
+    Raises:
+        ValueError: Ограничитель для этой базы и ключа уже создан с другими
+                    rate, period или priority - у одного участника очереди
+                    настройки одни
+    """
+    cache_key = (os.getpid(), os.path.abspath(path), key)
+    with _shared_lock:
+        limiter = _shared.get(cache_key)
+        if limiter is None:
+            if not _shared:
+                atexit.register(_close_shared)
+            limiter = _shared[cache_key] = SharedRateLimiter(path, key, rate, period, priority=priority)
+        elif (limiter.rate, limiter.period, limiter.priority) != (rate, float(period), priority):
+            raise ValueError(f"Общий ограничитель {path} уже создан с rate={limiter.rate}, "
+                             f"period={limiter.period}, priority={limiter.priority}; "
+                             f"запрошено rate={rate}, period={period}, priority={priority}")
+        return limiter
+
+
+def _close_shared():
+    with _shared_lock:
+        for (pid, _, _), limiter in list(_shared.items()):
+            if pid == os.getpid():
+                limiter.close()
+        _shared.clear()
+
+
+def _header_float(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            return None
+    return None
@@ -0,0 +1,114 @@
+"""
+Политика повторных запросов к Yougile API
+"""
+import random
+import time
+from typing import Callable
+
+import requests
+
+from exceptions import RateLimited, ServerError, TransportError
+from hooks import RequestContext, RequestHook
+
+# Методы, повтор которых не меняет результат
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+class RetryPolicy:
+    """
+    Повторы с экспоненциальной задержкой и jitter
+
+    Повторяются только временные ошибки: 429, 5xx и сетевые сбои.
+    Идемпотентные методы повторяются всегда. POST повторяется, только если
+    запрос заведомо не был выполнен (429 или таймаут соединения), либо если
+    вызывающий код передал retry_guard - функцию, которая проверяет, не был
+    ли объект всё-таки создан предыдущей попыткой.
+    """
+
+    def __init__(self, max_attempts: int = 4, backoff_base: float = 1.0,
+                 backoff_max: float = 30.0, jitter: bool = True,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            max_attempts: Максимальное число попыток (1 - без повторов)
+            backoff_base: Базовая задержка в секундах
+            backoff_max: Максимальная задержка в секундах
+            jitter: Случайная задержка в диапазоне [0, backoff] ("full jitter")
+            sleep: Функция ожидания (для тестов)
+        """
+        if max_attempts < 1:
+            raise ValueError("max_attempts должен быть >= 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jitter = jitter
+        self.sleep = sleep
+
+    def backoff(self, attempt: int) -> float:
+        """Задержка перед повтором после неудачной попытки номер `attempt` (с 1)"""
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        if self.jitter:
+            delay = random.uniform(0, delay)
+        return delay
+
+    def delay_for(self, attempt: int, error: Exception) -> float:
+        """
+        Задержка перед следующей попыткой
+
+        Для 429 с Retry-After ожидание обеспечивает ограничитель частоты
+        клиента, поэтому здесь оно не добавляется повторно.
+        """
+        if isinstance(error, RateLimited) and error.retry_after is not None:
+            return 0.0
+        return self.backoff(attempt)
+
+    def is_retryable(self, method: str, error: Exception, guarded: bool = False) -> bool:
+        """
+        Можно ли повторить запрос после ошибки
+
+        Args:
+            method: HTTP метод
+            error: Исключение, полученное при попытке
+            guarded: Передан ли retry_guard для неидемпотентного запроса
+        """
+        if not isinstance(error, (RateLimited, ServerError, TransportError)):
+            return False
+        if method.upper() in IDEMPOTENT_METHODS or guarded:
+            return True
+        # Запрос до сервера не дошёл или был отклонён без выполнения
+        if isinstance(error, RateLimited):
+            return True
+        return isinstance(error, TransportError) and isinstance(
+            error.original, requests.exceptions.ConnectTimeout)
+
+
+class RetryHook(RequestHook):
+    """
+    Хук клиента, повторяющий временные ошибки по RetryPolicy
+
+    Перед повтором POST с retry_guard проверяет, не создан ли объект
+    предыдущей попыткой; найденный объект становится ответом (ctx.result).
+    """
+
+    def __init__(self, policy: RetryPolicy):
+        self.policy = policy
+
+    def on_error(self, ctx: RequestContext, error: Exception) -> bool:
+        policy = self.policy
+        if ctx.attempt >= policy.max_attempts or not policy.is_retryable(
+                ctx.method, error, guarded=ctx.retry_guard is not None):
+            return False
+        if ctx.no_retry is not None and ctx.no_retry(error):
+            return False
+        policy.sleep(policy.delay_for(ctx.attempt, error))
+
+        # Неидемпотентный запрос мог быть выполнен - проверяем перед повтором
+        if ctx.retry_guard is not None and not isinstance(error, RateLimited):
+            existing = ctx.retry_guard()
+            if existing is not None:
+                ctx.result = existing
+                return False
+        return True
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
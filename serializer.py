@@ -0,0 +1,41 @@
+"""
+Сериализация JSON для клиента: orjson, если установлен, иначе стандартный json
+"""
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson - необязательная зависимость
+    orjson = None
+
+
+class JsonSerializer:
+    """Стандартный модуль json"""
+
+    name = "json"
+
+    def loads(self, data: bytes) -> Any:
+        """Разобрать тело ответа (байты в UTF-8)"""
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Тело запроса в UTF-8"""
+        return json.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonSerializer:
+    """orjson: разбор и кодирование в несколько раз быстрее стандартного json"""
+
+    name = "orjson"
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+def default_serializer():
+    """orjson, если установлен, иначе стандартный json"""
+    return OrjsonSerializer() if orjson is not None else JsonSerializer()
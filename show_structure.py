@@ -2,14 +2,24 @@
 """
 Скрипт для вывода детальной структуры проекта
 """
+import math
 import sys
 from datetime import datetime
+from pagination import MAX_PAGE_SIZE
 from yougile_client import YougileClient
+from async_client import run_concurrently
+from sync import LocalMirror
 
 
-def show_project_structure(project_id: str):
-    """Показать полную структуру проекта"""
-    client = YougileClient()
+def show_project_structure(project_id: str, client=None):
+    """
+    Показать полную структуру проекта
+
+    Args:
+        project_id: ID проекта
+        client: YougileClient или LocalMirror (по умолчанию новый YougileClient)
+    """
+    client = client or YougileClient()
     
     # Получаем проект
     print("=" * 80)
@@ -25,9 +35,8 @@ def show_project_structure(project_id: str):
     print("=" * 80)
     print()
     
-    # Получаем все доски
-    all_boards = client.get_boards()
-    project_boards = [b for b in all_boards if b.get('projectId') == project_id]
+    # Получаем доски проекта
+    project_boards = client.index.boards_of(project_id)
     
     if not project_boards:
         print("Досок не найдено в этом проекте")
@@ -35,38 +44,61 @@ def show_project_structure(project_id: str):
     
     print(f"📊 Найдено досок: {len(project_boards)}\n")
     
+    # Колонки всех досок запрашиваем одновременно
+    all_columns = run_concurrently(
+        client,
+        [lambda board_id=b['id']: client.index.columns_of(board_id) for b in project_boards],
+        return_exceptions=True
+    )
+    
+    # Задачи колонок проекта: по колонке на запрос, одновременно. Если колонок
+    # больше, чем страниц во всём списке задач компании, дешевле один обход
+    # этого списка. В памяти остаются только число задач и первые 3 названия
+    column_ids = {col.get('id') for columns in all_columns if not isinstance(columns, Exception)
+                  for col in columns}
+    company_pages = math.ceil(client.count_tasks() / MAX_PAGE_SIZE)
+    if len(column_ids) > company_pages:
+        tasks = client.iter_tasks(fields=("title", "columnId"))
+    else:
+        tasks = client.get_tasks(column_id=sorted(column_ids), fields=("title", "columnId"))
+    task_counts = {}
+    first_titles = {}
+    for task in tasks:
+        if task.column_id in column_ids:
+            count = task_counts.get(task.column_id, 0)
+            task_counts[task.column_id] = count + 1
+            if count < 3:
+                first_titles.setdefault(task.column_id, []).append(task.title or 'Без названия')
+    
     # Для каждой доски
-    for board_idx, board in enumerate(project_boards, 1):
+    for board_idx, (board, columns) in enumerate(zip(project_boards, all_columns), 1):
         board_id = board['id']
         board_title = board.get('title', 'Без названия')
         
         print(f"{board_idx}. 📋 ДОСКА: {board_title}")
         print(f"   ID: {board_id}")
         
-        # Получаем детали доски с колонками
+        # Колонки доски
         try:
-            board_details = client.get_board(board_id)
+            if isinstance(columns, Exception):
+                raise columns
             
-            # Колонки
-            columns = board_details.get('columns', [])
             if columns:
                 print(f"   📌 Колонок: {len(columns)}")
+                
                 for col_idx, col in enumerate(columns, 1):
                     col_title = col.get('title', 'Без названия')
                     col_id = col.get('id', '')
                     print(f"      {col_idx}. {col_title} (ID: {col_id})")
                     
-                    # Получаем задачи в колонке
-                    all_tasks = client.get_tasks()
-                    col_tasks = [t for t in all_tasks if t.get('columnId') == col_id]
+                    col_count = task_counts.get(col_id, 0)
                     
-                    if col_tasks:
-                        print(f"         📝 Задач: {len(col_tasks)}")
-                        for task_idx, task in enumerate(col_tasks[:3], 1):  # Показываем первые 3
-                            task_title = task.get('title', 'Без названия')
+                    if col_count:
+                        print(f"         📝 Задач: {col_count}")
+                        for task_title in first_titles[col_id]:  # Показываем первые 3
                             print(f"            • {task_title}")
-                        if len(col_tasks) > 3:
-                            print(f"            ... и ещё {len(col_tasks) - 3} задач(и)")
+                        if col_count > 3:
+                            print(f"            ... и ещё {col_count - 3} задач(и)")
             else:
                 print(f"   📌 Колонок: 0")
                 
@@ -77,16 +109,19 @@ def show_project_structure(project_id: str):
 
 
 def main():
-    if len(sys.argv) < 2:
-        print("Использование: python show_structure.py <project_id>")
+    args = [arg for arg in sys.argv[1:] if arg != '--offline']
+    offline = len(args) < len(sys.argv) - 1
+    
+    if not args:
+        print("Использование: python show_structure.py <project_id> [--offline]")
         print("\nПолучите ID проекта командой:")
         print("  python projects.py list")
         sys.exit(1)
     
-    project_id = sys.argv[1]
+    project_id = args[0]
     
     try:
-        show_project_structure(project_id)
+        show_project_structure(project_id, LocalMirror() if offline else None)
     except Exception as e:
         print(f"✗ Ошибка: {e}")
         sys.exit(1)
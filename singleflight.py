@@ -0,0 +1,71 @@
+"""
+Объединение одинаковых одновременных запросов (single-flight)
+"""
+import threading
+from typing import Any, Callable, Dict, Hashable
+
+
+class _Call:
+    """Выполняющийся вызов, результата которого ждут остальные"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    Один вызов на ключ в каждый момент времени
+
+    Если вызов с таким ключом уже выполняется в другом потоке, новый вызов
+    не запускается, а дожидается результата первого (или его исключения).
+    Все ожидающие получают один и тот же объект результата - его нельзя
+    изменять на месте.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.coalesced = 0
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Выполнить func или присоединиться к уже выполняющемуся вызову с тем же ключом
+
+        Args:
+            key: Ключ вызова (например, метод + endpoint + параметры)
+            func: Функция без аргументов
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = func()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Количество выполняющихся вызовов"""
+        with self._lock:
+            return len(self._calls)
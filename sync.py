@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Локальное зеркало компании в SQLite: проекты, доски, колонки, задачи, пользователи
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Union
+
+from config import MIRROR_MAX_AGE, MIRROR_PATH
+from entity_index import EntityIndex
+from exceptions import NotFound
+from models import Task
+
+RESOURCES = ("projects", "boards", "columns", "users", "tasks")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS projects (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    projectId TEXT,
+    title TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS columns (
+    id TEXT PRIMARY KEY,
+    boardId TEXT,
+    title TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS users (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    columnId TEXT,
+    boardId TEXT,
+    title TEXT,
+    archived INTEGER NOT NULL DEFAULT 0,
+    hash TEXT NOT NULL,
+    data TEXT NOT NULL,
+    position INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS sync_state (
+    resource TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    synced_at REAL NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (resource, scope)
+);
+CREATE INDEX IF NOT EXISTS idx_boards_project ON boards(projectId);
+CREATE INDEX IF NOT EXISTS idx_columns_board ON columns(boardId);
+CREATE INDEX IF NOT EXISTS idx_tasks_column ON tasks(columnId);
+CREATE INDEX IF NOT EXISTS idx_tasks_board ON tasks(boardId);
+CREATE INDEX IF NOT EXISTS idx_tasks_title ON tasks(title);
+"""
+
+# Дополнительные индексируемые поля по таблицам
+_EXTRA_FIELDS = {
+    "projects": (),
+    "boards": ("projectId",),
+    "columns": ("boardId",),
+    "users": (),
+    "tasks": ("columnId", "boardId", "archived", "position"),
+}
+
+
+def _hash(item: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(item, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _title(resource: str, item: Dict[str, Any]) -> Optional[str]:
+    if resource == "users":
+        return item.get('realName') or item.get('email')
+    return item.get('title')
+
+
+class LocalMirror:
+    """
+    Зеркало данных компании в SQLite
+
+    refresh() перечитывает списки из API (большими страницами, через кэш
+    и фильтры клиента) и записывает в базу только изменившиеся сущности:
+    для каждой строки хранится хеш содержимого. Сущности, которых больше нет
+    в API, удаляются. Задачи - самый большой список - перечитываются
+    только для устаревших колонок (фильтр columnId): новых, изменившихся
+    с прошлого обновления или обновлённых раньше, чем max_age секунд назад.
+    Методы чтения повторяют интерфейс YougileClient
+    (get_projects, get_boards, get_columns, get_tasks, iter_tasks, ...),
+    поэтому скрипты только для чтения могут работать с зеркалом вместо
+    клиента - без запросов к API.
+    """
+
+    # Чтение локальное: параллельные запросы не нужны (см. async_client.run_concurrently)
+    concurrency = 1
+
+    def __init__(self, path: str = MIRROR_PATH):
+        """
+        Args:
+            path: Файл базы SQLite
+        """
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+        self._index = None
+
+    @property
+    def index(self):
+        """Индекс связей сущностей поверх зеркала (как YougileClient.index)"""
+        if self._index is None:
+            self._index = EntityIndex(self)
+        return self._index
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # === Синхронизация ===
+
+    def refresh(self, client, resources: Iterable[str] = RESOURCES,
+                board_id: Optional[str] = None, max_age: float = 0) -> Dict[str, Dict[str, int]]:
+        """
+        Обновить зеркало из API
+
+        Args:
+            client: YougileClient
+            resources: Какие ресурсы обновлять
+            board_id: Обновить задачи только этой доски
+            max_age: Задачи колонок, обновлённых не раньше стольких секунд назад и
+                     не изменившихся, не перечитываются (0 - перечитать все)
+
+        Returns:
+            {ресурс: {"added": N, "updated": N, "removed": N, "unchanged": N}};
+            у задач ещё "skipped" - колонки, задачи которых не перечитывались
+        """
+        resources = [r for r in RESOURCES if r in set(resources)]
+        self._check_account(client)
+        summary = {}
+        changed_columns: Set[str] = set()
+
+        if "projects" in resources:
+            summary["projects"] = self._apply("projects", client.get_projects())
+        if "boards" in resources:
+            summary["boards"] = self._apply("boards", client.get_boards())
+        if "columns" in resources or ("tasks" in resources and not self._has_columns(board_id)):
+            # Без колонок в зеркале у задач не будет boardId - колонки нужны и при --only tasks
+            summary["columns"] = self._apply("columns", client.get_columns(), changed=changed_columns)
+        if "users" in resources:
+            summary["users"] = self._apply("users", client.get_users())
+        if "tasks" in resources:
+            summary["tasks"] = self._refresh_tasks(client, board_id, max_age, changed_columns)
+        return summary
+
+    def _has_columns(self, board_id: Optional[str]) -> bool:
+        with self._lock:
+            if board_id:
+                row = self._conn.execute("SELECT 1 FROM columns WHERE boardId = ? LIMIT 1", (board_id,)).fetchone()
+            else:
+                row = self._conn.execute("SELECT 1 FROM columns LIMIT 1").fetchone()
+        return row is not None
+
+    def _refresh_tasks(self, client, board_id: Optional[str], max_age: float,
+                       changed_columns: Set[str]) -> Dict[str, int]:
+        """Перечитать задачи устаревших колонок (все колонки - одним обходом списка задач)"""
+        now = time.time()
+        with self._lock:
+            if board_id:
+                column_ids = [row['id'] for row in
+                              self._conn.execute("SELECT id FROM columns WHERE boardId = ?", (board_id,))]
+            else:
+                column_ids = [row['id'] for row in self._conn.execute("SELECT id FROM columns")]
+            synced = {row['scope'][len("column:"):]: row['synced_at'] for row in self._conn.execute(
+                "SELECT scope, synced_at FROM sync_state WHERE resource = 'tasks' AND scope LIKE 'column:%'")}
+        stale = [column_id for column_id in column_ids
+                 if column_id in changed_columns or now - synced.get(column_id, 0) >= max_age]
+
+        if not board_id and len(stale) == len(column_ids):
+            # Всё устарело - один обход всех задач дешевле запросов по колонкам
+            stats = self._apply("tasks", client.get_tasks())
+        elif stale:
+            stats = self._apply("tasks", client.get_tasks(column_id=stale), scope_columns=stale,
+                                scope=f"board:{board_id}" if board_id else "columns")
+        else:
+            stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        stats["skipped"] = len(column_ids) - len(stale)
+
+        with self._lock, self._conn:
+            for column_id in stale:
+                count = self._conn.execute("SELECT COUNT(*) FROM tasks WHERE columnId = ?",
+                                           (column_id,)).fetchone()[0]
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sync_state (resource, scope, synced_at, count) VALUES (?, ?, ?, ?)",
+                    ("tasks", f"column:{column_id}", now, count))
+        return stats
+
+    def _check_account(self, client):
+        """Зеркало другой компании (другого API ключа) очищается"""
+        api_key = getattr(client, 'api_key', None)
+        if not isinstance(api_key, str):
+            return
+        fingerprint = hashlib.sha256(api_key.encode('utf-8')).hexdigest()[:16]
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'account'").fetchone()
+            if row is not None and row['value'] != fingerprint:
+                for resource in RESOURCES:
+                    self._conn.execute(f"DELETE FROM {resource}")
+                self._conn.execute("DELETE FROM sync_state")
+            self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('account', ?)",
+                               (fingerprint,))
+
+    def _apply(self, resource: str, items: List[Dict[str, Any]],
+               scope_columns: Optional[List[str]] = None, scope: str = "all",
+               changed: Optional[Set[str]] = None) -> Dict[str, int]:
+        """
+        Записать в таблицу только изменившиеся строки и удалить исчезнувшие
+
+        Args:
+            changed: Сюда добавляются ID новых, изменённых и удалённых строк
+        """
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+        board_of_column = {}
+        if resource == "tasks":
+            with self._lock:
+                board_of_column = {row['id']: row['boardId'] for row in
+                                   self._conn.execute("SELECT id, boardId FROM columns")}
+
+        with self._lock, self._conn:
+            if scope_columns is None:
+                existing_rows = self._conn.execute(f"SELECT id, hash FROM {resource}").fetchall()
+            else:
+                placeholders = ",".join("?" * len(scope_columns))
+                existing_rows = self._conn.execute(
+                    f"SELECT id, hash FROM {resource} WHERE columnId IN ({placeholders})",
+                    scope_columns).fetchall() if scope_columns else []
+            existing = {row['id']: row['hash'] for row in existing_rows}
+
+            seen = set()
+            extra = _EXTRA_FIELDS[resource]
+            columns_sql = ", ".join(("id", "title", "hash", "data") + extra)
+            placeholders_sql = ", ".join("?" * (4 + len(extra)))
+            for position, item in enumerate(items):
+                item_id = item.get('id')
+                if not item_id or item_id in seen:
+                    continue
+                seen.add(item_id)
+                digest = _hash(item)
+                old_hash = existing.get(item_id)
+                if old_hash == digest:
+                    stats["unchanged"] += 1
+                    if resource == "tasks":
+                        self._conn.execute("UPDATE tasks SET position = ? WHERE id = ?",
+                                           (position, item_id))
+                    continue
+                stats["updated" if old_hash else "added"] += 1
+                if changed is not None:
+                    changed.add(item_id)
+                values = {
+                    "projectId": item.get('projectId'),
+                    "boardId": item.get('boardId') or board_of_column.get(item.get('columnId')),
+                    "columnId": item.get('columnId'),
+                    "archived": 1 if item.get('archived') else 0,
+                    "position": position,
+                }
+                self._conn.execute(
+                    f"INSERT OR REPLACE INTO {resource} ({columns_sql}) VALUES ({placeholders_sql})",
+                    (item_id, _title(resource, item), digest,
+                     json.dumps(item, ensure_ascii=False)) + tuple(values[f] for f in extra))
+
+            removed = [item_id for item_id in existing if item_id not in seen]
+            for item_id in removed:
+                self._conn.execute(f"DELETE FROM {resource} WHERE id = ?", (item_id,))
+            stats["removed"] = len(removed)
+            if changed is not None:
+                changed.update(removed)
+
+            if resource == "columns":
+                # Доска задачи - по её колонке: колонки могли появиться позже задач
+                # или перейти на другую доску, а задач удалённых колонок больше нет
+                self._conn.execute("UPDATE tasks SET boardId = (SELECT boardId FROM columns "
+                                   "WHERE columns.id = tasks.columnId) "
+                                   "WHERE columnId IN (SELECT id FROM columns)")
+                if scope_columns is None:
+                    self._conn.execute("DELETE FROM tasks WHERE columnId IS NOT NULL "
+                                       "AND columnId NOT IN (SELECT id FROM columns)")
+                    self._conn.execute("DELETE FROM sync_state WHERE resource = 'tasks' AND scope LIKE 'column:%' "
+                                       "AND substr(scope, 8) NOT IN (SELECT id FROM columns)")
+
+            self._conn.execute(
+                "INSERT OR REPLACE INTO sync_state (resource, scope, synced_at, count) VALUES (?, ?, ?, ?)",
+                (resource, scope, time.time(), len(seen)))
+        return stats
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Состояние синхронизации: ресурс, область, время, количество"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT resource, scope, synced_at, count FROM sync_state ORDER BY resource, scope"
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    # === Чтение (интерфейс как у YougileClient) ===
+
+    def _select(self, resource: str, where: str = "", params: Iterable[Any] = (),
+                order: str = "rowid") -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM {resource} {where} ORDER BY {order}", tuple(params)).fetchall()
+        return [json.loads(row['data']) for row in rows]
+
+    def _one(self, resource: str, item_id: str) -> Dict[str, Any]:
+        items = self._select(resource, "WHERE id = ?", (item_id,))
+        if not items:
+            raise NotFound(f"Не найдено в локальном зеркале: {resource}/{item_id}", 404)
+        return items[0]
+
+    def get_projects(self) -> List[Dict[str, Any]]:
+        return self._select("projects")
+
+    def get_project(self, project_id: str) -> Dict[str, Any]:
+        return self._one("projects", project_id)
+
+    def get_boards(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if project_id:
+            return self._select("boards", "WHERE projectId = ?", (project_id,))
+        return self._select("boards")
+
+    def get_board(self, board_id: str) -> Dict[str, Any]:
+        """Доска; если в данных API нет колонок, они добавляются из зеркала"""
+        board = self._one("boards", board_id)
+        if 'columns' not in board:
+            board['columns'] = self.get_columns(board_id=board_id)
+        return board
+
+    def get_columns(self, board_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        if board_id:
+            return self._select("columns", "WHERE boardId = ?", (board_id,))
+        return self._select("columns")
+
+    def get_column(self, column_id: str) -> Dict[str, Any]:
+        return self._one("columns", column_id)
+
+    def get_users(self) -> List[Dict[str, Any]]:
+        return self._select("users")
+
+    def get_user(self, user_id: str) -> Dict[str, Any]:
+        return self._one("users", user_id)
+
+    def get_tasks(self, reverse: bool = False, all_pages: bool = True,
+                  column_id: Optional[Union[str, List[str]]] = None,
+                  board_id: Optional[str] = None, title: Optional[str] = None,
+                  fields: Optional[Iterable[str]] = None) -> List[Any]:
+        """
+        Задачи из зеркала (по индексам columnId / boardId / title)
+
+        Args:
+            reverse: Обратный порядок
+            all_pages: Не используется (для совместимости с YougileClient)
+            column_id: ID колонки или список ID
+            board_id: ID доски
+            title: Точное название задачи
+            fields: Поля API для компактных моделей models.Task (см. YougileClient.get_tasks)
+        """
+        conditions, params = [], []
+        if isinstance(column_id, (list, tuple, set)):
+            column_id = list(column_id)
+            if not column_id:
+                return []
+            conditions.append(f"columnId IN ({','.join('?' * len(column_id))})")
+            params.extend(column_id)
+        elif column_id:
+            conditions.append("columnId = ?")
+            params.append(column_id)
+        if board_id:
+            conditions.append("boardId = ?")
+            params.append(board_id)
+        if title is not None:
+            conditions.append("title = ?")
+            params.append(title)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        order = "position DESC" if reverse else "position"
+        tasks = self._select("tasks", where, params, order=order)
+        if fields is not None:
+            fields = Task.check_fields(fields)
+            return [Task.from_api(task, fields, loader=self.get_task) for task in tasks]
+        return tasks
+
+    def count_tasks(self, column_id: Optional[str] = None) -> int:
+        """Число задач в зеркале (интерфейс как у YougileClient.count_tasks)"""
+        where, params = ("WHERE columnId = ?", (column_id,)) if column_id else ("", ())
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+    def iter_tasks(self, reverse: bool = False, page_size: Optional[int] = None,
+                   column_id: Optional[str] = None,
+                   fields: Optional[Iterable[str]] = None) -> Iterator[Any]:
+        """Задачи из зеркала по одной (интерфейс как у YougileClient.iter_tasks)"""
+        return iter(self.get_tasks(reverse=reverse, column_id=column_id, fields=fields))
+
+    def get_task(self, task_id: str) -> Dict[str, Any]:
+        return self._one("tasks", task_id)
+
+
+def _print_summary(summary: Dict[str, Dict[str, int]]):
+    print(f"{'Ресурс':<10} {'Новые':>7} {'Изменены':>9} {'Удалены':>8} {'Без изменений':>14}")
+    print("-" * 52)
+    for resource, stats in summary.items():
+        print(f"{resource:<10} {stats['added']:>7} {stats['updated']:>9} "
+              f"{stats['removed']:>8} {stats['unchanged']:>14}")
+    skipped = summary.get("tasks", {}).get("skipped")
+    if skipped:
+        print(f"\nℹ️  Колонок без перечитывания задач (обновлены недавно): {skipped}")
+
+
+def main():
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Локальное зеркало данных Yougile (SQLite)")
+    parser.add_argument('--db', default=MIRROR_PATH, help=f'Файл базы (по умолчанию {MIRROR_PATH})')
+    subparsers = parser.add_subparsers(dest='command', help='Команды')
+
+    refresh_parser = subparsers.add_parser('refresh', help='Обновить зеркало из API')
+    refresh_parser.add_argument('--only', nargs='+', choices=RESOURCES, help='Обновить только эти ресурсы')
+    refresh_parser.add_argument('--board-id', help='Обновить задачи только этой доски')
+    refresh_parser.add_argument('--max-age', type=float, default=MIRROR_MAX_AGE,
+                                help=f'Не перечитывать задачи колонок, обновлённых не раньше N секунд назад '
+                                     f'(по умолчанию {MIRROR_MAX_AGE:g}, YOUGILE_MIRROR_MAX_AGE)')
+    refresh_parser.add_argument('--full', action='store_true', help='Перечитать задачи всех колонок')
+
+    subparsers.add_parser('status', help='Показать состояние зеркала')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        sys.exit(1)
+
+    mirror = LocalMirror(args.db)
+
+    try:
+        if args.command == 'refresh':
+            from yougile_client import YougileClient
+            client = YougileClient()
+            started = time.perf_counter()
+            summary = mirror.refresh(client, resources=args.only or RESOURCES, board_id=args.board_id,
+                                     max_age=0 if args.full else args.max_age)
+            print()
+            _print_summary(summary)
+            print(f"\n✓ Зеркало обновлено за {time.perf_counter() - started:.1f}с: {args.db}")
+
+        elif args.command == 'status':
+            rows = mirror.status()
+            if not rows:
+                print("Зеркало пустое. Запустите: python sync.py refresh")
+                return
+            print(f"{'Ресурс':<10} {'Область':<45} {'Записей':>8}  Обновлено")
+            print("-" * 90)
+            for row in rows:
+                synced = datetime.fromtimestamp(row['synced_at']).strftime('%d.%m.%Y %H:%M:%S')
+                print(f"{row['resource']:<10} {row['scope']:<45} {row['count']:>8}  {synced}")
+
+    except Exception as e:
+        print(f"\n✗ Ошибка: {e}")
+        sys.exit(1)
+    finally:
+        mirror.close()
+
+
+if __name__ == "__main__":
+    main()
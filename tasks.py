@@ -5,35 +5,44 @@
 import sys
 import argparse
 from datetime import datetime
+from itertools import islice
 from yougile_client import YougileClient
+from sync import LocalMirror
 
 
 def list_tasks(client: YougileClient, limit: int = None):
     """Получить и вывести список задач"""
     print("Получение списка задач...")
-    tasks = client.get_tasks()
-    
-    if not tasks:
-        print("Задач не найдено")
-        return
     
+    # Задачи читаются постранично: при --limit лишние страницы не запрашиваются.
+    # Хранятся только выводимые поля, без описаний
+    tasks = client.iter_tasks(fields=("title", "columnId"))
     if limit:
-        tasks = tasks[:limit]
-    
-    print(f"\nНайдено задач: {len(tasks)}\n")
-    print(f"{'ID':<40} {'Название':<35} {'Колонка ID':<40}")
-    print("-" * 120)
+        tasks = islice(tasks, limit)
     
+    count = 0
     for task in tasks:
-        task_id = task.get('id', '')
-        title = task.get('title', 'Без названия')
-        column_id = task.get('columnId', 'N/A')
+        if count == 0:
+            print()
+            print(f"{'ID':<40} {'Название':<35} {'Колонка ID':<40}")
+            print("-" * 120)
+        count += 1
+        
+        task_id = task.id or ''
+        title = task.title or 'Без названия'
+        column_id = task.column_id or 'N/A'
         
         # Обрезаем длинные названия
         if len(title) > 34:
             title = title[:31] + "..."
         
         print(f"{task_id:<40} {title:<35} {column_id:<40}")
+    
+    if not count:
+        print("Задач не найдено")
+        return
+    
+    print(f"\nНайдено задач: {count}")
 
 
 def get_task(client: YougileClient, task_id: str):
@@ -133,10 +142,12 @@ def main():
     # Команда: list
     list_parser = subparsers.add_parser('list', help='Получить список задач')
     list_parser.add_argument('--limit', type=int, help='Ограничить количество задач')
+    list_parser.add_argument('--offline', action='store_true', help='Читать из локального зеркала (sync.py)')
     
     # Команда: get
     get_parser = subparsers.add_parser('get', help='Получить информацию о задаче')
     get_parser.add_argument('task_id', help='ID задачи')
+    get_parser.add_argument('--offline', action='store_true', help='Читать из локального зеркала (sync.py)')
     
     # Команда: create
     create_parser = subparsers.add_parser('create', help='Создать новую задачу')
@@ -172,9 +183,12 @@ def main():
         parser.print_help()
         sys.exit(1)
     
-    # Инициализация клиента
+    # Инициализация клиента (команды чтения могут работать с локальным зеркалом)
     try:
-        client = YougileClient()
+        if getattr(args, 'offline', False):
+            client = LocalMirror()
+        else:
+            client = YougileClient()
     except Exception as e:
         print(f"✗ Ошибка инициализации клиента: {e}")
         print("\nЗапустите auth.py для получения API ключа:")
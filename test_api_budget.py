@@ -0,0 +1,178 @@
+"""
+Тесты бюджетов запросов к API для команд CLI
+"""
+import pytest
+from unittest.mock import patch
+from api_budget import BUDGETS, MockedApi, Shape, assert_within_budget, over_budget
+from boards import list_boards
+from clear_board import clear_board
+from import_tasks import create_tasks_in_yougile, diff_import, get_column_by_name
+from journal import ImportJournal
+from projects import list_projects
+from rate_limiter import TokenBucket
+from retry import RetryPolicy
+from show_structure import show_project_structure
+from sync import LocalMirror
+from tasks import list_tasks
+from update_descriptions import update_task_descriptions
+from yougile_client import YougileClient
+
+SHAPES = [Shape(), Shape().scaled(3)]
+
+
+def make_client():
+    return YougileClient(api_key="test-key", rate_limiter=TokenBucket(rate=10 ** 6, period=1),
+                         retry_policy=RetryPolicy(max_attempts=1))
+
+
+def file_tasks(shape):
+    return [{"title": f"Задача файла {i}", "description": "**Описание** задачи",
+             "subtasks": [{"title": f"Подзадача {i}.{j}", "description": "- шаг"}
+                          for j in range(shape.subtasks)]}
+            for i in range(shape.file_tasks)]
+
+
+def import_board(api, project_id, shape):
+    """Пустая доска для импорта с колонкой Backlog первой"""
+    board = api.state.create("boards", {"title": "Импорт", "projectId": project_id})
+    columns = [api.state.create("columns", {"title": "Backlog" if c == 0 else f"Колонка {c}",
+                                            "boardId": board["id"]})
+               for c in range(shape.columns)]
+    return board["id"], columns[0]["id"]
+
+
+def run_import(api, shape, board_id, column_id):
+    with patch("import_tasks.YougileClient", make_client):
+        assert get_column_by_name(board_id, "Backlog", client=make_client()) == column_id
+        create_tasks_in_yougile(file_tasks(shape), board_id, column_id)
+
+
+@pytest.fixture
+def api():
+    with MockedApi() as api:
+        yield api
+
+
+def seed(api, shape):
+    return api.state.seed(shape.projects, shape.boards, shape.columns, shape.tasks,
+                          users=3, description_size=100)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_show_structure_budget(api, shape):
+    """Тест: show_structure - O(досок) запросов и один обход задач"""
+    created = seed(api, shape)
+
+    show_project_structure(created["projects"][0], make_client())
+
+    assert_within_budget("show_structure", api.counts, shape)
+
+
+def test_show_structure_reads_only_project_columns(api):
+    """Тест: у проекта мало колонок, а у компании много страниц задач - задачи читаются по колонкам"""
+    shape = Shape(projects=4, boards=1, columns=2, tasks=3000)
+    created = seed(api, shape)
+
+    show_project_structure(created["projects"][0], make_client())
+
+    assert_within_budget("show_structure", api.counts, shape)
+    # Число задач компании + по запросу на каждую из 2 колонок вместо 3 страниц всей компании
+    assert api.counts["GET task-list"] == 3
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_clear_board_budget(api, shape):
+    """Тест: clear_board - запросы задач по колонкам доски и по одному PUT на задачу"""
+    created = seed(api, shape)
+
+    with patch("clear_board.YougileClient", make_client):
+        clear_board(created["boards"][0], confirm=False)
+
+    assert_within_budget("clear_board", api.counts, shape)
+    assert api.counts["PUT tasks/{id}"] == shape.board_tasks
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_import_budget(api, shape):
+    """Тест: импорт - поиск колонки, POST на задачу/подзадачу и одна связка подзадач"""
+    created = seed(api, shape)
+    board_id, column_id = import_board(api, created["projects"][0], shape)
+    api.reset()
+
+    run_import(api, shape, board_id, column_id)
+
+    assert_within_budget("import", api.counts, shape)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_import_sync_unchanged_budget(api, shape, tmp_path):
+    """Тест: повторный импорт по разнице того же файла - только список задач колонки"""
+    created = seed(api, shape)
+    board_id, column_id = import_board(api, created["projects"][0], shape)
+    journal = ImportJournal(str(tmp_path / "tasks.md.journal"))
+    journal.start(board_id=board_id, column_id=column_id)
+    with patch("import_tasks.YougileClient", make_client):
+        create_tasks_in_yougile(file_tasks(shape), board_id, column_id, journal=journal)
+        api.reset()
+
+        journal = ImportJournal(journal.path)
+        changes = diff_import(make_client(), file_tasks(shape), column_id, journal.hashes)
+        create_tasks_in_yougile(file_tasks(shape), board_id, column_id, journal=journal, changes=changes)
+
+    assert_within_budget("import --sync unchanged", api.counts, shape)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_update_descriptions_budget(api, shape):
+    """Тест: обновление описаний - задачи доски по колонкам, подзадачи по ID"""
+    created = seed(api, shape)
+    board_id, column_id = import_board(api, created["projects"][0], shape)
+    run_import(api, shape, board_id, column_id)
+    api.reset()
+
+    with patch("update_descriptions.YougileClient", make_client):
+        update_task_descriptions(file_tasks(shape), board_id)
+
+    assert_within_budget("update_descriptions", api.counts, shape)
+    assert api.counts["PUT tasks/{id}"] == shape.file_tasks * (1 + shape.subtasks)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_list_commands_budget(api, shape):
+    """Тест: списки projects / boards / tasks - только постраничный обход"""
+    seed(api, shape)
+    client = make_client()
+
+    for command, run in (("projects list", lambda: list_projects(client)),
+                         ("boards list", lambda: list_boards(client)),
+                         ("tasks list", lambda: list_tasks(client))):
+        api.reset()
+        run()
+        assert_within_budget(command, api.counts, shape)
+
+
+@pytest.mark.parametrize("shape", SHAPES)
+def test_sync_refresh_budget(api, shape, tmp_path):
+    """Тест: обновление зеркала - один обход каждого списка"""
+    seed(api, shape)
+
+    LocalMirror(str(tmp_path / "mirror.db")).refresh(make_client())
+
+    assert_within_budget("sync refresh", api.counts, shape)
+
+
+def test_per_column_scan_exceeds_show_structure_budget(api):
+    """Тест: запрос задач на каждую колонку, когда колонок больше страниц задач, не укладывается в бюджет"""
+    shape = Shape().scaled(3)
+    created = seed(api, shape)
+    client = make_client()
+    board_ids = [b["id"] for b in client.index.boards_of(created["projects"][0])]
+    column_ids = [c["id"] for board_id in board_ids for c in client.index.columns_of(board_id)]
+
+    client.index.load_tasks(column_ids)
+
+    problems = over_budget(api.counts, BUDGETS["show_structure"](shape))
+    # Бюджет - число задач компании и одна страница их списка
+    assert problems == [f"GET task-list: {shape.all_columns} > 2"]
+    with pytest.raises(AssertionError):
+        assert_within_budget("show_structure", api.counts, shape)
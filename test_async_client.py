@@ -0,0 +1,88 @@
+"""
+Тесты для AsyncYougileClient
+"""
+import asyncio
+import threading
+import pytest
+import responses
+from async_client import AsyncYougileClient, run_concurrently
+from exceptions import NotFound
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+@pytest.fixture
+def client():
+    return YougileClient(api_key="test-key", concurrency=4)
+
+
+@responses.activate
+def test_async_resource_methods(client):
+    """Тест: асинхронные методы возвращают то же, что синхронные"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/board-1", json={"id": "board-1"}, status=200)
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": "task-1"}, status=201)
+
+    async def scenario():
+        async with AsyncYougileClient(client=client) as async_client:
+            board = await async_client.get_board("board-1")
+            task = await async_client.create_task("Task", "col-1")
+            return board, task
+
+    board, task = asyncio.run(scenario())
+
+    assert board["id"] == "board-1"
+    assert task["id"] == "task-1"
+    assert responses.calls[1].request.method == "POST"
+
+
+@responses.activate
+def test_requests_overlap(client):
+    """Тест: независимые запросы выполняются одновременно"""
+    barrier = threading.Barrier(3, timeout=5)
+
+    def callback(request):
+        # Если запросы идут последовательно, барьер не дождётся остальных
+        barrier.wait()
+        board_id = request.url.rsplit("/", 1)[-1]
+        return 200, {}, f'{{"id": "{board_id}"}}'
+
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/boards/b1", callback=callback)
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/boards/b2", callback=callback)
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/boards/b3", callback=callback)
+
+    async def scenario():
+        async with AsyncYougileClient(client=client) as async_client:
+            return await async_client.gather(
+                [async_client.get_board(board_id) for board_id in ("b1", "b2", "b3")])
+
+    boards = asyncio.run(scenario())
+
+    assert [b["id"] for b in boards] == ["b1", "b2", "b3"]
+
+
+@responses.activate
+def test_shares_rate_limiter_and_session(client):
+    """Тест: асинхронный клиент использует ограничитель и сессию синхронного"""
+    async_client = AsyncYougileClient(client=client)
+
+    assert async_client.rate_limiter is client.rate_limiter
+    assert async_client.concurrency == 4
+    async_client.close()
+
+
+@responses.activate
+def test_run_concurrently_keeps_order_and_exceptions(client):
+    """Тест: run_concurrently сохраняет порядок и возвращает исключения"""
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/t1", json={"id": "t1"}, status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/t2", json={"error": "Not Found"}, status=404)
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/t3", json={"id": "t3"}, status=200)
+
+    results = run_concurrently(
+        client,
+        [lambda task_id=task_id: client.get_task(task_id) for task_id in ("t1", "t2", "t3")],
+        return_exceptions=True
+    )
+
+    assert results[0]["id"] == "t1"
+    assert isinstance(results[1], NotFound)
+    assert results[2]["id"] == "t3"
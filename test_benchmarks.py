@@ -0,0 +1,72 @@
+"""
+Тесты для набора бенчмарков
+"""
+import pytest
+import json
+from benchmarks.suite import (BASELINE_FILE, CALL_FIELDS, DEFAULT_PARAMS, LOCAL_FIELDS, compare, load_baseline,
+                              make_markdown_file, merge_baselines, run_suite, save_baseline)
+from import_tasks import parse_markdown_tasks
+
+
+def test_synthetic_markdown_is_parsed(tmp_path):
+    """Тест: синтетический файл разбирается parse_markdown_tasks"""
+    path = tmp_path / "tasks.md"
+    path.write_text(make_markdown_file(tasks=3, subtasks=2), encoding="utf-8")
+
+    tasks = parse_markdown_tasks(str(path))
+
+    assert [t["title"] for t in tasks] == ["Задача импорта №1", "Задача импорта №2", "Задача импорта №3"]
+    assert all(len(t["subtasks"]) == 2 and t["subtasks"][0]["description"] for t in tasks)
+
+
+def test_compare_reports_regressions():
+    """Тест: рост числа запросов - всегда регрессия, время - только сверх допуска и шума"""
+    baseline = {"import": {"seconds": 1.0, "calls": 100, "peak_mb": 1.0},
+                "pagination": {"seconds": 0.01, "calls": 20, "peak_mb": 50.0}}
+    results = {"import": {"seconds": 1.2, "calls": 101, "peak_mb": 1.0},
+               "pagination": {"seconds": 0.03, "calls": 20, "peak_mb": 80.0}}
+
+    regressions = compare(results, baseline)
+
+    assert regressions["import"] == ["запросов 100 → 101"]
+    assert regressions["pagination"] == ["память 50.0 → 80.0 МБ"]
+
+
+def test_committed_baseline_has_only_call_counts():
+    """Тест: в репозитории - только детерминированное число запросов, без времени и памяти"""
+    results = load_baseline(BASELINE_FILE, DEFAULT_PARAMS)
+
+    assert results
+    assert all(set(r) == set(CALL_FIELDS) for r in results.values())
+
+
+def test_time_compared_only_with_local_baseline(tmp_path):
+    """Тест: без локального baseline время не сравнивается, с ним - сравнивается"""
+    results = {"import": {"seconds": 5.0, "calls": 100, "calls_by_endpoint": {}, "peak_mb": 1.0}}
+    calls = {"import": {"calls": 100, "calls_by_endpoint": {}}}
+    local_path = str(tmp_path / "baseline.local.json")
+
+    assert compare(results, merge_baselines(calls, {})) == {}
+
+    save_baseline(local_path, DEFAULT_PARAMS, {"import": dict(results["import"], seconds=1.0)}, LOCAL_FIELDS)
+    with open(local_path, encoding="utf-8") as f:
+        assert json.load(f)["results"] == {"import": {"seconds": 1.0, "peak_mb": 1.0}}
+    local = load_baseline(local_path, DEFAULT_PARAMS)
+
+    assert compare(results, merge_baselines(calls, local)) == {"import": ["время 1.000с → 5.000с"]}
+
+
+@pytest.mark.slow
+def test_small_suite_against_fake_server():
+    """Тест: операции выполняются против fake сервера и считают запросы"""
+    params = dict(DEFAULT_PARAMS, tasks=50, import_tasks=2, subtasks=1, markdown_tasks=2,
+                  markdown_paragraphs=10, repeat=1)
+
+    results = run_suite(params)
+
+    # 2 задачи + 2 подзадачи + 2 связывания
+    assert results["import"]["calls"] == 6
+    assert results["import"]["calls_by_endpoint"] == {"POST tasks": 4, "PUT tasks/{id}": 2}
+    assert results["pagination"]["calls"] == 1
+    assert results["clear_board"]["calls_by_endpoint"]["PUT tasks/{id}"] == 2
+    assert all(r["peak_mb"] >= 0 and r["seconds"] > 0 for r in results.values())
@@ -0,0 +1,152 @@
+"""
+Тесты для массовых операций
+"""
+import io
+import time
+from unittest.mock import Mock
+from bulk import BulkExecutor, Skip, Turns, OK, FAILED, SKIPPED, print_summary
+
+
+def test_results_in_operation_order():
+    """Тест: результаты приходят в порядке операций, даже если завершаются в другом"""
+    seen = []
+
+    def op(i):
+        time.sleep(0.01 * (5 - i))
+        return i * 10
+
+    report = BulkExecutor(concurrency=4, on_result=seen.append).run(
+        [(i, lambda i=i: op(i)) for i in range(5)])
+
+    assert [r.item for r in seen] == [0, 1, 2, 3, 4]
+    assert [r.value for r in report.results] == [0, 10, 20, 30, 40]
+    assert report.ok == 5 and report.done == report.total == 5
+
+
+def test_skip_and_failure_statuses():
+    """Тест: Skip помечает элемент пропущенным, исключение - ошибкой"""
+    def fail():
+        raise RuntimeError("boom")
+
+    def skip():
+        raise Skip("не найдена")
+
+    report = BulkExecutor(concurrency=2).run([("a", lambda: 1), ("b", skip), ("c", fail)])
+
+    assert [r.status for r in report.results] == [OK, SKIPPED, FAILED]
+    assert (report.ok, report.skipped, report.failed) == (1, 1, 1)
+    assert str(report.failures()[0].error) == "boom"
+
+
+def test_concurrency_from_client():
+    """Тест: размер пула по умолчанию - concurrency клиента"""
+    assert BulkExecutor(Mock(concurrency=6)).concurrency == 6
+    assert BulkExecutor().concurrency == 1
+
+
+def test_abort_on_max_failures():
+    """Тест: после порога ошибок новые операции не запускаются"""
+    started = []
+
+    def fail(i):
+        started.append(i)
+        raise RuntimeError(i)
+
+    report = BulkExecutor(concurrency=1, max_failures=3).run(
+        [(i, lambda i=i: fail(i)) for i in range(100)])
+
+    # Уже начатые к моменту остановки операции завершаются и попадают в отчёт
+    assert 3 <= report.failed == len(started) <= 3 + 2
+    assert "порог 3" in report.aborted
+
+
+def test_abort_on_failure_rate():
+    """Тест: доля ошибок проверяется после min_sample операций"""
+    def op(i):
+        if i % 4:
+            raise RuntimeError(i)
+        return i
+
+    report = BulkExecutor(concurrency=1, max_failure_rate=0.5, min_sample=8).run(
+        [(i, lambda i=i: op(i)) for i in range(100)])
+
+    assert report.done < 100
+    assert report.ok + report.failed >= 8
+    assert report.aborted
+
+
+def test_operations_read_lazily():
+    """Тест: поток операций читается не дальше окна 2 x concurrency"""
+    produced = []
+
+    def operations():
+        for i in range(50):
+            produced.append(i)
+            yield i, lambda: None
+
+    def check(result):
+        assert len(produced) <= result.index + 1 + 2 * 2
+
+    report = BulkExecutor(concurrency=2, on_result=check).run(operations())
+
+    assert report.total is None
+    assert report.ok == 50
+
+
+def test_progress_and_eta():
+    """Тест: прогресс показывает темп и оставшееся время"""
+    ticks = iter(range(0, 1000, 5))
+    out = io.StringIO()
+    executor = BulkExecutor(concurrency=1, progress=out, progress_interval=10,
+                            clock=lambda: next(ticks))
+
+    report = executor.run([(i, lambda: None) for i in range(4)])
+
+    # Каждая операция - 5 «секунд»: 4 операции за 20 с
+    assert report.elapsed == 25
+    assert "2/4 (50%), 0.2 оп/с, осталось ~10 с" in out.getvalue()
+
+
+def test_print_summary(capsys):
+    """Тест: итоги содержат успешные, пропущенные, ошибки и причину остановки"""
+    report = BulkExecutor(concurrency=1, max_failures=1).run(
+        [("a", lambda: 1), ("b", lambda: 1 / 0), ("c", lambda: 1)])
+
+    print_summary(report, "Готово")
+
+    out = capsys.readouterr().out
+    assert f"✓ Готово: {report.ok}" in out
+    assert "✗ Ошибок: 1" in out
+    assert "✗ Остановлено: ошибок 1 (порог 1)" in out
+
+
+def test_turns_keep_order_inside_concurrent_operations():
+    """Тест: шаг в очереди выполняется по порядку номеров, остальная работа - одновременно"""
+    turns = Turns()
+    order = []
+
+    def op(i):
+        time.sleep(0.005 * (8 - i))
+        with turns.turn(i):
+            order.append(i)
+        return i
+
+    report = BulkExecutor(concurrency=4).run([(i, lambda i=i: op(i)) for i in range(8)])
+
+    assert order == list(range(8))
+    assert report.ok == 8
+
+
+def test_turns_skip_passes_turn():
+    """Тест: пропущенный заранее номер не задерживает очередь, повторный skip безвреден"""
+    turns = Turns()
+    turns.skip(1)
+    turns.skip(1)
+    order = []
+
+    with turns.turn(0):
+        order.append(0)
+    with turns.turn(2):
+        order.append(2)
+
+    assert order == [0, 2]
@@ -0,0 +1,192 @@
+"""
+Тесты для дискового кэша ответов
+"""
+import pytest
+import responses
+from cache import ResponseCache, resource_of
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    return ResponseCache(str(tmp_path / "cache"), clock=clock)
+
+
+@pytest.fixture
+def client(cache):
+    return YougileClient(api_key="test-key", cache=cache)
+
+
+@responses.activate
+def test_fresh_entry_served_without_request(client):
+    """Тест: повторный запрос в пределах TTL не уходит в сеть"""
+    responses.add(responses.GET, f"{API_BASE_URL}/projects", json=[{"id": "p1"}], status=200)
+
+    first = client.get_projects()
+    second = client.get_projects()
+
+    assert first == second == [{"id": "p1"}]
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_cache_persists_between_clients(cache):
+    """Тест: кэш на диске переживает перезапуск скрипта"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1"}, status=200)
+
+    YougileClient(api_key="test-key", cache=cache).get_board("b1")
+    board = YougileClient(api_key="test-key", cache=cache).get_board("b1")
+
+    assert board == {"id": "b1"}
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_params_are_part_of_key(client):
+    """Тест: разные параметры - разные записи"""
+    responses.add(responses.GET, f"{API_BASE_URL}/columns", json=[{"id": "c1"}], status=200)
+
+    client.get("columns", params={"boardId": "b1"})
+    client.get("columns", params={"boardId": "b2"})
+
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_expired_entry_revalidated_with_etag(client, clock):
+    """Тест: устаревшая запись ревалидируется по ETag, 304 продлевает её"""
+    responses.add(responses.GET, f"{API_BASE_URL}/columns/c1", json={"id": "c1", "title": "Old"},
+                  headers={"ETag": '"v1"'}, status=200)
+    client.get_column("c1")
+
+    clock.now += 601
+    responses.replace(responses.GET, f"{API_BASE_URL}/columns/c1", status=304)
+
+    column = client.get_column("c1")
+
+    assert column["title"] == "Old"
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+
+    # После 304 запись снова свежая
+    client.get_column("c1")
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_expired_entry_without_validators_refetched(client, clock):
+    """Тест: устаревшая запись без ETag загружается заново"""
+    responses.add(responses.GET, f"{API_BASE_URL}/users", json=[{"id": "u1"}], status=200)
+    client.get_users()
+
+    clock.now += 3601
+    responses.replace(responses.GET, f"{API_BASE_URL}/users", json=[{"id": "u2"}], status=200)
+
+    assert client.get_users() == [{"id": "u2"}]
+    assert "If-None-Match" not in responses.calls[1].request.headers
+
+
+@responses.activate
+def test_write_invalidates_resource(client):
+    """Тест: запись через клиент сбрасывает кэш ресурса"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1", "title": "Old"}, status=200)
+    responses.add(responses.PUT, f"{API_BASE_URL}/boards/b1", json={"id": "b1"}, status=200)
+    client.get_board("b1")
+
+    client.update_board("b1", title="New")
+    responses.replace(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1", "title": "New"}, status=200)
+
+    assert client.get_board("b1")["title"] == "New"
+
+
+@responses.activate
+def test_response_started_before_write_not_cached(client, cache):
+    """Тест: GET, начатый до записи и завершившийся после неё, не попадает в кэш"""
+    def old_board(request):
+        # Пока ответ в пути, другой поток записал доску
+        cache.invalidate("boards/b1")
+        return 200, {}, '{"id": "b1", "title": "Old"}'
+
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/boards/b1", callback=old_board)
+    client.get_board("b1")
+    responses.replace(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1", "title": "New"}, status=200)
+
+    assert client.get_board("b1")["title"] == "New"
+    assert len(responses.calls) == 2
+
+
+def test_put_skipped_after_invalidate(cache):
+    """Тест: put с поколением до invalidate (в том числе зависимого ресурса) ничего не сохраняет"""
+    generation = cache.generation("boards")
+    cache.invalidate("columns/c1")
+
+    cache.put("boards", None, [{"id": "b1"}], generation=generation)
+    assert cache.get("boards") is None
+
+    cache.put("boards", None, [{"id": "b1"}], generation=cache.generation("boards"))
+    assert cache.get("boards").data == [{"id": "b1"}]
+
+
+@responses.activate
+def test_column_write_invalidates_boards(client):
+    """Тест: изменение колонки сбрасывает кэш досок (в них есть колонки)"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1", "columns": []}, status=200)
+    responses.add(responses.POST, f"{API_BASE_URL}/columns", json={"id": "c1"}, status=201)
+    client.get_board("b1")
+
+    client.create_column("New", "b1")
+    client.get_board("b1")
+
+    assert len([c for c in responses.calls if c.request.method == "GET"]) == 2
+
+
+@responses.activate
+def test_tasks_not_cached_by_default(client):
+    """Тест: задачи меняются часто и по умолчанию не кэшируются"""
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/t1", json={"id": "t1"}, status=200)
+
+    client.get_task("t1")
+    client.get_task("t1")
+
+    assert len(responses.calls) == 2
+
+
+def test_resource_of():
+    """Тест определения ресурса по endpoint"""
+    assert resource_of("boards/123") == "boards"
+    assert resource_of("/columns") == "columns"
+    assert resource_of("task-list") == "tasks"
+
+
+def test_clear(cache):
+    """Тест очистки кэша"""
+    cache.put("projects", None, [{"id": "p1"}])
+    assert cache.get("projects") is not None
+
+    cache.clear()
+
+    assert cache.get("projects") is None
+
+
+def test_cache_dir_from_env(tmp_path, monkeypatch):
+    """Тест: YOUGILE_CACHE_DIR включает кэш, отдельный для каждого API ключа"""
+    monkeypatch.setattr("yougile_client.CACHE_DIR", str(tmp_path))
+
+    first = YougileClient(api_key="key-1")
+    second = YougileClient(api_key="key-2")
+
+    assert first.cache is not None
+    assert first.cache.directory != second.cache.directory
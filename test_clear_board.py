@@ -4,12 +4,15 @@
 import pytest
 from unittest.mock import Mock, patch, call
 from clear_board import clear_board
+from entity_index import EntityIndex
 
 
 @pytest.fixture
 def mock_client():
     """Фикстура для мокирования YougileClient"""
     client = Mock()
+    client.concurrency = 2
+    client.index = EntityIndex(client)
     return client
 
 
@@ -180,3 +183,23 @@ def test_clear_board_confirmation_cancelled(mock_input, mock_require, mock_clien
     
     # Проверяем, что архивация не произошла
     mock_client.update_task.assert_not_called()
+
+
+@patch('clear_board.YougileClient')
+@patch('clear_board.require_board_context')
+def test_clear_board_fetches_only_board_tasks(mock_require, mock_client_class, mock_client):
+    """Тест: запрашиваются только колонки и задачи доски, а не вся компания"""
+    mock_require.return_value = "board-1"
+    mock_client_class.return_value = mock_client
+    
+    mock_client.get_board.return_value = {"id": "board-1", "title": "Test Board"}
+    mock_client.get_columns.return_value = [
+        {"id": "col-1", "boardId": "board-1"},
+        {"id": "col-2", "boardId": "board-1"}
+    ]
+    mock_client.get_tasks.return_value = []
+    
+    clear_board(confirm=False)
+    
+    mock_client.get_columns.assert_called_once_with(board_id="board-1")
+    mock_client.get_tasks.assert_called_once_with(column_id=["col-1", "col-2"])
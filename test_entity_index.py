@@ -0,0 +1,129 @@
+"""
+Тесты для индекса связей сущностей
+"""
+import pytest
+import responses
+from unittest.mock import Mock
+from entity_index import EntityIndex
+from import_tasks import get_column_by_name
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+@pytest.fixture
+def api():
+    client = Mock()
+    client.get_boards.return_value = [{"id": "b1", "title": "Доска", "projectId": "p1"},
+                                      {"id": "b2", "title": "Другая", "projectId": "p2"}]
+    client.get_columns.return_value = [{"id": "c1", "title": "Backlog", "boardId": "b1"},
+                                       {"id": "c2", "title": "Done", "boardId": "b1"},
+                                       {"id": "c3", "title": "To Do", "boardId": "b2"}]
+    client.get_tasks.return_value = [{"id": "t1", "columnId": "c1"},
+                                     {"id": "t2", "columnId": "c2"},
+                                     {"id": "t3", "columnId": "c2", "archived": True}]
+    return client
+
+
+def test_load_builds_maps(api):
+    """Тест: после load() связи доступны без запросов"""
+    index = EntityIndex(api)
+    index.load()
+    api.reset_mock()
+
+    assert index.board_of("c3") == "b2"
+    assert index.project_of("b1") == "p1"
+    assert [b["id"] for b in index.boards_of("p1")] == ["b1"]
+    assert index.column_ids_of("b1") == {"c1", "c2"}
+    api.get_boards.assert_not_called()
+    api.get_columns.assert_not_called()
+    api.get_column.assert_not_called()
+
+
+def test_columns_loaded_once_per_board(api):
+    """Тест: колонки доски запрашиваются один раз с фильтром boardId"""
+    api.get_columns.return_value = [{"id": "c1", "title": "Backlog", "boardId": "b1"}]
+    index = EntityIndex(api)
+
+    index.columns_of("b1")
+    index.columns_of("b1")
+
+    api.get_columns.assert_called_once_with(board_id="b1")
+    assert index.board_of("c1") == "b1"
+
+
+def test_column_by_name_prefers_exact_match(api):
+    """Тест: точное совпадение названия важнее частичного"""
+    api.get_columns.return_value = [{"id": "c0", "title": "Backlog old", "boardId": "b1"},
+                                    {"id": "c1", "title": "Backlog", "boardId": "b1"}]
+    index = EntityIndex(api)
+
+    assert index.column_by_name("b1", "backlog")["id"] == "c1"
+    assert index.column_by_name("b1", "old")["id"] == "c0"
+    assert index.column_by_name("b1", "Missing") is None
+
+
+def test_task_sets_skip_archived(api):
+    """Тест: в индекс попадают только активные задачи"""
+    index = EntityIndex(api)
+    index.load()
+
+    assert index.board_task_ids("b1") == {"t1", "t2"}
+    assert index.task_ids("c2") == {"t2"}
+    api.get_tasks.assert_called_once_with(column_id=["c1", "c2"])
+
+
+def test_task_sets_follow_changes(api):
+    """Тест: создание, перемещение, архивация и удаление обновляют индекс"""
+    index = EntityIndex(api)
+    index.load()
+    index.board_task_ids("b1")
+
+    index.task_created("t4", "c1")
+    index.task_updated("t1", {"columnId": "c2"})
+    index.task_updated("t2", {"archived": True})
+    assert index.task_ids("c1") == {"t4"}
+    assert index.task_ids("c2") == {"t1"}
+
+    index.task_deleted("t1")
+    assert index.task_ids("c2") == set()
+    assert api.get_tasks.call_count == 1
+
+
+def test_column_and_board_changes(api):
+    """Тест: новые и удалённые колонки и доски отражаются в индексе"""
+    index = EntityIndex(api)
+    index.load()
+
+    index.column_created({"id": "c9", "title": "New", "boardId": "b2"})
+    assert index.column_ids_of("b2") == {"c3", "c9"}
+    assert index.task_ids("c9") == set()
+
+    index.board_deleted("b2")
+    assert [b["id"] for b in index.boards_of("p2")] == []
+    api.get_boards.assert_called_once_with()
+
+
+@responses.activate
+def test_client_updates_index():
+    """Тест: клиент сообщает индексу о созданных и архивированных задачах"""
+    client = YougileClient(api_key="test-key")
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", status=200,
+                  json={"paging": {"count": 1, "limit": 1000, "offset": 0, "next": False},
+                        "content": [{"id": "t1", "columnId": "c1"}]})
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": "t2"}, status=201)
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/t1", json={"id": "t1"}, status=200)
+
+    assert client.index.task_ids("c1") == {"t1"}
+    client.create_task("Новая", "c1")
+    client.update_task("t1", archived=True)
+
+    assert client.index.task_ids("c1") == {"t2"}
+    assert len([c for c in responses.calls if c.request.method == "GET"]) == 1
+
+
+def test_get_column_by_name_uses_index(api):
+    """Тест: поиск колонки для импорта идёт через индекс клиента"""
+    api.index = EntityIndex(api)
+
+    assert get_column_by_name("b1", "done", client=api) == "c2"
+    api.get_columns.assert_called_once_with(board_id="b1")
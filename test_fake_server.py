@@ -0,0 +1,89 @@
+"""
+Тесты для локального заменителя Yougile API
+"""
+import pytest
+import requests
+from fake_server import FakeYougileServer
+from retry import RetryPolicy
+from yougile_client import YougileClient
+
+
+@pytest.fixture
+def server():
+    with FakeYougileServer(rate_limit=None) as server:
+        yield server
+
+
+@pytest.fixture
+def client(server):
+    return YougileClient(api_key="fake", base_url=server.url,
+                         retry_policy=RetryPolicy(max_attempts=3, jitter=False, sleep=lambda s: None))
+
+
+def test_client_pages_through_tasks(server, client):
+    """Тест: клиент получает все задачи постранично с фильтром по колонке"""
+    created = server.state.seed(boards=1, columns=2, tasks=250, users=0)
+
+    tasks = client.get_tasks(all_pages=True, column_id=created["columns"][0])
+
+    assert len(tasks) == 125
+    assert server.calls[("GET", "task-list")] >= 1
+
+
+def test_crud_and_board_order(server, client):
+    """Тест: создание, перенос и удаление задач; новые задачи встают в начало колонки"""
+    project = client.create_project("Проект")
+    board = client.create_board("Доска", projectId=project["id"])
+    column = client.create_column("Колонка", board["id"])
+    done = client.create_column("Готово", board["id"])
+    first = client.create_task("Первая", column["id"])
+    second = client.create_task("Вторая", column["id"])
+    client.create_task("Третья", done["id"])
+
+    assert server.state.board_order(column["id"]) == ["Вторая", "Первая"]
+
+    client.update_task(first["id"], columnId=done["id"])
+    client.delete_task(second["id"])
+
+    assert client.get_task(first["id"])["columnId"] == done["id"]
+    assert server.state.board_order(done["id"]) == ["Первая", "Третья"]
+    assert server.state.board_order(column["id"]) == []
+    assert [b["id"] for b in client.get_boards(project["id"])] == [board["id"]]
+
+
+def test_requires_auth(server):
+    """Тест: без Bearer ключа сервер отвечает 401"""
+    response = requests.get(f"{server.url}/projects")
+
+    assert response.status_code == 401
+    assert response.json()["statusCode"] == 401
+
+
+def test_unknown_id_is_404(server):
+    """Тест: несуществующая сущность - 404"""
+    response = requests.get(f"{server.url}/tasks/missing", headers={"Authorization": "Bearer fake"})
+
+    assert response.status_code == 404
+
+
+def test_rate_limit_returns_429():
+    """Тест: сверх лимита сервер отвечает 429 с Retry-After"""
+    with FakeYougileServer(rate_limit=2, rate_period=60) as server:
+        headers = {"Authorization": "Bearer fake"}
+        statuses = [requests.get(f"{server.url}/users", headers=headers).status_code for _ in range(3)]
+        limited = requests.get(f"{server.url}/users", headers=headers)
+
+    assert statuses == [200, 200, 429]
+    assert int(limited.headers["Retry-After"]) >= 1
+    assert server.rejected == 2
+
+
+def test_latency(server, client):
+    """Тест: настраиваемая задержка ответа"""
+    import time
+    server.latency = 0.05
+    started = time.perf_counter()
+
+    client.get_users()
+
+    assert time.perf_counter() - started >= 0.05
@@ -0,0 +1,162 @@
+"""
+Тесты для хуков жизненного цикла запроса
+"""
+import io
+import pytest
+import requests
+import responses
+from unittest.mock import patch
+from hooks import HookChain, RequestHook, TraceHook
+from metrics import MetricsHook
+from retry import NO_RETRY, RetryHook, RetryPolicy
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+class Recorder(RequestHook):
+    def __init__(self):
+        self.events = []
+
+    def before_request(self, ctx):
+        self.events.append(("before", ctx.method, ctx.endpoint, ctx.attempt))
+
+    def after_response(self, ctx, response):
+        self.events.append(("after", response.status_code, ctx.attempt))
+
+    def on_error(self, ctx, error):
+        self.events.append(("error", type(error).__name__, ctx.attempt))
+
+
+@pytest.fixture
+def client():
+    return YougileClient(api_key="test-key",
+                         retry_policy=RetryPolicy(max_attempts=3, jitter=False, sleep=lambda s: None))
+
+
+@responses.activate
+def test_hooks_called_for_each_attempt(client):
+    """Тест: хуки вызываются для каждой попытки, включая повторы"""
+    recorder = client.add_hook(Recorder())
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/b1", json={"error": "busy"}, status=503)
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/b1", json={"id": "b1"}, status=200)
+
+    client.get_board("b1")
+
+    assert recorder.events == [
+        ("before", "GET", "boards/b1", 1), ("after", 503, 1), ("error", "ServerError", 1),
+        ("before", "GET", "boards/b1", 2), ("after", 200, 2),
+    ]
+
+
+@responses.activate
+def test_transport_error_reaches_on_error(client):
+    """Тест: ошибка сети передаётся в on_error без after_response"""
+    recorder = client.add_hook(Recorder())
+    responses.add(responses.GET, f"{API_BASE_URL}/users",
+                  body=requests.exceptions.ConnectionError("refused"))
+    responses.add(responses.GET, f"{API_BASE_URL}/users", json=[], status=200)
+
+    client.get_users()
+
+    assert recorder.events[:2] == [("before", "GET", "users", 1), ("error", "TransportError", 1)]
+
+
+@responses.activate
+def test_before_request_can_change_request(client):
+    """Тест: хук может добавить заголовок к запросу"""
+    class Tracing(RequestHook):
+        def before_request(self, ctx):
+            ctx.kwargs["headers"] = {**(ctx.kwargs.get("headers") or {}), "X-Trace-Id": "abc"}
+
+    client.add_hook(Tracing())
+    responses.add(responses.GET, f"{API_BASE_URL}/projects/p1", json={"id": "p1"}, status=200)
+
+    client.get_project("p1")
+
+    assert responses.calls[0].request.headers["X-Trace-Id"] == "abc"
+
+
+@responses.activate
+def test_remove_hook(client):
+    """Тест: отключённый хук больше не вызывается"""
+    recorder = client.add_hook(Recorder())
+    client.remove_hook(recorder)
+    responses.add(responses.GET, f"{API_BASE_URL}/projects/p1", json={"id": "p1"}, status=200)
+
+    client.get_project("p1")
+
+    assert recorder.events == []
+
+
+@responses.activate
+def test_no_context_without_hooks():
+    """Тест: без повторов, статистики и кэша цепочка пуста - RequestContext не создаётся"""
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY, metrics=False)
+    responses.add(responses.GET, f"{API_BASE_URL}/projects/p1", json={"id": "p1"}, status=200)
+
+    with patch("yougile_client.RequestContext") as context_class:
+        assert client.get_project("p1") == {"id": "p1"}
+
+    assert not client.hooks
+    context_class.assert_not_called()
+    assert client.stats() == {}
+
+
+def test_builtin_hooks_registered(client):
+    """Тест: повторы и статистика подключены к клиенту как хуки цепочки"""
+    assert [type(hook) for hook in client.hooks._hooks] == [RetryHook, MetricsHook]
+
+
+@responses.activate
+def test_before_request_can_answer_without_request(client):
+    """Тест: хук, задавший ctx.result, отвечает вместо сети - запрос не отправляется"""
+    class Stub(RequestHook):
+        def before_request(self, ctx):
+            if ctx.endpoint == "projects/p1":
+                ctx.result = {"id": "p1", "title": "Из хука"}
+
+    client.add_hook(Stub())
+
+    assert client.get_project("p1")["title"] == "Из хука"
+    assert len(responses.calls) == 0
+
+
+@responses.activate
+def test_on_error_can_request_retry():
+    """Тест: хук решает о повторе - True из on_error повторяет запрос без RetryPolicy"""
+    class RetryConflict(RequestHook):
+        def on_error(self, ctx, error):
+            return getattr(error, 'status_code', None) == 409 and ctx.attempt < 2
+
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY)
+    client.add_hook(RetryConflict())
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/t1", json={"error": "conflict"}, status=409)
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/t1", json={"id": "t1"}, status=200)
+
+    assert client.update_task("t1", title="Новая") == {"id": "t1"}
+    assert len(responses.calls) == 2
+
+
+def test_chain_skips_methods_not_overridden():
+    """Тест: в фазы попадают только переопределённые методы хука"""
+    class AfterOnly(RequestHook):
+        def after_response(self, ctx, response):
+            pass
+
+    chain = HookChain()
+    chain.add(AfterOnly())
+
+    assert len(chain._before) == 0
+    assert len(chain._after) == 1
+
+
+@responses.activate
+def test_trace_hook_output(client):
+    """Тест: TraceHook выводит метод, endpoint и статус"""
+    stream = io.StringIO()
+    client.add_hook(TraceHook(stream))
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": "t1"}, status=201)
+
+    client.create_task("Задача", "col-1")
+
+    assert "POST tasks 201" in stream.getvalue()
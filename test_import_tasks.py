@@ -0,0 +1,158 @@
+"""
+Тесты для создания задач при импорте из markdown
+"""
+import json
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from api_budget import MockedApi
+from hooks import RequestHook
+from import_tasks import create_tasks_in_yougile
+from journal import ImportJournal, tasks_fingerprint
+from rate_limiter import TokenBucket
+from retry import RetryPolicy
+from yougile_client import YougileClient
+
+TASKS = [{"title": f"Задача {i}", "description": "Описание",
+          "subtasks": [{"title": f"Подзадача {i}.{j}", "description": "Шаг"} for j in range(3)]}
+         for i in range(12)]
+
+
+class InFlight(RequestHook):
+    """Сколько запросов выполнялось одновременно (каждый ответ - 5 мс)"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.current = 0
+        self.peak = 0
+
+    def before_request(self, ctx):
+        with self.lock:
+            self.current += 1
+            self.peak = max(self.peak, self.current)
+        time.sleep(0.005)
+
+    def after_response(self, ctx, response):
+        with self.lock:
+            self.current -= 1
+
+
+def make_client(concurrency=8):
+    return YougileClient(api_key="test-key", rate_limiter=TokenBucket(rate=10 ** 6, period=1),
+                         retry_policy=RetryPolicy(max_attempts=1), concurrency=concurrency)
+
+
+def import_column(api):
+    project = api.state.create("projects", {"title": "Проект"})
+    board = api.state.create("boards", {"title": "Доска", "projectId": project["id"]})
+    column = api.state.create("columns", {"title": "Backlog", "boardId": board["id"]})
+    return board["id"], column["id"]
+
+
+def start_journal(tmp_path, board_id, column_id):
+    journal = ImportJournal(str(tmp_path / "tasks.md.journal"))
+    journal.start(fingerprint=tasks_fingerprint(TASKS), board_id=board_id, column_id=column_id, parallel=True)
+    return journal
+
+
+def test_concurrent_import_keeps_order():
+    """Тест: запросы идут одновременно, порядок задач на доске и подзадач - как в файле"""
+    in_flight = InFlight()
+    with MockedApi() as api, patch("import_tasks.YougileClient", make_client):
+        board_id, column_id = import_column(api)
+
+        report = create_tasks_in_yougile(TASKS, board_id, column_id, hooks=[in_flight])
+
+    assert report.ok == len(TASKS)
+    assert in_flight.peak > 1
+    assert api.counts["POST tasks"] == len(TASKS) * 4
+    assert api.counts["PUT tasks/{id}"] == len(TASKS)
+    assert api.state.board_order(column_id) == [t["title"] for t in TASKS]
+    tasks = {t["id"]: t for t in api.state.list("tasks", {})}
+    for parent in (t for t in tasks.values() if t.get("columnId")):
+        number = parent["title"].split()[-1]
+        assert [tasks[i]["title"] for i in parent["subtasks"]] == [f"Подзадача {number}.{j}" for j in range(3)]
+
+
+def test_parallel_import_places_in_order(tmp_path):
+    """Тест: --parallel - задачи создаются одновременно, перенос в колонку и связь - одним PUT"""
+    in_flight = InFlight()
+    with MockedApi() as api, patch("import_tasks.YougileClient", make_client):
+        board_id, column_id = import_column(api)
+
+        report = create_tasks_in_yougile(TASKS, board_id, column_id, hooks=[in_flight], parallel=True,
+                                         journal=start_journal(tmp_path, board_id, column_id))
+
+    assert report.ok == len(TASKS)
+    assert in_flight.peak > 1
+    assert api.counts["POST tasks"] == len(TASKS) * 4
+    assert api.counts["PUT tasks/{id}"] == len(TASKS)
+    assert api.state.board_order(column_id) == [t["title"] for t in TASKS]
+    assert all(len(t["subtasks"]) == 3 for t in api.state.list("tasks", {}) if t.get("columnId"))
+
+
+def test_parallel_import_requires_journal():
+    """Тест: --parallel без журнала не запускается - иначе не перенесённая задача потеряется"""
+    with pytest.raises(ValueError):
+        create_tasks_in_yougile(TASKS, "b1", "c1", parallel=True)
+
+
+def test_parallel_failed_placement_resumed_from_journal(tmp_path, capsys):
+    """Тест: после неудачного переноса следующие не переносятся - продолжение расставит все по порядку"""
+    class FailPlacement(RequestHook):
+        def __init__(self, task_id):
+            self.task_id = task_id
+
+        def before_request(self, ctx):
+            if ctx.method == "PUT" and ctx.endpoint == f"tasks/{self.task_id()}":
+                raise RuntimeError("сеть")
+
+    with MockedApi() as api, patch("import_tasks.YougileClient", make_client):
+        board_id, column_id = import_column(api)
+        journal = start_journal(tmp_path, board_id, column_id)
+        target = lambda: journal.created.get("5")
+
+        report = create_tasks_in_yougile(TASKS, board_id, column_id, hooks=[FailPlacement(target)],
+                                         parallel=True, journal=journal)
+        unplaced = target()
+        # Задача 5 и все, что должны встать выше неё, созданы, но ждут переноса
+        assert report.failed == 6 and unplaced in capsys.readouterr().out
+        assert api.state.board_order(column_id) == [t["title"] for t in TASKS[6:]]
+
+        report = create_tasks_in_yougile(TASKS, board_id, column_id, parallel=True,
+                                         journal=ImportJournal(journal.path))
+
+    assert report.ok == len(TASKS)
+    assert api.state.items["tasks"][unplaced]["columnId"] == column_id
+    assert len(api.state.list("tasks", {})) == len(TASKS) * 4
+    assert api.state.board_order(column_id) == [t["title"] for t in TASKS]
+
+
+def test_parallel_import_failed_task_does_not_block_order(tmp_path):
+    """Тест: ошибка создания задачи не останавливает перенос остальных"""
+    class FailTask(RequestHook):
+        def before_request(self, ctx):
+            if ctx.method == "POST" and json.loads(ctx.kwargs["data"])["title"] == "Задача 5":
+                raise RuntimeError("сеть")
+
+    with MockedApi() as api, patch("import_tasks.YougileClient", make_client):
+        board_id, column_id = import_column(api)
+
+        report = create_tasks_in_yougile(TASKS, board_id, column_id, hooks=[FailTask()], parallel=True,
+                                         journal=start_journal(tmp_path, board_id, column_id))
+
+    assert (report.ok, report.failed) == (len(TASKS) - 1, 1)
+    assert api.state.board_order(column_id) == [t["title"] for t in TASKS if t["title"] != "Задача 5"]
+
+
+def test_delay_keeps_requests_sequential():
+    """Тест: с --delay запросы идут по одному"""
+    in_flight = InFlight()
+    with MockedApi() as api, patch("import_tasks.YougileClient", make_client):
+        board_id, column_id = import_column(api)
+
+        create_tasks_in_yougile(TASKS[:2], board_id, column_id, delay=0.001, hooks=[in_flight])
+
+    assert in_flight.peak == 1
+    assert api.state.board_order(column_id) == [t["title"] for t in TASKS[:2]]
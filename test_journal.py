@@ -0,0 +1,215 @@
+"""
+Тесты для журнала импорта, продолжения прерванного импорта и импорта по разнице
+"""
+import pytest
+from unittest.mock import patch
+from api_budget import MockedApi
+from hooks import RequestHook
+from import_tasks import CREATE, UNCHANGED, UPDATE, content_hash, create_tasks_in_yougile, diff_import
+from journal import ImportJournal, tasks_fingerprint
+from rate_limiter import TokenBucket
+from retry import RetryPolicy
+from yougile_client import YougileClient
+
+TASKS = [{"title": f"Задача {i}", "description": "Описание",
+          "subtasks": [{"title": f"Подзадача {i}.{j}", "description": "Шаг"} for j in range(2)]}
+         for i in range(5)]
+
+
+def make_client(concurrency=None):
+    return YougileClient(api_key="test-key", rate_limiter=TokenBucket(rate=10 ** 6, period=1),
+                         retry_policy=RetryPolicy(max_attempts=1), concurrency=concurrency)
+
+
+class CrashAfterPost(RequestHook):
+    """Аварийное завершение после n-го POST: задача создана, ответ потерян, дальше запросов нет"""
+
+    def __init__(self, n):
+        self.n = n
+        self.posts = 0
+
+    def before_request(self, ctx):
+        if self.posts >= self.n:
+            raise KeyboardInterrupt
+
+    def after_response(self, ctx, response):
+        if ctx.method == "POST":
+            self.posts += 1
+            if self.posts == self.n:
+                raise KeyboardInterrupt
+
+
+class CrashBeforePost(RequestHook):
+    """Аварийное завершение перед n-м POST: намерение записано, запрос не ушёл"""
+
+    def __init__(self, n):
+        self.n = n
+        self.posts = 0
+
+    def before_request(self, ctx):
+        if ctx.method == "POST":
+            self.posts += 1
+        if self.posts >= self.n:
+            raise KeyboardInterrupt
+
+
+@pytest.fixture
+def api():
+    with MockedApi() as api:
+        project = api.state.create("projects", {"title": "Проект"})
+        board = api.state.create("boards", {"title": "Доска", "projectId": project["id"]})
+        api.column_id = api.state.create("columns", {"title": "Backlog", "boardId": board["id"]})["id"]
+        api.board_id = board["id"]
+        yield api
+
+
+def test_journal_replay(tmp_path):
+    """Тест: журнал восстанавливает созданное и оборванное, обрезанная запись игнорируется"""
+    path = str(tmp_path / "tasks.md.journal")
+    journal = ImportJournal(path)
+    journal.start(fingerprint=tasks_fingerprint(TASKS), board_id="b", column_id="c")
+    assert journal.once("0", lambda: {"id": "t0"}) == ("t0", False)
+    with pytest.raises(RuntimeError):
+        journal.once("1", lambda: (_ for _ in ()).throw(RuntimeError("сеть")))
+    journal.mark_linked("0", ["s0"])
+    journal.close()
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"op": "crea')
+
+    replayed = ImportJournal(path)
+
+    assert replayed.unfinished and replayed.matches(tasks_fingerprint(TASKS))
+    assert replayed.created == {"0": "t0"}
+    assert replayed.pending == {"1"}
+    assert replayed.linked == {"0"}
+    assert replayed.once("0", lambda: pytest.fail("повторное создание")) == ("t0", True)
+
+
+def test_resume_after_crash(api, tmp_path):
+    """Тест: продолжение после сбоя без дублей и лишних запросов, порядок на доске сохранён"""
+    path = str(tmp_path / "tasks.md.journal")
+    journal = ImportJournal(path)
+    journal.start(fingerprint=tasks_fingerprint(TASKS), board_id=api.board_id, column_id=api.column_id)
+
+    # По одному запросу: номер POST, на котором происходит сбой, детерминирован
+    with patch("import_tasks.YougileClient", lambda: make_client(concurrency=1)):
+        # 8-й POST - первая подзадача задачи 2 (создаются с конца): создана, ответ потерян
+        with pytest.raises(KeyboardInterrupt):
+            create_tasks_in_yougile(TASKS, api.board_id, api.column_id, hooks=[CrashAfterPost(8)],
+                                    journal=journal)
+        first_run = api.counts.copy()
+        api.reset()
+
+        resumed = ImportJournal(path)
+        # Следующие подзадача и задача уже в очереди: намерение записано, запрос не ушёл
+        assert resumed.pending == {"2/0", "2/1", "1"}
+        report = create_tasks_in_yougile(TASKS, api.board_id, api.column_id, journal=resumed)
+
+    tasks = api.state.list("tasks", {})
+    assert report.ok == len(TASKS)
+    assert first_run["POST tasks"] + api.counts["POST tasks"] == 15
+    # Поиск - только для оборванных созданий, связывание - только для не связанных задач
+    assert api.counts["GET task-list"] == 3
+    assert api.counts["PUT tasks/{id}"] == 3
+    assert sorted(t["title"] for t in tasks) == sorted(
+        [t["title"] for t in TASKS] + [s["title"] for t in TASKS for s in t["subtasks"]])
+    assert all(len(t["subtasks"]) == 2 for t in tasks if t.get("columnId"))
+    assert api.state.board_order(api.column_id) == [t["title"] for t in TASKS]
+    assert ImportJournal(path).finished
+
+
+def test_resume_with_duplicate_titles(api, tmp_path):
+    """Тест: оборванная задача с повторяющимся названием не подменяется другой задачей колонки"""
+    tasks = [{"title": title, "description": "", "subtasks": [{"title": "Шаг", "description": ""}]}
+             for title in ("Дубль", "Другая", "Дубль")]
+    # Задача с тем же названием от прошлого импорта
+    old = api.state.create("tasks", {"title": "Дубль", "columnId": api.column_id, "timestamp": 1_600_000_000_000})
+    path = str(tmp_path / "tasks.md.journal")
+    journal = ImportJournal(path)
+    journal.start(fingerprint=tasks_fingerprint(tasks), board_id=api.board_id, column_id=api.column_id)
+
+    with patch("import_tasks.YougileClient", lambda: make_client(concurrency=1)):
+        # 5-й POST - задача 0 (создаются с конца): до сервера не дошёл
+        with pytest.raises(KeyboardInterrupt):
+            create_tasks_in_yougile(tasks, api.board_id, api.column_id, hooks=[CrashBeforePost(5)],
+                                    journal=journal)
+        api.reset()
+        resumed = ImportJournal(path)
+        assert resumed.pending == {"0"}
+        report = create_tasks_in_yougile(tasks, api.board_id, api.column_id, journal=resumed)
+
+    created = ImportJournal(path).created
+    assert report.ok == len(tasks)
+    # Ни другая «Дубль» из файла, ни старая задача не выданы за оборванную - она создана
+    assert api.counts["POST tasks"] == 2
+    assert len(set(created.values())) == len(created) == 6
+    assert old["id"] not in created.values()
+    assert api.state.items["tasks"][old["id"]]["subtasks"] == []
+    assert api.state.board_order(api.column_id) == ["Дубль", "Другая", "Дубль", "Дубль"]
+
+
+def test_resume_parallel_import(api, tmp_path):
+    """Тест: --parallel после сбоя - перенесённые задачи не переносятся снова, порядок сохранён"""
+    path = str(tmp_path / "tasks.md.journal")
+    journal = ImportJournal(path)
+    journal.start(fingerprint=tasks_fingerprint(TASKS), board_id=api.board_id, column_id=api.column_id,
+                  parallel=True)
+
+    with patch("import_tasks.YougileClient", lambda: make_client(concurrency=1)):
+        with pytest.raises(KeyboardInterrupt):
+            create_tasks_in_yougile(TASKS, api.board_id, api.column_id, hooks=[CrashAfterPost(8)],
+                                    journal=journal, parallel=True)
+        placed = ImportJournal(path).placed
+        api.reset()
+
+        report = create_tasks_in_yougile(TASKS, api.board_id, api.column_id, journal=ImportJournal(path),
+                                         parallel=True)
+
+    assert placed and report.ok == len(TASKS)
+    assert api.counts["PUT tasks/{id}"] == len(TASKS) - len(placed)
+    assert len(api.state.list("tasks", {})) == len(TASKS) * 3
+    assert api.state.board_order(api.column_id) == [t["title"] for t in TASKS]
+
+
+def test_sync_creates_and_updates_only_changes(api):
+    """Тест: импорт по разнице - новые задачи создаются, изменённые обновляются, остальные не трогаются"""
+    with patch("import_tasks.YougileClient", make_client):
+        create_tasks_in_yougile(TASKS, api.board_id, api.column_id)
+        edited = [dict(t) for t in TASKS]
+        edited[1] = dict(edited[1], description="Новое описание")
+        edited[3] = dict(edited[3], subtasks=edited[3]["subtasks"] + [{"title": "Подзадача 3.2", "description": ""}])
+        edited.insert(0, {"title": "Задача новая", "description": "", "subtasks": []})
+        api.reset()
+
+        # Без журнала хэшей нет: подзадачи сравниваются с доской
+        changes = diff_import(make_client(), edited, api.column_id)
+        report = create_tasks_in_yougile(edited, api.board_id, api.column_id, changes=changes)
+
+    assert [c.action for c in changes] == [CREATE, UNCHANGED, UPDATE, UNCHANGED, UPDATE, UNCHANGED]
+    assert (report.ok, report.skipped) == (3, 3)
+    assert api.counts["POST tasks"] == 2
+    # Описание задачи 1, связь задачи 3 с новой подзадачей
+    assert api.counts["PUT tasks/{id}"] == 2
+    board = {t["title"]: t for t in api.state.list("tasks", {})}
+    assert len(board["Задача 3"]["subtasks"]) == 3
+    assert api.state.board_order(api.column_id)[0] == "Задача новая"
+
+
+def test_sync_skips_tasks_with_known_hash(api, tmp_path):
+    """Тест: задачи, не менявшиеся с импорта (хэш в журнале), не сравниваются по подзадачам"""
+    journal = ImportJournal(str(tmp_path / "tasks.md.journal"))
+    journal.start(board_id=api.board_id, column_id=api.column_id)
+    with patch("import_tasks.YougileClient", make_client):
+        create_tasks_in_yougile(TASKS, api.board_id, api.column_id, journal=journal)
+    known = ImportJournal(journal.path).hashes
+    edited = [dict(t) for t in TASKS]
+    edited[2] = dict(edited[2], description="Новое описание")
+    api.reset()
+
+    changes = diff_import(make_client(), edited, api.column_id, known)
+
+    assert [c.action for c in changes].count(UPDATE) == 1
+    assert changes[2].description and not changes[2].changed_subtasks
+    # Подзадачи запрошены только у изменённой задачи
+    assert api.counts["GET tasks/{id}"] == 2
+    assert content_hash(edited[2]) != known[changes[2].board_task["id"]]
@@ -0,0 +1,119 @@
+"""
+Тесты для статистики запросов клиента
+"""
+import gc
+import json
+import pytest
+import requests
+import responses
+from metrics import ClientMetrics, endpoint_template, percentile, dump_at_exit, _dump_registered
+from rate_limiter import TokenBucket
+from retry import RetryPolicy
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+TASK_ID = "0b4f0a7e-3c2d-4e5f-8a9b-1c2d3e4f5a6b"
+
+
+@pytest.fixture
+def client():
+    return YougileClient(api_key="test-key",
+                         retry_policy=RetryPolicy(max_attempts=3, jitter=False, sleep=lambda s: None))
+
+
+def test_endpoint_template():
+    """Тест: идентификаторы в пути заменяются на {id}"""
+    assert endpoint_template(f"tasks/{TASK_ID}") == "tasks/{id}"
+    assert endpoint_template(f"/tasks/{TASK_ID}/chat-subscribers") == "tasks/{id}/chat-subscribers"
+    assert endpoint_template("task-list") == "task-list"
+
+
+def test_percentile():
+    """Тест перцентилей по ближайшему рангу"""
+    values = [float(i) for i in range(1, 101)]
+    assert percentile(values, 0.50) == 50.0
+    assert percentile(values, 0.95) == 95.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+@responses.activate
+def test_stats_per_endpoint_template(client):
+    """Тест: запросы группируются по шаблону, учитываются статусы, байты и повторы"""
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/{TASK_ID}", json={"error": "busy"}, status=503)
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/{TASK_ID}", json={"id": TASK_ID}, status=200)
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": TASK_ID}, status=201)
+
+    client.get_task(TASK_ID)
+    client.create_task("Задача", "col-1")
+
+    stats = client.stats()
+    get = stats["GET tasks/{id}"]
+    assert get["count"] == 2
+    assert get["statuses"] == {"200": 1, "503": 1}
+    assert get["retries"] == 1
+    assert get["bytes_received"] > 0
+    assert stats["POST tasks"]["bytes_sent"] == len(responses.calls[2].request.body)
+    assert set(get["latency_seconds"]) == {"total", "p50", "p95", "p99", "max"}
+
+
+@responses.activate
+def test_transport_errors_counted(client):
+    """Тест: ошибки сети учитываются со статусом error"""
+    responses.add(responses.GET, f"{API_BASE_URL}/users",
+                  body=requests.exceptions.ConnectionError("refused"))
+    responses.add(responses.GET, f"{API_BASE_URL}/users", json=[], status=200)
+
+    client.get_users()
+
+    assert client.stats()["GET users"]["statuses"] == {"200": 1, "error": 1}
+
+
+@responses.activate
+def test_limiter_wait_recorded():
+    """Тест: время ожидания ограничителя частоты попадает в статистику"""
+    clock = [0.0]
+    limiter = TokenBucket(rate=1, period=10, clock=lambda: clock[0],
+                          sleep=lambda s: clock.__setitem__(0, clock[0] + s))
+    client = YougileClient(api_key="test-key", rate_limiter=limiter)
+    responses.add(responses.GET, f"{API_BASE_URL}/projects/{TASK_ID}", json={"id": TASK_ID}, status=200)
+
+    client.get_project(TASK_ID)
+    client.get_project(TASK_ID)
+
+    assert client.stats()["GET projects/{id}"]["limiter_wait_seconds"] == pytest.approx(10.0)
+
+
+def test_prometheus_format():
+    """Тест: выгрузка в формате Prometheus"""
+    metrics = ClientMetrics()
+    metrics.record("GET", "task-list", 200, 0.3, bytes_received=100)
+    metrics.record("GET", "task-list", 200, 12.0, bytes_received=100)
+
+    text = metrics.to_prometheus()
+
+    assert 'yougile_requests_total{method="GET",endpoint="task-list",status="200"} 2' in text
+    assert 'yougile_request_duration_seconds_bucket{method="GET",endpoint="task-list",le="0.5"} 1' in text
+    assert 'yougile_request_duration_seconds_bucket{method="GET",endpoint="task-list",le="+Inf"} 2' in text
+    assert 'yougile_response_bytes_total{method="GET",endpoint="task-list"} 200' in text
+
+
+def test_dump_at_exit_merges_clients(tmp_path, monkeypatch):
+    """Тест: при выходе статистика всех клиентов записывается в один файл"""
+    monkeypatch.setattr("metrics._registered", [])
+    monkeypatch.setattr("metrics._exit_path", None)
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    path = tmp_path / "stats.json"
+    first, second = ClientMetrics(), ClientMetrics()
+    first.record("GET", "users", 200, 0.1)
+    second.record("GET", "users", 200, 0.2)
+
+    dump_at_exit(first, str(path))
+    dump_at_exit(second, str(path))
+    dump_at_exit(second, str(path))
+    # Клиент, удалённый до выхода, тоже попадает в файл
+    del first, second
+    gc.collect()
+    _dump_registered()
+
+    assert json.loads(path.read_text(encoding="utf-8"))["GET users"]["count"] == 2
@@ -0,0 +1,113 @@
+"""
+Тесты для компактных моделей и проекции полей задач
+"""
+import random
+import tracemalloc
+import pytest
+import responses
+from benchmarks.bench_json import make_task
+from models import Board, Column, Task, User
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+@pytest.fixture
+def client():
+    return YougileClient(api_key="test-key", page_size=50)
+
+
+def task_page(tasks):
+    return {"paging": {"count": len(tasks), "limit": 50, "offset": 0, "next": False}, "content": tasks}
+
+
+def test_models_use_slots():
+    """Тест: у моделей нет __dict__"""
+    for model in (Task("t1"), Column("c1"), Board("b1"), User("u1")):
+        assert not hasattr(model, "__dict__")
+
+
+def test_from_api_keeps_only_requested_fields():
+    """Тест: в модели остаются только запрошенные поля"""
+    data = {"id": "t1", "title": "Задача", "columnId": "c1", "completed": True,
+            "description": "<p>Описание</p>", "subtasks": ["s1", "s2"]}
+
+    task = Task.from_api(data, ("title",))
+
+    assert task.id == "t1"
+    assert task.title == "Задача"
+    assert task.column_id is None
+    assert task.completed is False
+    assert task.subtasks == ()
+
+
+def test_description_loaded_lazily():
+    """Тест: описание загружается при первом обращении и запоминается"""
+    calls = []
+
+    def loader(task_id):
+        calls.append(task_id)
+        return {"id": task_id, "description": "<p>Полное описание</p>"}
+
+    task = Task.from_api({"id": "t1", "title": "Задача"}, ("title",), loader=loader)
+
+    assert task.description == "<p>Полное описание</p>"
+    assert task.description == "<p>Полное описание</p>"
+    assert calls == ["t1"]
+
+
+def test_requested_description_is_kept():
+    """Тест: запрошенное описание хранится и не загружается повторно"""
+    task = Task.from_api({"id": "t1", "description": "<p>Текст</p>"}, ("description",),
+                         loader=lambda task_id: pytest.fail("лишний запрос"))
+
+    assert task.description == "<p>Текст</p>"
+
+
+def test_unknown_field_rejected():
+    """Тест: опечатка в имени поля - ошибка, а не пустые значения"""
+    with pytest.raises(ValueError):
+        Task.check_fields(["title", "colummId"])
+
+
+@responses.activate
+def test_get_tasks_with_fields(client):
+    """Тест: get_tasks(fields=...) возвращает модели, описание подгружается через API"""
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list",
+                  json=task_page([{"id": "t1", "title": "A", "columnId": "c1", "description": "x" * 1000}]),
+                  status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/t1",
+                  json={"id": "t1", "description": "<p>Описание</p>"}, status=200)
+
+    tasks = client.get_tasks(fields=["title", "columnId"])
+
+    assert tasks == [Task("t1", title="A", column_id="c1")]
+    assert tasks[0].description == "<p>Описание</p>"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_iter_tasks_with_fields(client):
+    """Тест: iter_tasks(fields=...) тоже отдаёт компактные модели"""
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list",
+                  json=task_page([{"id": "t1", "title": "A"}, {"id": "t2", "title": "B"}]), status=200)
+
+    assert [t.title for t in client.iter_tasks(fields=["title"])] == ["A", "B"]
+
+
+def test_projection_cuts_memory_by_order_of_magnitude():
+    """Тест: проекция id/title/columnId занимает на порядок меньше памяти, чем словари API"""
+    fields = Task.check_fields(["title", "columnId"])
+
+    def measure(build):
+        tracemalloc.start()
+        try:
+            items = build()  # noqa: F841 - должен жить до замера
+            return tracemalloc.get_traced_memory()[0]
+        finally:
+            tracemalloc.stop()
+
+    # Словари API освобождаются сразу после разбора, в памяти остаются только модели
+    full = measure(lambda: [make_task(i, random.Random(i)) for i in range(2000)])
+    compact = measure(lambda: [Task.from_api(make_task(i, random.Random(i)), fields) for i in range(2000)])
+
+    assert compact * 10 < full
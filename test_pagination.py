@@ -0,0 +1,246 @@
+"""
+Тесты для постраничного обхода списков
+"""
+import time
+import pytest
+import requests
+import responses
+from exceptions import NotFound, TransportError
+from pagination import MAX_PAGE_SIZE, PageSizeTuner, Paginator, merge_pages, paging_total
+from rate_limiter import TokenBucket
+from retry import NO_RETRY, RetryPolicy
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+@pytest.fixture
+def client():
+    return YougileClient(api_key="test-key", retry_policy=NO_RETRY)
+
+
+def page(ids, offset, limit, next_page):
+    return {
+        "paging": {"count": len(ids), "limit": limit, "offset": offset, "next": next_page},
+        "content": [{"id": item_id} for item_id in ids]
+    }
+
+
+def query(limit, offset, **extra):
+    params = {"limit": str(limit), "offset": str(offset)}
+    params.update(extra)
+    return [responses.matchers.query_param_matcher(params)]
+
+
+@responses.activate
+def test_list_endpoints_start_with_max_page_size(client):
+    """Тест: списки запрашиваются страницами максимального размера"""
+    responses.add(responses.GET, f"{API_BASE_URL}/projects", match=query(MAX_PAGE_SIZE, 0),
+                  json=page(["p1", "p2"], 0, MAX_PAGE_SIZE, False), status=200)
+
+    assert [p["id"] for p in client.get_projects()] == ["p1", "p2"]
+
+
+@responses.activate
+def test_list_endpoints_follow_next_pages():
+    """Тест: get_columns больше не обрезает список первой страницей"""
+    client = YougileClient(api_key="test-key", page_size=2)
+    responses.add(responses.GET, f"{API_BASE_URL}/columns", match=query(2, 0),
+                  json=page(["c1", "c2"], 0, 2, True), status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/columns", match=query(2, 2),
+                  json=page(["c3"], 2, 2, False), status=200)
+
+    assert [c["id"] for c in client.get_columns()] == ["c1", "c2", "c3"]
+
+
+@responses.activate
+def test_page_split_on_payload_error():
+    """Тест: страница, отклонённая по объёму (413), запрашивается половинами"""
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY, page_size=40)
+    first_half = [f"t{i}" for i in range(20)]
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(40, 0),
+                  status=413, body="Payload Too Large")
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(20, 0),
+                  json=page(first_half, 0, 20, True), status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(20, 20),
+                  json=page(["t20"], 20, 20, False), status=200)
+
+    tasks = client.get_tasks()
+
+    assert [t["id"] for t in tasks] == first_half + ["t20"]
+    # Следующие обходы сразу начинают с уменьшенной страницы
+    assert client.paginator.tuner.page_size("task-list") == 20
+
+
+@responses.activate
+def test_capped_pages_are_not_skipped(client):
+    """Тест: сервер вернул страницу меньше запрошенной - следующая начинается сразу за ней"""
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 0),
+                  json=page(["t1", "t2"], 0, 2, True), status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 2),
+                  json=page(["t3", "t4"], 2, 2, True), status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 4),
+                  json=page(["t5"], 4, 2, False), status=200)
+
+    expected = ["t1", "t2", "t3", "t4", "t5"]
+    assert [t["id"] for t in client.get_tasks()] == expected
+    assert [t["id"] for t in client.iter_tasks()] == expected
+
+
+@responses.activate
+def test_capped_pages_fetched_concurrently_by_total(client):
+    """Тест: смещения одновременных запросов - по размеру страницы, которую вернул сервер"""
+    first = page(["t1", "t2"], 0, 2, True)
+    first["paging"]["total"] = 5
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 0),
+                  json=first, status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 2),
+                  json=page(["t3", "t4"], 2, 2, True), status=200)
+    responses.add(responses.GET, f"{API_BASE_URL}/task-list", match=query(MAX_PAGE_SIZE, 4),
+                  json=page(["t5"], 4, 2, False), status=200)
+
+    assert [t["id"] for t in client.get_tasks()] == ["t1", "t2", "t3", "t4", "t5"]
+
+
+@responses.activate
+def test_page_split_on_timeout():
+    """Тест: после таймаута размер страницы уменьшается"""
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY, page_size=20)
+    responses.add(responses.GET, f"{API_BASE_URL}/users", match=query(20, 0),
+                  body=requests.exceptions.ReadTimeout("timed out"))
+    responses.add(responses.GET, f"{API_BASE_URL}/users", match=query(10, 0),
+                  json=page(["u1"], 0, 10, False), status=200)
+
+    assert [u["id"] for u in client.get_users()] == ["u1"]
+
+
+@responses.activate
+def test_page_split_without_retrying_timeout():
+    """Тест: таймаут большой страницы не повторяется с тем же размером - страница сразу делится"""
+    sleeps = []
+    client = YougileClient(api_key="test-key", retry_policy=RetryPolicy(max_attempts=4, sleep=sleeps.append),
+                           page_size=20)
+    responses.add(responses.GET, f"{API_BASE_URL}/users", match=query(20, 0),
+                  body=requests.exceptions.ReadTimeout("timed out"))
+    responses.add(responses.GET, f"{API_BASE_URL}/users", match=query(10, 0),
+                  json=page(["u1"], 0, 10, False), status=200)
+
+    assert [u["id"] for u in client.get_users()] == ["u1"]
+    assert len(responses.calls) == 2
+    assert sleeps == []
+
+
+class SlowLimiter(TokenBucket):
+    """Каждый токен выдаётся через 0.1 с (клиент упёрся в лимит)"""
+
+    def acquire(self) -> float:
+        time.sleep(0.1)
+        return 0.1
+
+
+@responses.activate
+def test_limiter_wait_does_not_shrink_pages(tmp_path):
+    """Тест: ожидание ограничителя не считается медленной страницей - сохранённый размер не уменьшается"""
+    path = str(tmp_path / "paging.json")
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY, rate_limiter=SlowLimiter(10 ** 6, 1))
+    client.paginator.tuner = PageSizeTuner(path, slow_seconds=0.05)
+    responses.add(responses.GET, f"{API_BASE_URL}/projects", match=query(MAX_PAGE_SIZE, 0),
+                  json=page(["p1"], 0, MAX_PAGE_SIZE, False), status=200)
+
+    for _ in range(3):
+        client.get_projects()
+
+    restored = PageSizeTuner(path)
+    assert restored.page_size("projects") == MAX_PAGE_SIZE
+    assert restored.latency("projects")[MAX_PAGE_SIZE] < 0.05
+
+
+@responses.activate
+def test_no_split_below_min_size():
+    """Тест: страница минимального размера не делится, ошибка пробрасывается"""
+    client = YougileClient(api_key="test-key", retry_policy=NO_RETRY, page_size=10)
+    responses.add(responses.GET, f"{API_BASE_URL}/users",
+                  body=requests.exceptions.ReadTimeout("timed out"))
+
+    with pytest.raises(TransportError):
+        client.get_users()
+
+
+@responses.activate
+def test_other_errors_are_not_split(client):
+    """Тест: ошибки, не связанные с объёмом, не приводят к делению страницы"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards", status=404, json={"error": "Not Found"})
+
+    with pytest.raises(NotFound):
+        client.get_boards()
+
+    assert len(responses.calls) == 1
+
+
+def test_tuner_shrinks_after_slow_pages():
+    """Тест: медленные страницы уменьшают размер для следующих обходов"""
+    tuner = PageSizeTuner(max_size=1000, slow_seconds=5)
+
+    tuner.record("task-list", 1000, 2.0)
+    assert tuner.page_size("task-list") == 1000
+
+    tuner.record("task-list", 1000, 30.0)
+    assert tuner.page_size("task-list") == 500
+    assert tuner.latency("task-list")[1000] > 5
+
+
+def test_tuner_persists_state(tmp_path):
+    """Тест: подобранный размер страницы сохраняется между запусками"""
+    path = tmp_path / "paging.json"
+    tuner = PageSizeTuner(str(path), max_size=1000)
+    tuner.record("columns", 1000, 0.4)
+    tuner.shrink("task-list", 1000)
+    tuner.save()
+
+    restored = PageSizeTuner(str(path), max_size=1000)
+
+    assert restored.page_size("task-list") == 500
+    assert restored.page_size("columns") == 1000
+    assert restored.latency("columns") == {1000: 0.4}
+
+
+def test_tuner_ignores_corrupted_file(tmp_path):
+    """Тест: повреждённый файл состояния не ломает клиента"""
+    path = tmp_path / "paging.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    assert PageSizeTuner(str(path)).page_size("task-list") == MAX_PAGE_SIZE
+
+
+def test_paginator_iterate_stops_early():
+    """Тест: iterate не запрашивает следующие страницы без необходимости"""
+    calls = []
+
+    def get(endpoint, params=None):
+        calls.append(params["offset"])
+        return page([f"t{params['offset']}"], params["offset"], params["limit"], True)
+
+    paginator = Paginator(get, lambda func, items: [func(i) for i in items], PageSizeTuner(max_size=1))
+
+    iterator = paginator.iterate("task-list")
+    assert next(iterator)["id"] == "t0"
+    assert calls == [0]
+
+
+def test_paginator_iterate_drops_overlap_with_previous_page():
+    """Тест: элемент, сдвинувшийся на следующую страницу, не повторяется; помнится только прошлая страница"""
+    pages = {0: page(["t0", "t1"], 0, 2, True), 2: page(["t1", "t2"], 2, 2, True),
+             4: page(["t3", "t4"], 4, 2, True), 6: page(["t0"], 6, 2, False)}
+    paginator = Paginator(lambda endpoint, params=None: pages[params["offset"]],
+                          lambda func, items: [func(i) for i in items], PageSizeTuner(max_size=2))
+
+    # Повтор дальше соседней страницы не отслеживается: множество id не растёт с длиной списка
+    assert [t["id"] for t in paginator.iterate("task-list")] == ["t0", "t1", "t2", "t3", "t4", "t0"]
+
+
+def test_paging_total_and_merge():
+    """Тест вспомогательных функций"""
+    assert paging_total({"paging": {"total": 5}, "content": []}) == 5
+    assert paging_total({"paging": {"count": 2, "offset": 0}, "content": [{}, {}]}) is None
+    assert paging_total({"paging": {"count": 10, "offset": 0}, "content": [{}, {}]}) == 10
+    assert merge_pages([[{"id": 1}, {"id": 2}], [{"id": 2}, {"id": 3}]]) == [
+        {"id": 1}, {"id": 2}, {"id": 3}]
@@ -0,0 +1,111 @@
+"""
+Тесты для оценки стоимости массовых операций
+"""
+import pytest
+from unittest.mock import Mock, patch
+from planner import (Plan, Step, format_duration, format_plan, plan_clear_board, plan_import,
+                     plan_sync, plan_update_descriptions, simulate)
+from clear_board import clear_board
+from entity_index import EntityIndex
+from import_tasks import TaskChange, CREATE, UPDATE, UNCHANGED
+
+TASKS = [{"title": f"Задача {i}", "description": "Описание",
+          "subtasks": [{"title": f"Подзадача {i}.{j}", "description": "Текст"} for j in range(3)]}
+         for i in range(10)]
+
+
+def test_plan_import_counts():
+    """Тест: задача + подзадачи - POST, связывание - PUT, поиск колонки - GET"""
+    plan = plan_import(TASKS)
+
+    assert plan.calls_by_endpoint() == {"GET columns": 1, "POST tasks": 40, "PUT tasks/{id}": 10}
+    assert plan.total_calls == 51
+
+
+def test_plan_import_parallel():
+    """Тест: --parallel - столько же запросов, но по очереди только перенос в колонку"""
+    sequential, parallel = plan_import(TASKS), plan_import(TASKS, parallel=True)
+
+    assert parallel.calls_by_endpoint() == sequential.calls_by_endpoint()
+    assert [step.name for step in parallel.steps if not step.concurrent] == ["поиск колонки", "расстановка по порядку"]
+
+
+def test_plan_update_descriptions_counts():
+    """Тест: описания задач и подзадач, подзадачи запрашиваются по ID"""
+    plan = plan_update_descriptions(TASKS, board_columns=4)
+
+    assert plan.calls_by_endpoint() == {"GET columns": 1, "GET task-list": 4,
+                                        "GET tasks/{id}": 30, "PUT tasks/{id}": 40}
+
+
+def test_plan_sync_counts():
+    """Тест: по разнице - создание новых задач и PUT/POST только для изменений"""
+    changes = [TaskChange(0, TASKS[0], CREATE),
+               TaskChange(1, TASKS[1], UPDATE, {"id": "t1"}, description=True,
+                          subtask_ids=["s1", None, "s3"], changed_subtasks=[2]),
+               TaskChange(2, TASKS[2], UNCHANGED, {"id": "t2"})]
+
+    plan = plan_sync(changes)
+
+    # Задача 0: 1 + 3 POST и связка; задача 1: подзадача, описание, описание подзадачи, связка
+    assert plan.calls_by_endpoint() == {"POST tasks": 5, "PUT tasks/{id}": 4}
+    assert "без изменений 1" in plan.title
+
+
+def test_simulate_within_burst_is_latency_bound():
+    """Тест: в пределах всплеска время определяется задержкой ответа"""
+    plan = Plan("x", [Step("s", {"POST tasks": 10})])
+
+    estimate = simulate(plan, rate=50, period=60, concurrency=4, latency=0.5)
+
+    assert estimate.seconds == pytest.approx(5.0)
+    assert estimate.windows == [10]
+
+
+def test_simulate_rate_bound():
+    """Тест: сверх всплеска запросы идут с темпом лимита, по окнам периода"""
+    plan = Plan("x", [Step("s", {"PUT tasks/{id}": 150}, concurrent=True)])
+
+    estimate = simulate(plan, rate=50, period=60, concurrency=8, latency=0.0)
+
+    # 50 запросов сразу, остальные 100 - по одному в 1.2 с
+    assert estimate.seconds == pytest.approx(120.0)
+    assert estimate.windows == [99, 50, 1]
+
+
+def test_concurrency_helps_only_below_limit():
+    """Тест: параллельность ускоряет, пока не упирается в лимит"""
+    small = Plan("x", [Step("s", {"POST tasks": 40}, concurrent=True)])
+    large = Plan("x", [Step("s", {"POST tasks": 1000}, concurrent=True)])
+
+    assert simulate(small, concurrency=8, latency=0.3).seconds < simulate(small, concurrency=1, latency=0.3).seconds
+    assert simulate(large, concurrency=8, latency=0.3).seconds == pytest.approx(
+        simulate(large, concurrency=1, latency=0.3).seconds, rel=0.01)
+
+
+def test_format_plan():
+    """Тест: текст плана содержит запросы, время и окна лимита"""
+    text = format_plan(plan_clear_board(120), rate=50, period=60, concurrency=8, latency=0.3)
+
+    assert "PUT tasks/{id}" in text
+    assert "Всего запросов: 120" in text
+    assert "Окна лимита по 60с: 2" in text
+    assert format_duration(3725) == "1 ч 2 мин"
+
+
+@patch('clear_board.YougileClient')
+def test_clear_board_dry_run(mock_client_class, capsys):
+    """Тест: dry-run очистки доски показывает план и ничего не меняет"""
+    mock_client = Mock()
+    mock_client.concurrency = 2
+    mock_client.index = EntityIndex(mock_client)
+    mock_client_class.return_value = mock_client
+    mock_client.get_board.return_value = {"id": "board-1", "title": "Test Board"}
+    mock_client.get_columns.return_value = [{"id": "col-1", "boardId": "board-1"}]
+    mock_client.get_tasks.return_value = [{"id": f"t{i}", "columnId": "col-1"} for i in range(3)]
+
+    clear_board("board-1", confirm=False, dry_run=True)
+
+    assert "Всего запросов: 3" in capsys.readouterr().out
+    mock_client.update_task.assert_not_called()
+    mock_client.delete_task.assert_not_called()
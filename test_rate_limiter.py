@@ -0,0 +1,264 @@
+"""
+Тесты для ограничителя частоты запросов
+"""
+import multiprocessing
+import time
+import pytest
+import responses
+import rate_limiter
+from rate_limiter import TokenBucket, SharedRateLimiter, parse_retry_after, shared_rate_limiter
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+class FakeClock:
+    """Управляемые часы: sleep сдвигает время вместо ожидания"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def make_bucket(clock, **kwargs):
+    return TokenBucket(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_burst_without_waiting(clock):
+    """Тест: при свободном бюджете запросы уходят без ожидания"""
+    bucket = make_bucket(clock, rate=50, period=60)
+
+    for _ in range(50):
+        assert bucket.acquire() == 0
+
+    assert clock.sleeps == []
+
+
+def test_waits_when_budget_exhausted(clock):
+    """Тест: после исчерпания бюджета запрос ждёт окно"""
+    bucket = make_bucket(clock, rate=50, period=60)
+    for _ in range(50):
+        bucket.acquire()
+
+    waited = bucket.acquire()
+
+    # Скользящее окно: 51-й запрос не раньше, чем через 60 секунд после первого
+    assert waited == pytest.approx(60.0)
+    assert bucket.total_wait == pytest.approx(60.0)
+
+
+def test_small_burst_paces_at_rate(clock):
+    """Тест: после всплеска запросы идут с темпом rate/period"""
+    bucket = make_bucket(clock, rate=50, period=60, burst=2)
+    bucket.acquire()
+    bucket.acquire()
+
+    waited = bucket.acquire()
+
+    assert waited == pytest.approx(60 / 50)
+
+
+def test_never_exceeds_rate_in_any_window(clock):
+    """Тест: в любом окне длиной period не больше rate запросов"""
+    bucket = make_bucket(clock, rate=10, period=60)
+    stamps = []
+    for _ in range(35):
+        bucket.acquire()
+        stamps.append(clock.now)
+
+    for i, start in enumerate(stamps):
+        in_window = [t for t in stamps[i:] if t < start + 60]
+        assert len(in_window) <= 10
+
+
+def test_try_acquire(clock):
+    """Тест неблокирующего взятия токена"""
+    bucket = make_bucket(clock, rate=1, period=60)
+
+    assert bucket.try_acquire() is True
+    assert bucket.try_acquire() is False
+
+
+def test_retry_after_pauses_bucket(clock):
+    """Тест: Retry-After блокирует запросы на указанное время"""
+    bucket = make_bucket(clock, rate=50, period=60)
+
+    bucket.update_from_headers({"Retry-After": "7"}, 429)
+
+    assert bucket.acquire() == pytest.approx(7.0)
+
+
+def test_remaining_header_limits_tokens(clock):
+    """Тест: X-RateLimit-Remaining урезает локальный бюджет"""
+    bucket = make_bucket(clock, rate=50, period=60)
+
+    bucket.update_from_headers({"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "12"}, 200)
+
+    assert bucket.try_acquire() is False
+    assert bucket.acquire() == pytest.approx(12.0)
+
+
+def test_429_without_headers_drains_bucket(clock):
+    """Тест: 429 без заголовков обнуляет бакет"""
+    bucket = make_bucket(clock, rate=50, period=60)
+
+    bucket.update_from_headers({"Content-Type": "application/json"}, 429)
+
+    assert bucket.acquire() == pytest.approx(60 / 50)
+
+
+def test_parse_retry_after():
+    """Тест разбора Retry-After в секундах и в виде HTTP-даты"""
+    assert parse_retry_after("5") == 5.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480) == pytest.approx(10.0)
+
+
+def test_invalid_rate():
+    """Тест валидации параметров"""
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+
+
+@responses.activate
+def test_client_uses_rate_limiter(clock):
+    """Тест: клиент берёт токен на каждый запрос и читает заголовки"""
+    bucket = make_bucket(clock, rate=50, period=60)
+    client = YougileClient(api_key="test-key", rate_limiter=bucket)
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/boards",
+        json=[],
+        headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"},
+        status=200
+    )
+
+    client.get_boards()
+
+    assert bucket.try_acquire() is False
+
+
+def make_shared(clock, path, key="test-key", **kwargs):
+    return SharedRateLimiter(str(path), key, clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_shared_limiter_splits_budget(clock, tmp_path):
+    """Тест: процессы с одним ключом делят бюджет, с другим - независимы"""
+    first = make_shared(clock, tmp_path / "limits.db", rate=5, period=60)
+    second = make_shared(clock, tmp_path / "limits.db", rate=5, period=60)
+    other = make_shared(clock, tmp_path / "limits.db", key="other-key", rate=5, period=60)
+
+    assert [first.try_acquire() for _ in range(3)] == [True] * 3
+    assert [second.try_acquire() for _ in range(2)] == [True] * 2
+    assert first.try_acquire() is False
+    assert second.try_acquire() is False
+    assert other.try_acquire() is True
+
+
+def test_shared_limiter_pause_applies_to_all(clock, tmp_path):
+    """Тест: Retry-After, полученный одним процессом, останавливает и остальных"""
+    first = make_shared(clock, tmp_path / "limits.db")
+    second = make_shared(clock, tmp_path / "limits.db")
+
+    first.update_from_headers({"Retry-After": "30"}, 429)
+
+    assert second.try_acquire() is False
+    assert second.acquire() == pytest.approx(30.0)
+
+
+def test_shared_limiter_queue_order(clock, tmp_path):
+    """Тест: очередь - по приоритету, затем процесс, дольше всех не получавший токен"""
+    busy = make_shared(clock, tmp_path / "limits.db", client_id="busy")
+    idle = make_shared(clock, tmp_path / "limits.db", client_id="idle")
+    urgent = make_shared(clock, tmp_path / "limits.db", client_id="urgent", priority=1)
+    assert busy.try_acquire()
+
+    def wait_in_queue(limiter, waiter, since):
+        limiter._db.execute("INSERT INTO waiters VALUES (?, ?, ?, ?, ?, ?)",
+                            (waiter, limiter.key, limiter.client_id, limiter.priority, since, clock.now))
+
+    wait_in_queue(busy, "busy-1", clock.now - 5)
+    wait_in_queue(idle, "idle-1", clock.now)
+    with busy._state() as db:
+        assert busy._next_waiter(db) == "idle-1"
+
+    wait_in_queue(urgent, "urgent-1", clock.now)
+    with busy._state() as db:
+        assert busy._next_waiter(db) == "urgent-1"
+    # Пока ждёт более приоритетный, токен без очереди не выдаётся
+    assert idle.try_acquire() is False
+
+
+def test_clients_of_one_process_share_limiter(tmp_path, monkeypatch):
+    """Тест: клиенты процесса делят один ограничитель - одно соединение, один участник очереди"""
+    monkeypatch.setattr("rate_limiter._shared", {})
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    monkeypatch.setattr("yougile_client.RATE_LIMIT_STATE", str(tmp_path / "limits.db"))
+
+    first, second = YougileClient(api_key="test-key"), YougileClient(api_key="test-key")
+    other = YougileClient(api_key="other-key")
+
+    assert isinstance(first.rate_limiter, SharedRateLimiter)
+    assert first.rate_limiter is second.rate_limiter
+    assert other.rate_limiter is not first.rate_limiter
+    assert other.rate_limiter.client_id == first.rate_limiter.client_id
+    rate_limiter._close_shared()
+
+
+def test_shared_limiter_rejects_other_settings(tmp_path, monkeypatch):
+    """Тест: тот же ключ с другим лимитом или приоритетом - ошибка, а не молча чужие настройки"""
+    monkeypatch.setattr("rate_limiter._shared", {})
+    monkeypatch.setattr("atexit.register", lambda func: None)
+    path = str(tmp_path / "limits.db")
+
+    limiter = shared_rate_limiter(path, "test-key", rate=50, period=60)
+
+    assert shared_rate_limiter(path, "test-key", rate=50, period=60.0) is limiter
+    with pytest.raises(ValueError):
+        shared_rate_limiter(path, "test-key", rate=10, period=60)
+    with pytest.raises(ValueError):
+        shared_rate_limiter(path, "test-key", rate=50, period=1)
+    with pytest.raises(ValueError):
+        shared_rate_limiter(path, "test-key", rate=50, period=60, priority=5)
+    rate_limiter._close_shared()
+
+
+def _acquire_in_process(path, count, results):
+    limiter = SharedRateLimiter(path, "test-key", rate=4, period=0.5, poll_interval=0.01)
+    times = []
+    for _ in range(count):
+        limiter.acquire()
+        times.append(time.time())
+    results.put(times)
+
+
+def test_shared_limiter_across_processes(tmp_path):
+    """Тест: два процесса вместе не превышают лимит в любом окне"""
+    path = str(tmp_path / "limits.db")
+    SharedRateLimiter(path, "test-key").close()
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_acquire_in_process, args=(path, 6, results))
+                 for _ in range(2)]
+    for process in processes:
+        process.start()
+    times = sorted(results.get(timeout=30) + results.get(timeout=30))
+    for process in processes:
+        process.join(10)
+
+    assert len(times) == 12
+    # 4 запроса за 0.5 с: 12 запросов занимают не меньше 1 с
+    assert times[-1] - times[0] >= 1.0 - 0.05
+    for i in range(len(times) - 4):
+        assert times[i + 4] - times[i] >= 0.5 - 0.05
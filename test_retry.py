@@ -0,0 +1,159 @@
+"""
+Тесты для повторных запросов и типизированных ошибок
+"""
+import pytest
+import requests
+import responses
+from exceptions import APIError, NotFound, RateLimited, ServerError, TransportError, YougileError
+from retry import RetryPolicy
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+@pytest.fixture
+def sleeps():
+    return []
+
+
+@pytest.fixture
+def client(sleeps):
+    """Клиент без реальных пауз"""
+    policy = RetryPolicy(max_attempts=3, backoff_base=1.0, jitter=False, sleep=sleeps.append)
+    return YougileClient(api_key="test-key", retry_policy=policy)
+
+
+@responses.activate
+def test_get_retried_on_server_error(client, sleeps):
+    """Тест: GET повторяется после 502"""
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/board-1", status=502, body="Bad Gateway")
+    responses.add(responses.GET, f"{API_BASE_URL}/boards/board-1", json={"id": "board-1"}, status=200)
+
+    board = client.get_board("board-1")
+
+    assert board["id"] == "board-1"
+    assert len(responses.calls) == 2
+    assert sleeps == [1.0]
+
+
+@responses.activate
+def test_exponential_backoff(client, sleeps):
+    """Тест: задержка растёт экспоненциально, после max_attempts - исключение"""
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/task-1", status=503, body="Unavailable")
+
+    with pytest.raises(ServerError) as exc_info:
+        client.update_task("task-1", archived=True)
+
+    assert exc_info.value.status_code == 503
+    assert len(responses.calls) == 3
+    assert sleeps == [1.0, 2.0]
+
+
+@responses.activate
+def test_rate_limited_honors_retry_after(client, sleeps):
+    """Тест: при 429 с Retry-After пауза берётся из заголовка через ограничитель"""
+    responses.add(responses.GET, f"{API_BASE_URL}/columns", status=429,
+                  json={"error": "Too Many Requests"}, headers={"Retry-After": "0"})
+    responses.add(responses.GET, f"{API_BASE_URL}/columns", json=[], status=200)
+
+    assert client.get_columns() == []
+    assert len(responses.calls) == 2
+    # Ожидание обеспечивает ограничитель, backoff не добавляется
+    assert sleeps == [0.0]
+
+
+@responses.activate
+def test_post_retried_on_rate_limit(client):
+    """Тест: POST повторяется при 429 - запрос не был выполнен"""
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", status=429, headers={"Retry-After": "0"})
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": "task-1"}, status=201)
+
+    task = client.create_task("Task", "col-1")
+
+    assert task["id"] == "task-1"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_post_not_retried_on_server_error_without_guard(client):
+    """Тест: POST без retry_guard не повторяется при 5xx (мог быть выполнен)"""
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", status=502, body="Bad Gateway")
+
+    with pytest.raises(ServerError):
+        client.create_task("Task", "col-1")
+
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_post_guard_returns_existing_object(client):
+    """Тест: retry_guard находит объект, созданный неудачной попыткой"""
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", status=504, body="Gateway Timeout")
+
+    task = client.create_task("Task", "col-1", retry_guard=lambda: {"id": "existing"})
+
+    assert task["id"] == "existing"
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_post_guard_allows_retry(client):
+    """Тест: если retry_guard ничего не нашёл, POST повторяется"""
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", status=500, body="Error")
+    responses.add(responses.POST, f"{API_BASE_URL}/tasks", json={"id": "task-1"}, status=201)
+
+    task = client.create_task("Task", "col-1", retry_guard=lambda: None)
+
+    assert task["id"] == "task-1"
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_not_found_is_not_retried(client):
+    """Тест: 404 не повторяется и превращается в NotFound"""
+    responses.add(responses.GET, f"{API_BASE_URL}/tasks/missing", json={"error": "Not Found"}, status=404)
+
+    with pytest.raises(NotFound) as exc_info:
+        client.get_task("missing")
+
+    assert exc_info.value.error == "Not Found"
+    assert "HTTP ошибка: 404 - Not Found" in str(exc_info.value)
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_client_error_is_api_error(client):
+    """Тест: прочие 4xx - APIError без повторов"""
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/task-1", body="bad", status=400)
+
+    with pytest.raises(APIError) as exc_info:
+        client.update_task("task-1", title="")
+
+    assert not isinstance(exc_info.value, (NotFound, RateLimited, ServerError))
+    assert exc_info.value.status_code == 400
+
+
+@responses.activate
+def test_transport_error(client, sleeps):
+    """Тест: сетевые ошибки оборачиваются в TransportError"""
+    responses.add(responses.GET, f"{API_BASE_URL}/users",
+                  body=requests.exceptions.ConnectionError("connection reset"))
+
+    with pytest.raises(TransportError) as exc_info:
+        client.get_users()
+
+    assert isinstance(exc_info.value, YougileError)
+    assert len(responses.calls) == 3
+
+
+def test_backoff_with_jitter_is_bounded():
+    """Тест: jitter не выходит за пределы экспоненциальной задержки"""
+    policy = RetryPolicy(backoff_base=0.5, backoff_max=4.0)
+
+    for attempt in range(1, 10):
+        assert 0 <= policy.backoff(attempt) <= min(4.0, 0.5 * 2 ** (attempt - 1))
+
+
+def test_invalid_max_attempts():
+    """Тест валидации числа попыток"""
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
@@ -0,0 +1,112 @@
+"""
+Тесты для объединения одинаковых одновременных запросов
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import responses
+from singleflight import SingleFlight
+from yougile_client import YougileClient
+from config import API_BASE_URL
+
+
+def test_concurrent_calls_share_result():
+    """Тест: одновременные вызовы с одним ключом выполняются один раз"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return {"id": "col-1"}
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        leader = executor.submit(flight.do, "columns", slow)
+        started.wait(5)
+        followers = [executor.submit(flight.do, "columns", slow) for _ in range(3)]
+        while flight.coalesced < 3:
+            time.sleep(0.001)
+        release.set()
+        results = [leader.result()] + [f.result() for f in followers]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.in_flight() == 0
+
+
+def test_error_propagates_to_waiters():
+    """Тест: исключение первого вызова получают все ожидающие"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+
+    def failing():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        leader = executor.submit(flight.do, "key", failing)
+        started.wait(5)
+        follower = executor.submit(flight.do, "key", failing)
+        while flight.coalesced < 1:
+            time.sleep(0.001)
+        release.set()
+
+        with pytest.raises(RuntimeError):
+            leader.result()
+        with pytest.raises(RuntimeError):
+            follower.result()
+
+
+def test_sequential_calls_not_coalesced():
+    """Тест: последовательные вызовы выполняются заново"""
+    flight = SingleFlight()
+    calls = []
+
+    flight.do("key", lambda: calls.append(1))
+    flight.do("key", lambda: calls.append(1))
+
+    assert len(calls) == 2
+    assert flight.coalesced == 0
+
+
+@responses.activate
+def test_client_coalesces_identical_gets():
+    """Тест: клиент делает один сетевой вызов на одинаковые одновременные GET"""
+    client = YougileClient(api_key="test-key", concurrency=4)
+    barrier = threading.Barrier(4, timeout=5)
+
+    def callback(request):
+        # Держим запрос, пока остальные потоки не присоединятся к нему
+        while client._in_flight.coalesced < 3:
+            time.sleep(0.001)
+        return 200, {}, '{"id": "board-1"}'
+
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/boards/board-1", callback=callback)
+
+    def fetch():
+        barrier.wait()
+        return client.get_board("board-1")
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: fetch(), range(4)))
+
+    assert all(board["id"] == "board-1" for board in results)
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_client_does_not_coalesce_writes():
+    """Тест: записи никогда не объединяются"""
+    client = YougileClient(api_key="test-key")
+    responses.add(responses.PUT, f"{API_BASE_URL}/tasks/t1", json={"id": "t1"}, status=200)
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        list(executor.map(lambda _: client.update_task("t1", completed=True), range(2)))
+
+    assert len(responses.calls) == 2
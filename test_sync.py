@@ -0,0 +1,157 @@
+"""
+Тесты для локального зеркала SQLite
+"""
+import pytest
+from unittest.mock import Mock
+from exceptions import NotFound
+from sync import LocalMirror
+import tasks
+
+
+@pytest.fixture
+def api():
+    client = Mock()
+    client.api_key = "test-key"
+    client.get_projects.return_value = [{"id": "p1", "title": "Проект"}]
+    client.get_boards.return_value = [{"id": "b1", "title": "Доска", "projectId": "p1"},
+                                      {"id": "b2", "title": "Другая", "projectId": "p2"}]
+    client.get_columns.return_value = [{"id": "c1", "title": "To Do", "boardId": "b1"},
+                                       {"id": "c2", "title": "Done", "boardId": "b1"},
+                                       {"id": "c3", "title": "Backlog", "boardId": "b2"}]
+    client.get_users.return_value = [{"id": "u1", "realName": "Иван"}]
+    client.get_tasks.return_value = [{"id": "t1", "title": "Первая", "columnId": "c1"},
+                                     {"id": "t2", "title": "Вторая", "columnId": "c2"},
+                                     {"id": "t3", "title": "Третья", "columnId": "c3"}]
+    return client
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = LocalMirror(str(tmp_path / "mirror.db"))
+    yield mirror
+    mirror.close()
+
+
+def test_refresh_populates_mirror(mirror, api):
+    """Тест: первое обновление добавляет все сущности"""
+    summary = mirror.refresh(api)
+
+    assert summary["tasks"] == {"added": 3, "updated": 0, "removed": 0, "unchanged": 0, "skipped": 0}
+    assert [p["id"] for p in mirror.get_projects()] == ["p1"]
+    assert [b["id"] for b in mirror.get_boards(project_id="p1")] == ["b1"]
+    assert [c["id"] for c in mirror.get_columns(board_id="b1")] == ["c1", "c2"]
+    assert mirror.get_user("u1")["realName"] == "Иван"
+
+
+def test_second_refresh_writes_only_changes(mirror, api):
+    """Тест: повторное обновление записывает только изменившиеся строки и удаляет исчезнувшие"""
+    mirror.refresh(api)
+    api.get_tasks.return_value = [{"id": "t1", "title": "Первая", "columnId": "c1"},
+                                  {"id": "t2", "title": "Вторая (изм.)", "columnId": "c2"},
+                                  {"id": "t4", "title": "Новая", "columnId": "c1"}]
+
+    summary = mirror.refresh(api)
+
+    assert summary["tasks"] == {"added": 1, "updated": 1, "removed": 1, "unchanged": 1, "skipped": 0}
+    assert summary["projects"]["unchanged"] == 1
+    assert mirror.get_task("t2")["title"] == "Вторая (изм.)"
+    with pytest.raises(NotFound):
+        mirror.get_task("t3")
+
+
+def test_task_queries_use_board_and_column(mirror, api):
+    """Тест: задачи выбираются по доске, колонке и названию"""
+    mirror.refresh(api)
+
+    assert [t["id"] for t in mirror.get_tasks(board_id="b1")] == ["t1", "t2"]
+    assert [t["id"] for t in mirror.get_tasks(column_id=["c2", "c3"])] == ["t2", "t3"]
+    assert [t["id"] for t in mirror.get_tasks(title="Третья")] == ["t3"]
+    assert [t["id"] for t in mirror.get_tasks(reverse=True)] == ["t3", "t2", "t1"]
+    assert [t["id"] for t in mirror.iter_tasks(column_id="c1")] == ["t1"]
+    assert (mirror.count_tasks(), mirror.count_tasks(column_id="c2")) == (3, 1)
+
+
+def test_refresh_single_board(mirror, api):
+    """Тест: обновление задач одной доски не трогает остальные"""
+    mirror.refresh(api)
+    api.get_tasks.reset_mock()
+    api.get_tasks.return_value = [{"id": "t1", "title": "Первая", "columnId": "c1"}]
+
+    summary = mirror.refresh(api, resources=["tasks"], board_id="b1")
+
+    api.get_tasks.assert_called_once_with(column_id=["c1", "c2"])
+    assert summary["tasks"]["removed"] == 1
+    assert [t["id"] for t in mirror.get_tasks()] == ["t1", "t3"]
+
+
+def test_refresh_rereads_only_stale_columns(mirror, api):
+    """Тест: задачи перечитываются только у изменившихся колонок, недавно обновлённые пропускаются"""
+    mirror.refresh(api, max_age=3600)
+    api.get_columns.return_value = [{"id": "c1", "title": "To Do", "boardId": "b1"},
+                                    {"id": "c2", "title": "Done (изм.)", "boardId": "b1"},
+                                    {"id": "c3", "title": "Backlog", "boardId": "b2"}]
+    api.get_tasks.reset_mock()
+    api.get_tasks.return_value = [{"id": "t2", "title": "Вторая (изм.)", "columnId": "c2"}]
+
+    summary = mirror.refresh(api, max_age=3600)
+
+    api.get_tasks.assert_called_once_with(column_id=["c2"])
+    assert summary["tasks"] == {"added": 0, "updated": 1, "removed": 0, "unchanged": 0, "skipped": 2}
+    assert [t["title"] for t in mirror.get_tasks()] == ["Первая", "Вторая (изм.)", "Третья"]
+
+    # Без изменений колонок и в пределах max_age задачи не запрашиваются вовсе
+    api.get_tasks.reset_mock()
+    assert mirror.refresh(api, max_age=3600)["tasks"]["skipped"] == 3
+    api.get_tasks.assert_not_called()
+
+
+def test_tasks_only_refresh_fills_board(mirror, api):
+    """Тест: --only tasks на пустом зеркале подтягивает колонки - у задач есть boardId"""
+    summary = mirror.refresh(api, resources=["tasks"])
+
+    assert summary["columns"]["added"] == 3
+    assert [t["id"] for t in mirror.get_tasks(board_id="b1")] == ["t1", "t2"]
+
+
+def test_board_includes_columns(mirror, api):
+    """Тест: get_board возвращает колонки доски, как ожидают скрипты"""
+    mirror.refresh(api)
+
+    board = mirror.get_board("b1")
+
+    assert [c["id"] for c in board["columns"]] == ["c1", "c2"]
+
+
+def test_other_account_resets_mirror(mirror, api):
+    """Тест: зеркало другой компании (API ключа) очищается"""
+    mirror.refresh(api)
+    other = Mock()
+    other.api_key = "other-key"
+    for method in ("get_projects", "get_boards", "get_columns", "get_users", "get_tasks"):
+        getattr(other, method).return_value = []
+
+    mirror.refresh(other, resources=["projects"])
+
+    assert mirror.get_projects() == []
+    assert mirror.get_tasks() == []
+
+
+def test_status(mirror, api):
+    """Тест: состояние синхронизации по ресурсам"""
+    mirror.refresh(api, resources=["projects", "users"])
+
+    status = {row["resource"]: row["count"] for row in mirror.status()}
+
+    assert status == {"projects": 1, "users": 1}
+
+
+def test_tasks_list_offline(mirror, api, capsys):
+    """Тест: tasks.py list работает с зеркалом без запросов к API"""
+    mirror.refresh(api)
+
+    tasks.list_tasks(mirror, limit=2)
+
+    output = capsys.readouterr().out
+    assert "Первая" in output
+    assert "Третья" not in output
+    assert "Найдено задач: 2" in output
@@ -1,10 +1,14 @@
 """
 Тесты для YougileClient
 """
+import json
+import threading
+from itertools import islice
 import pytest
 import responses
 from unittest.mock import patch
 from yougile_client import YougileClient
+from serializer import JsonSerializer, OrjsonSerializer, default_serializer, orjson
 from config import API_BASE_URL
 
 
@@ -15,6 +19,12 @@ def client():
         return YougileClient()
 
 
+@pytest.fixture
+def paged_client():
+    """Клиент со страницами по 50 элементов"""
+    return YougileClient(api_key='test-api-key', page_size=50)
+
+
 def test_client_initialization_without_key():
     """Тест инициализации без API ключа"""
     with patch('yougile_client.YOUGILE_API_KEY', None):
@@ -314,7 +324,7 @@ def test_get_tasks_with_pagination_single_page(client):
     responses.add(
         responses.GET,
         f"{API_BASE_URL}/task-list",
-        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "0"})],
+        match=[responses.matchers.query_param_matcher({"limit": "1000", "offset": "0"})],
         json={
             "paging": {"count": 10, "limit": 50, "offset": 0, "next": False},
             "content": [
@@ -338,7 +348,7 @@ def test_get_tasks_with_pagination_multiple_pages(client):
     responses.add(
         responses.GET,
         f"{API_BASE_URL}/task-list",
-        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "0"})],
+        match=[responses.matchers.query_param_matcher({"limit": "1000", "offset": "0"})],
         json={
             "paging": {"count": 50, "limit": 50, "offset": 0, "next": True},
             "content": [{"id": f"task-{i}", "title": f"Task {i}"} for i in range(1, 51)]
@@ -350,7 +360,7 @@ def test_get_tasks_with_pagination_multiple_pages(client):
     responses.add(
         responses.GET,
         f"{API_BASE_URL}/task-list",
-        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "50"})],
+        match=[responses.matchers.query_param_matcher({"limit": "1000", "offset": "50"})],
         json={
             "paging": {"count": 25, "limit": 50, "offset": 50, "next": False},
             "content": [{"id": f"task-{i}", "title": f"Task {i}"} for i in range(51, 76)]
@@ -417,3 +427,226 @@ def test_unarchive_task(client):
     
     assert result["id"] == "task-1"
     assert result.get("archived") == False
+
+
+def _task_page(start, stop, count, offset, next_page):
+    return {
+        "paging": {"count": count, "limit": 50, "offset": offset, "next": next_page},
+        "content": [{"id": f"task-{i}", "title": f"Task {i}"} for i in range(start, stop)]
+    }
+
+
+@responses.activate
+def test_get_tasks_parallel_pagination_with_total(paged_client):
+    """Тест: при известном общем количестве остальные страницы запрашиваются одновременно"""
+    barrier = threading.Barrier(2, timeout=5)
+    pages = {
+        "0": _task_page(0, 50, 120, 0, True),
+        "50": _task_page(50, 100, 120, 50, True),
+        "100": _task_page(100, 120, 120, 100, False),
+    }
+
+    def callback(request):
+        offset = request.params["offset"]
+        if offset != "0":
+            # Страницы 2 и 3 должны быть в полёте одновременно
+            barrier.wait()
+        return 200, {}, json.dumps(pages[offset])
+
+    responses.add_callback(responses.GET, f"{API_BASE_URL}/task-list", callback=callback)
+
+    tasks = paged_client.get_tasks(all_pages=True)
+
+    assert len(responses.calls) == 3
+    assert [t["id"] for t in tasks] == [f"task-{i}" for i in range(120)]
+
+
+@responses.activate
+def test_get_tasks_pagination_deduplicates_by_id(paged_client):
+    """Тест: задачи, сдвинувшиеся между страницами, не дублируются"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "0"})],
+        json=_task_page(0, 50, 60, 0, True),
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "50"})],
+        json=_task_page(45, 60, 60, 50, False),
+        status=200
+    )
+
+    tasks = paged_client.get_tasks(all_pages=True)
+
+    assert [t["id"] for t in tasks] == [f"task-{i}" for i in range(60)]
+
+
+@responses.activate
+def test_get_tasks_pagination_continues_after_known_total(paged_client):
+    """Тест: если после известного total появились новые страницы, обход продолжается"""
+    for offset, page in (
+        (0, _task_page(0, 50, 100, 0, True)),
+        (50, _task_page(50, 100, 100, 50, True)),
+        (100, _task_page(100, 110, 110, 100, False)),
+    ):
+        responses.add(
+            responses.GET,
+            f"{API_BASE_URL}/task-list",
+            match=[responses.matchers.query_param_matcher({"limit": "50", "offset": str(offset)})],
+            json=page,
+            status=200
+        )
+
+    tasks = paged_client.get_tasks(all_pages=True)
+
+    assert len(tasks) == 110
+    assert tasks[-1]["id"] == "task-109"
+
+
+@responses.activate
+def test_iter_tasks_streams_pages(paged_client):
+    """Тест: iter_tasks отдаёт задачи всех страниц по порядку"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "0"})],
+        json=_task_page(0, 50, 50, 0, True),
+        status=200
+    )
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        match=[responses.matchers.query_param_matcher({"limit": "50", "offset": "50"})],
+        json=_task_page(50, 70, 20, 50, False),
+        status=200
+    )
+
+    tasks = list(paged_client.iter_tasks())
+
+    assert [t["id"] for t in tasks] == [f"task-{i}" for i in range(70)]
+
+
+@responses.activate
+def test_iter_tasks_stops_early(paged_client):
+    """Тест: при досрочной остановке следующие страницы не запрашиваются"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        json=_task_page(0, 50, 50, 0, True),
+        status=200
+    )
+
+    tasks = list(islice(paged_client.iter_tasks(), 10))
+
+    assert len(tasks) == 10
+    assert len(responses.calls) == 1
+
+
+@responses.activate
+def test_iter_tasks_plain_list_response(paged_client):
+    """Тест: iter_tasks работает, если API вернул список без paging"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/tasks",
+        json=[{"id": "task-1"}, {"id": "task-2"}],
+        status=200
+    )
+
+    assert [t["id"] for t in paged_client.iter_tasks(reverse=True)] == ["task-1", "task-2"]
+
+
+@responses.activate
+def test_get_tasks_by_column_uses_server_filter(paged_client):
+    """Тест: задачи колонки запрашиваются с фильтром columnId"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/task-list",
+        match=[responses.matchers.query_param_matcher({"columnId": "col-1", "limit": "50", "offset": "0"})],
+        json={
+            "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+            "content": [{"id": "task-1", "columnId": "col-1"}]
+        },
+        status=200
+    )
+
+    tasks = paged_client.get_tasks(column_id="col-1")
+
+    assert [t["id"] for t in tasks] == ["task-1"]
+
+
+@responses.activate
+def test_get_tasks_by_board_fetches_columns(paged_client):
+    """Тест: задачи доски - колонки доски, затем задачи каждой колонки"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/columns",
+        match=[responses.matchers.query_param_matcher({"boardId": "board-1", "limit": "50", "offset": "0"})],
+        json=[{"id": "col-1", "boardId": "board-1"}, {"id": "col-2", "boardId": "board-1"}],
+        status=200
+    )
+    for column_id in ("col-1", "col-2"):
+        responses.add(
+            responses.GET,
+            f"{API_BASE_URL}/task-list",
+            match=[responses.matchers.query_param_matcher(
+                {"columnId": column_id, "limit": "50", "offset": "0"})],
+            json={
+                "paging": {"count": 1, "limit": 50, "offset": 0, "next": False},
+                "content": [{"id": f"task-{column_id}", "columnId": column_id}]
+            },
+            status=200
+        )
+
+    tasks = paged_client.get_tasks(board_id="board-1")
+
+    # Порядок задач соответствует порядку колонок
+    assert [t["id"] for t in tasks] == ["task-col-1", "task-col-2"]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_get_boards_by_project(paged_client):
+    """Тест: доски проекта запрашиваются с фильтром projectId"""
+    responses.add(
+        responses.GET,
+        f"{API_BASE_URL}/boards",
+        match=[responses.matchers.query_param_matcher({"projectId": "proj-1", "limit": "50", "offset": "0"})],
+        json=[{"id": "board-1", "projectId": "proj-1"}],
+        status=200
+    )
+
+    boards = paged_client.get_boards(project_id="proj-1")
+
+    assert boards[0]["id"] == "board-1"
+
+
+@pytest.mark.parametrize("serializer", [JsonSerializer(), OrjsonSerializer()] if orjson else [JsonSerializer()],
+                         ids=lambda s: s.name)
+@responses.activate
+def test_serializer_round_trip(serializer):
+    """Тест: тело запроса кодируется и ответ разбирается выбранным сериализатором"""
+    client = YougileClient(api_key="test-key", serializer=serializer)
+    responses.add(
+        responses.POST,
+        f"{API_BASE_URL}/tasks",
+        match=[responses.matchers.json_params_matcher({"title": "Задача <b>1</b>", "columnId": "col-1"})],
+        json={"id": "task-1", "title": "Задача <b>1</b>"},
+        status=201
+    )
+
+    task = client.create_task("Задача <b>1</b>", "col-1")
+
+    assert task["title"] == "Задача <b>1</b>"
+    assert responses.calls[0].request.headers["Content-Type"] == "application/json"
+
+
+def test_default_serializer_prefers_orjson():
+    """Тест: orjson используется по умолчанию, если установлен"""
+    client = YougileClient(api_key="test-key")
+
+    assert client.serializer.name == ("orjson" if orjson else "json")
+    with patch("serializer.orjson", None):
+        assert default_serializer().name == "json"
@@ -4,100 +4,107 @@
 """
 import sys
 from yougile_client import YougileClient
+from bulk import BulkExecutor, Skip, SKIPPED, print_summary
+from exceptions import NotFound
 from config import require_board_context
 from import_tasks import parse_markdown_tasks, markdown_to_html
+from planner import format_plan, plan_update_descriptions
 
 
-def update_task_descriptions(tasks_data, board_id):
+def update_task_descriptions(tasks_data, board_id, max_failures=None):
     """
     Обновляет описания задач и подзадач на доске
     
     Args:
         tasks_data: Список задач из parse_markdown_tasks
         board_id: ID доски
+        max_failures: Остановиться после стольких ошибок (по умолчанию - если ошибок
+                      больше половины, см. bulk.DEFAULT_FAILURE_RATE)
+    
+    Returns:
+        bulk.BulkReport с результатом по каждой задаче файла
     """
     client = YougileClient()
     
-    # Получаем все задачи доски
-    all_columns = client.get_columns()
-    board_column_ids = {col['id'] for col in all_columns if col.get('boardId') == board_id}
-    
-    all_tasks = client.get_tasks(all_pages=True)
-    board_tasks = [t for t in all_tasks if t.get('columnId') in board_column_ids and not t.get('archived')]
+    # Получаем задачи доски (только её колонки, фильтр на стороне сервера)
+    board_tasks = [t for t in client.index.tasks_of_board(board_id) if not t.get('archived')]
+    # Сопоставляем задачи по названию (при совпадении названий - первая на доске)
+    by_title = {}
+    for task in board_tasks:
+        by_title.setdefault(task['title'], task)
     
     print(f"\n{'='*60}")
     print(f"Обновление описаний для {len(tasks_data)} задач")
     print(f"Найдено задач на доске: {len(board_tasks)}")
     print(f"{'='*60}\n")
     
-    updated_count = 0
-    failed_count = 0
-    
-    # Сопоставляем задачи по названию
-    for task_data in tasks_data:
-        task_title = task_data['title']
+    def update(task_data):
+        """Описание задачи и её подзадач; возвращает строки для вывода и число обновлений"""
+        board_task = by_title.get(task_data['title'])
+        if not board_task:
+            raise Skip("задача не найдена на доске")
         
-        # Находим соответствующую задачу на доске
-        board_task = next((t for t in board_tasks if t['title'] == task_title), None)
+        lines = []
+        updated = 0
         
-        if not board_task:
-            print(f"⚠️  Задача не найдена на доске: {task_title}")
-            failed_count += 1
-            continue
+        # Обновляем описание основной задачи
+        task_desc = task_data.get('description', '')
+        if task_desc:
+            client.update_task(board_task['id'], description=markdown_to_html(task_desc))
+            lines.append(f"✓ Обновлена: {task_data['title']}")
+            updated += 1
         
-        try:
-            # Обновляем описание основной задачи
-            task_desc = task_data.get('description', '')
-            if task_desc:
-                task_desc_html = markdown_to_html(task_desc)
-                client.update_task(board_task['id'], description=task_desc_html)
-                print(f"✓ Обновлена: {task_title}")
-                updated_count += 1
+        # Обновляем описания подзадач
+        subtasks_data = task_data.get('subtasks', [])
+        if subtasks_data and board_task.get('subtasks'):
+            lines.append(f"   └─ Подзадач: {len(subtasks_data)}")
+            
+            # Подзадачи с доски (удалённые пропускаем)
+            board_subtasks = {}
+            for subtask_id in board_task['subtasks']:
+                try:
+                    subtask = client.get_task(subtask_id)
+                except NotFound:
+                    continue
+                board_subtasks.setdefault(subtask['title'], subtask)
             
-            # Обновляем описания подзадач
-            subtasks_data = task_data.get('subtasks', [])
-            if subtasks_data and board_task.get('subtasks'):
-                print(f"   └─ Подзадач: {len(subtasks_data)}")
+            # Сопоставляем подзадачи по названию
+            for subtask_data in subtasks_data:
+                subtask_title = subtask_data['title']
+                board_subtask = board_subtasks.get(subtask_title)
                 
-                # Получаем подзадачи с доски
-                board_subtask_ids = board_task['subtasks']
-                board_subtasks = []
-                for subtask_id in board_subtask_ids:
-                    try:
-                        board_subtasks.append(client.get_task(subtask_id))
-                    except:
-                        pass
+                if not board_subtask:
+                    lines.append(f"      ⚠️  Подзадача не найдена: {subtask_title}")
+                    continue
                 
-                # Сопоставляем подзадачи по названию
-                for subtask_data in subtasks_data:
-                    subtask_title = subtask_data['title']
-                    subtask_desc = subtask_data.get('description', '')
-                    
-                    # Находим соответствующую подзадачу
-                    board_subtask = next((st for st in board_subtasks if st['title'] == subtask_title), None)
-                    
-                    if not board_subtask:
-                        print(f"      ⚠️  Подзадача не найдена: {subtask_title}")
-                        continue
-                    
-                    if subtask_desc:
-                        subtask_desc_html = markdown_to_html(subtask_desc)
-                        client.update_task(board_subtask['id'], description=subtask_desc_html)
-                        print(f"      ✓ {subtask_title}")
-                        updated_count += 1
-            
-            print()
-            
-        except Exception as e:
-            failed_count += 1
-            print(f"✗ Ошибка обновления {task_title}: {e}\n")
+                subtask_desc = subtask_data.get('description', '')
+                if subtask_desc:
+                    client.update_task(board_subtask['id'], description=markdown_to_html(subtask_desc))
+                    lines.append(f"      ✓ {subtask_title}")
+                    updated += 1
+        
+        return lines, updated
+    
+    def show(result):
+        title = result.item['title']
+        if result.ok:
+            print("\n".join(result.value[0] + [""]))
+        elif result.status == SKIPPED:
+            print(f"⚠️  Задача не найдена на доске: {title}")
+        else:
+            print(f"✗ Ошибка обновления {title}: {result.error}\n")
+    
+    # Задачи файла независимы - обновляем одновременно в пределах лимита запросов,
+    # подзадачи одной задачи - по очереди внутри её операции
+    executor = BulkExecutor(client, max_failures=max_failures, on_result=show)
+    report = executor.run([(task_data, lambda task_data=task_data: update(task_data))
+                           for task_data in tasks_data])
     
     # Итоги
-    print(f"{'='*60}")
+    updated_count = sum(r.value[1] for r in report.results if r.ok)
+    print_summary(report, "Обработано задач")
     print(f"✓ Обновлено описаний: {updated_count}")
-    if failed_count > 0:
-        print(f"✗ Ошибок: {failed_count}")
-    print(f"{'='*60}")
+    return report
 
 
 if __name__ == "__main__":
@@ -107,6 +114,8 @@ if __name__ == "__main__":
     parser.add_argument('file', help='Путь к markdown файлу с задачами')
     parser.add_argument('--board-id', help='ID доски (по умолчанию из контекста)')
     parser.add_argument('--limit', type=int, help='Обновить только N задач')
+    parser.add_argument('--dry-run', action='store_true', help='Только показать план: запросы к API и время')
+    parser.add_argument('--max-failures', type=int, help='Остановиться после N ошибок')
     
     args = parser.parse_args()
     
@@ -128,6 +137,11 @@ if __name__ == "__main__":
         
         print(f"✓ Найдено задач для обновления: {len(tasks)}")
         
+        if args.dry_run:
+            columns = YougileClient().index.columns_of(board_id)
+            print(f"\n{format_plan(plan_update_descriptions(tasks, board_columns=len(columns)))}")
+            sys.exit(0)
+        
         # Подтверждение
         total_items = len(tasks) + sum(len(t.get('subtasks', [])) for t in tasks)
         response = input(f"\nОбновить описания для {len(tasks)} задач и их подзадач (всего ~{total_items} описаний)? (yes/no): ")
@@ -136,7 +150,7 @@ if __name__ == "__main__":
             sys.exit(0)
         
         # Обновляем описания
-        update_task_descriptions(tasks, board_id)
+        update_task_descriptions(tasks, board_id, max_failures=args.max_failures)
         
     except KeyboardInterrupt:
         print("\n✗ Прервано пользователем")
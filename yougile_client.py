@@ -1,78 +1,290 @@
 """
 Базовый клиент для работы с Yougile API
 """
+import hashlib
+import os
+import threading
+import time
 import requests
-from typing import Optional, Dict, Any, List
-from config import API_BASE_URL, YOUGILE_API_KEY, get_headers
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Optional, Dict, Any, List, Callable, Iterable, Iterator, Union
+from config import (API_BASE_URL, YOUGILE_API_KEY, RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD,
+                    RATE_LIMIT_STATE, RATE_LIMIT_PRIORITY,
+                    RETRY_MAX_ATTEMPTS, CONCURRENCY, REQUEST_TIMEOUT, PAGING_STATS_FILE,
+                    CACHE_DIR, STATS_FILE, get_headers)
+from cache import CacheHook, ResponseCache
+from entity_index import EntityIndex
+from exceptions import YougileError, APIError, RateLimited, TransportError, error_for_status
+from hooks import HookChain, RequestContext, RequestHook
+from metrics import ClientMetrics, MetricsHook, dump_at_exit
+from models import Task
+from pagination import (Paginator, PageSizeTuner, MAX_PAGE_SIZE, is_page_size_error, merge_pages,
+                        paging_total)
+from rate_limiter import TokenBucket, parse_retry_after, shared_rate_limiter
+from retry import RetryHook, RetryPolicy
+from serializer import default_serializer
+from singleflight import SingleFlight
 
 
 class YougileClient:
     """Клиент для работы с Yougile API v2.0"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, rate_limiter: Optional[TokenBucket] = None,
+                 retry_policy: Optional[RetryPolicy] = None, concurrency: Optional[int] = None,
+                 page_size: Optional[int] = None, cache: Optional[ResponseCache] = None,
+                 serializer=None, metrics: Union[ClientMetrics, bool, None] = None,
+                 base_url: Optional[str] = None):
         """
         Инициализация клиента
         
         Args:
             api_key: API ключ (если не указан, берется из переменных окружения)
+            rate_limiter: Ограничитель частоты запросов (по умолчанию 50 req/min; общий
+                          для процессов с этим ключом, если задан YOUGILE_RATE_LIMIT_STATE)
+            retry_policy: Политика повторов (по умолчанию RETRY_MAX_ATTEMPTS попыток)
+            concurrency: Максимум одновременных запросов из разных потоков
+                         (по умолчанию CONCURRENCY), определяет размер пула соединений
+            page_size: Максимальный размер страницы списков (по умолчанию MAX_PAGE_SIZE,
+                       уменьшается автоматически при ошибках объёма и таймаутах)
+            cache: Дисковый кэш ответов (по умолчанию включается, если задан
+                   YOUGILE_CACHE_DIR)
+            serializer: Сериализатор JSON (по умолчанию orjson, если установлен)
+            metrics: Статистика запросов (по умолчанию своя у каждого клиента,
+                     выгружается при выходе в YOUGILE_STATS_FILE, если он задан);
+                     False - не собирать
+        
+        Кэш, повторы и статистика подключаются встроенными хуками (CacheHook,
+        RetryHook, MetricsHook) в начало цепочки self.hooks. Без них
+        (retry_policy=NO_RETRY, metrics=False, без кэша) цепочка пуста и
+        запросы идут без RequestContext.
+            base_url: Базовый URL API (по умолчанию API_BASE_URL / YOUGILE_API_URL)
         """
         self.api_key = api_key or YOUGILE_API_KEY
         if not self.api_key:
             raise ValueError("API ключ не найден. Запустите auth.py для получения ключа")
         
-        self.base_url = API_BASE_URL
+        self.base_url = (base_url or API_BASE_URL).rstrip('/')
         self.session = requests.Session()
         self.session.headers.update(get_headers(self.api_key))
+        self.concurrency = max(1, concurrency or CONCURRENCY)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        if rate_limiter is None and RATE_LIMIT_STATE:
+            rate_limiter = shared_rate_limiter(RATE_LIMIT_STATE, self.api_key, RATE_LIMIT_REQUESTS,
+                                               RATE_LIMIT_PERIOD, priority=RATE_LIMIT_PRIORITY)
+        self.rate_limiter = rate_limiter or TokenBucket(RATE_LIMIT_REQUESTS, RATE_LIMIT_PERIOD)
+        self.retry_policy = retry_policy or RetryPolicy(max_attempts=RETRY_MAX_ATTEMPTS)
+        self.timeout = REQUEST_TIMEOUT
+        if cache is None and CACHE_DIR:
+            # Отдельный каталог на каждый API ключ: у разных компаний разные данные
+            key_hash = hashlib.sha256(self.api_key.encode('utf-8')).hexdigest()[:16]
+            cache = ResponseCache(os.path.join(CACHE_DIR, key_hash))
+        self.cache = cache
+        self.serializer = serializer or default_serializer()
+        self.hooks = HookChain()
+        if cache is not None:
+            self.hooks.add(CacheHook(cache))
+        if self.retry_policy.max_attempts > 1:
+            self.hooks.add(RetryHook(self.retry_policy))
+        self.metrics = None if metrics is False else metrics or ClientMetrics()
+        if self.metrics is not None:
+            self.hooks.add(MetricsHook(self.metrics))
+            dump_at_exit(self.metrics, STATS_FILE)
+        self._in_flight = SingleFlight()
+        self.paginator = Paginator(self.get, self._map_concurrently,
+                                   PageSizeTuner(PAGING_STATS_FILE, max_size=page_size or MAX_PAGE_SIZE),
+                                   get_page=self._get_page)
+        self._index: Optional[EntityIndex] = None
+        self._index_lock = threading.Lock()
+    
+    def add_hook(self, hook: RequestHook) -> RequestHook:
+        """
+        Подключить хук жизненного цикла запроса (трассировка, прогресс, логирование)
+        
+        Args:
+            hook: Наследник hooks.RequestHook с методами before_request,
+                  after_response, on_error и/или on_result (вызывается после
+                  встроенных хуков кэша, повторов и статистики)
+        """
+        return self.hooks.add(hook)
     
-    def _request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    def remove_hook(self, hook: RequestHook):
+        """Отключить хук"""
+        self.hooks.remove(hook)
+    
+    def stats(self) -> Dict[str, Dict[str, Any]]:
         """
-        Выполнить HTTP запрос к API
+        Статистика запросов по шаблонам endpoint'ов
+        
+        Returns:
+            {'GET task-list': {'count', 'statuses', 'bytes_sent', 'bytes_received',
+            'retries', 'limiter_wait_seconds', 'latency_seconds': {'total', 'p50',
+            'p95', 'p99', 'max'}}, ...} по убыванию затраченного времени
+        """
+        return self.metrics.snapshot() if self.metrics is not None else {}
+    
+    @property
+    def index(self) -> EntityIndex:
+        """Индекс связей проектов, досок, колонок и задач (создаётся при первом обращении)"""
+        if self._index is None:
+            with self._index_lock:
+                if self._index is None:
+                    self._index = EntityIndex(self)
+        return self._index
+    
+    def _request(self, method: str, endpoint: str, retry_guard: Optional[Callable[[], Any]] = None,
+                 no_retry: Optional[Callable[[Exception], bool]] = None,
+                 timing: Optional[List[float]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Выполнить HTTP запрос к API с повторами временных ошибок
+        
+        Одинаковые GET, выполняющиеся одновременно в разных потоках
+        (AsyncYougileClient, параллельная пагинация), объединяются в один
+        сетевой вызов: остальные потоки получают его результат.
         
         Args:
             method: HTTP метод (GET, POST, PUT, DELETE)
             endpoint: Endpoint API (без базового URL)
+            retry_guard: Для POST - функция, вызываемая перед повтором; если она
+                         вернёт не None (объект уже создан), повтор не выполняется
+            no_retry: Ошибки, которые не повторяются, даже если политика разрешает
+            timing: Сюда добавляется время передачи каждой попытки (без ожидания
+                    ограничителя частоты и пауз между повторами)
             **kwargs: Дополнительные параметры для requests
         
         Returns:
             Ответ API в виде словаря
+        
+        Raises:
+            NotFound, RateLimited, ServerError, APIError: Ошибка HTTP
+            TransportError: Ошибка сети
         """
-        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        if method == "GET" and retry_guard is None:
+            # Одинаковые одновременные GET из разных потоков - один сетевой вызов
+            key = (endpoint, _freeze(kwargs.get("params")), _freeze(kwargs.get("headers")))
+            return self._in_flight.do(key, lambda: self._perform(method, endpoint, no_retry=no_retry,
+                                                                 timing=timing, **kwargs))
+        return self._perform(method, endpoint, retry_guard=retry_guard, no_retry=no_retry, timing=timing, **kwargs)
+    
+    def _perform(self, method: str, endpoint: str, retry_guard: Optional[Callable[[], Any]] = None,
+                 no_retry: Optional[Callable[[Exception], bool]] = None,
+                 timing: Optional[List[float]] = None, **kwargs) -> Dict[str, Any]:
+        """
+        Запрос через цепочку хуков (см. _request)
+        
+        Кэш, повторы и статистика - встроенные хуки (CacheHook, RetryHook,
+        MetricsHook): хук может ответить без запроса или вместо ошибки
+        (ctx.result) и запросить повтор (on_error вернул True).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        hooks = self.hooks
+        if not hooks:
+            # Пустая цепочка: одна попытка без RequestContext
+            return self._decode(self._send(method, endpoint, timing, **kwargs))
         
+        ctx = RequestContext(method, endpoint, kwargs, retry_guard, no_retry)
+        while True:
+            hooks.before_request(ctx)
+            if ctx.result is not None:
+                return ctx.result
+            try:
+                response = self._send(method, endpoint, timing, ctx, **ctx.kwargs)
+            except YougileError as e:
+                retry = hooks.on_error(ctx, e)
+                if ctx.result is not None:
+                    return ctx.result
+                if not retry:
+                    raise
+                ctx.attempt += 1
+                continue
+            if ctx.result is not None:
+                return ctx.result
+            result = self._decode(response)
+            hooks.on_result(ctx, result)
+            return result
+    
+    def _send(self, method: str, endpoint: str, timing: Optional[List[float]] = None,
+              ctx: Optional[RequestContext] = None, **kwargs) -> requests.Response:
+        """Одна попытка HTTP запроса (ctx - если цепочка хуков не пуста)"""
+        url = f"{self.base_url}/{endpoint.lstrip('/')}"
+        waited = self.rate_limiter.acquire()
+        started = time.perf_counter()
         try:
             response = self.session.request(method, url, **kwargs)
-            response.raise_for_status()
-            
-            # Если ответ пустой (например, при DELETE)
-            if response.status_code == 204 or not response.content:
-                return {"success": True}
-            
-            return response.json()
+        except requests.exceptions.RequestException as e:
+            elapsed = time.perf_counter() - started
+            if timing is not None:
+                timing.append(elapsed)
+            if ctx is not None:
+                ctx.limiter_wait, ctx.started, ctx.elapsed = waited, started, elapsed
+            raise TransportError(f"Ошибка запроса: {str(e)}", original=e) from e
         
-        except requests.exceptions.HTTPError as e:
-            error_msg = f"HTTP ошибка: {e.response.status_code}"
-            try:
-                error_data = e.response.json()
-                if 'error' in error_data:
-                    error_msg += f" - {error_data['error']}"
-            except:
-                error_msg += f" - {e.response.text}"
-            
-            raise Exception(error_msg)
+        elapsed = time.perf_counter() - started
+        if timing is not None:
+            timing.append(elapsed)
+        if ctx is not None:
+            ctx.limiter_wait, ctx.started, ctx.elapsed = waited, started, elapsed
+            ctx.response = response
+            self.hooks.after_response(ctx, response)
+        self.rate_limiter.update_from_headers(response.headers, response.status_code)
         
-        except requests.exceptions.RequestException as e:
-            raise Exception(f"Ошибка запроса: {str(e)}")
+        if response.status_code >= 400:
+            raise self._http_error(response)
+        
+        return response
+    
+    def _decode(self, response: requests.Response) -> Dict[str, Any]:
+        """Тело ответа в виде словаря/списка (разбирается сразу из байтов)"""
+        # Если ответ пустой (например, при DELETE)
+        if response.status_code == 204 or not response.content:
+            return {"success": True}
+        
+        return self.serializer.loads(response.content)
+    
+    def _encode(self, data: Optional[Dict]) -> Optional[bytes]:
+        """Тело POST/PUT запроса (Content-Type: application/json задан в заголовках сессии)"""
+        return None if data is None else self.serializer.dumps(data)
+    
+    @staticmethod
+    def _http_error(response) -> APIError:
+        """Построить типизированное исключение по ответу с ошибкой"""
+        error_msg = f"HTTP ошибка: {response.status_code}"
+        error = None
+        try:
+            error_data = response.json()
+            if isinstance(error_data, dict) and 'error' in error_data:
+                error = str(error_data['error'])
+                error_msg += f" - {error}"
+        except ValueError:
+            error_msg += f" - {response.text}"
+        
+        error_class = error_for_status(response.status_code)
+        if error_class is RateLimited:
+            return RateLimited(error_msg, response=response, error=error,
+                               retry_after=parse_retry_after(response.headers.get('Retry-After')))
+        return error_class(error_msg, response.status_code, response=response, error=error)
     
     def get(self, endpoint: str, params: Optional[Dict] = None) -> Dict[str, Any]:
         """GET запрос"""
         return self._request("GET", endpoint, params=params)
     
-    def post(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
-        """POST запрос"""
-        return self._request("POST", endpoint, json=data)
+    def _get_page(self, endpoint: str, params: Dict, timing: List[float]) -> Dict[str, Any]:
+        """
+        Страница списка для Paginator: таймаут и ошибки объёма не повторяются с тем
+        же размером - Paginator сразу делит страницу; в timing - время передачи
+        """
+        return self._request("GET", endpoint, no_retry=is_page_size_error, timing=timing, params=params)
+    
+    def post(self, endpoint: str, data: Optional[Dict] = None,
+             retry_guard: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+        """POST запрос (повторяется при сбоях только с retry_guard, см. _request)"""
+        return self._request("POST", endpoint, retry_guard=retry_guard, data=self._encode(data))
     
     def put(self, endpoint: str, data: Optional[Dict] = None) -> Dict[str, Any]:
         """PUT запрос"""
-        return self._request("PUT", endpoint, json=data)
+        return self._request("PUT", endpoint, data=self._encode(data))
     
     def delete(self, endpoint: str) -> Dict[str, Any]:
         """DELETE запрос"""
@@ -81,14 +293,8 @@ class YougileClient:
     # === Проекты ===
     
     def get_projects(self) -> List[Dict[str, Any]]:
-        """Получить список всех проектов"""
-        result = self.get("projects")
-        # API может вернуть объект с полем content или напрямую список
-        if isinstance(result, dict) and 'content' in result:
-            return result['content']
-        elif isinstance(result, list):
-            return result
-        return [result]
+        """Получить список всех проектов (все страницы)"""
+        return self.paginator.get_all("projects")
     
     def get_project(self, project_id: str) -> Dict[str, Any]:
         """Получить проект по ID"""
@@ -119,14 +325,15 @@ class YougileClient:
     
     # === Доски ===
     
-    def get_boards(self) -> List[Dict[str, Any]]:
-        """Получить список всех досок"""
-        result = self.get("boards")
-        if isinstance(result, dict) and 'content' in result:
-            return result['content']
-        elif isinstance(result, list):
-            return result
-        return [result]
+    def get_boards(self, project_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Получить список досок
+        
+        Args:
+            project_id: Только доски проекта (фильтр на стороне сервера)
+        """
+        params = {"projectId": project_id} if project_id else None
+        return self.paginator.get_all("boards", params=params)
     
     def get_board(self, board_id: str) -> Dict[str, Any]:
         """Получить доску по ID"""
@@ -142,26 +349,39 @@ class YougileClient:
         """
         data = {"title": title}
         data.update(kwargs)
-        return self.post("boards", data)
+        result = self.post("boards", data)
+        if self._index is not None:
+            self._index.board_created(dict(data, id=result.get('id')))
+        return result
     
     def update_board(self, board_id: str, **kwargs) -> Dict[str, Any]:
         """Обновить доску"""
-        return self.put(f"boards/{board_id}", kwargs)
+        result = self.put(f"boards/{board_id}", kwargs)
+        if self._index is not None:
+            if kwargs.get('deleted'):
+                self._index.board_deleted(board_id)
+            else:
+                self._index.board_updated(board_id, kwargs)
+        return result
     
     def delete_board(self, board_id: str) -> Dict[str, Any]:
         """Удалить доску"""
-        return self.delete(f"boards/{board_id}")
+        result = self.delete(f"boards/{board_id}")
+        if self._index is not None:
+            self._index.board_deleted(board_id)
+        return result
     
     # === Колонки ===
     
-    def get_columns(self) -> List[Dict[str, Any]]:
-        """Получить список всех колонок"""
-        result = self.get("columns")
-        if isinstance(result, dict) and 'content' in result:
-            return result['content']
-        elif isinstance(result, list):
-            return result
-        return [result]
+    def get_columns(self, board_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Получить список колонок
+        
+        Args:
+            board_id: Только колонки доски (фильтр на стороне сервера)
+        """
+        params = {"boardId": board_id} if board_id else None
+        return self.paginator.get_all("columns", params=params)
     
     def get_column(self, column_id: str) -> Dict[str, Any]:
         """Получить колонку по ID"""
@@ -171,19 +391,34 @@ class YougileClient:
         """Создать новую колонку"""
         data = {"title": title, "boardId": board_id}
         data.update(kwargs)
-        return self.post("columns", data)
+        result = self.post("columns", data)
+        if self._index is not None:
+            self._index.column_created(dict(data, id=result.get('id')))
+        return result
     
     def update_column(self, column_id: str, **kwargs) -> Dict[str, Any]:
         """Обновить колонку"""
-        return self.put(f"columns/{column_id}", kwargs)
+        result = self.put(f"columns/{column_id}", kwargs)
+        if self._index is not None:
+            if kwargs.get('deleted'):
+                self._index.column_deleted(column_id)
+            else:
+                self._index.column_updated(column_id, kwargs)
+        return result
     
     def delete_column(self, column_id: str) -> Dict[str, Any]:
         """Удалить колонку"""
-        return self.delete(f"columns/{column_id}")
+        result = self.delete(f"columns/{column_id}")
+        if self._index is not None:
+            self._index.column_deleted(column_id)
+        return result
     
     # === Задачи ===
     
-    def get_tasks(self, reverse: bool = False, all_pages: bool = True) -> List[Dict[str, Any]]:
+    def get_tasks(self, reverse: bool = False, all_pages: bool = True,
+                  column_id: Optional[Union[str, List[str]]] = None,
+                  board_id: Optional[str] = None,
+                  fields: Optional[Iterable[str]] = None) -> List[Any]:
         """
         Получить список задач
         
@@ -191,77 +426,133 @@ class YougileClient:
             reverse: Если True, использует /tasks (обратный порядок)
                     Если False, использует /task-list (прямой порядок)
             all_pages: Если True, получает все страницы (по умолчанию)
+            column_id: Только задачи колонки (или списка колонок) - фильтр
+                       columnId на стороне сервера
+            board_id: Только задачи доски - колонки доски запрашиваются
+                      одновременно, каждая со своим фильтром columnId
+            fields: Поля API, которые нужно сохранить (например, ["title", "columnId"]).
+                    Если указаны, возвращаются компактные модели models.Task вместо
+                    словарей; описание загружается при обращении к task.description
         """
         endpoint = "tasks" if reverse else "task-list"
+        transform = self._task_model(fields)
         
-        if not all_pages:
-            result = self.get(endpoint)
-            if isinstance(result, dict) and 'content' in result:
-                return result['content']
-            elif isinstance(result, list):
-                return result
-            return [result]
+        if board_id is not None:
+            column_id = [col['id'] for col in self.get_columns(board_id=board_id)
+                         if col.get('boardId', board_id) == board_id]
         
-        # Получаем все страницы
-        all_tasks = []
-        offset = 0
-        limit = 50
+        if isinstance(column_id, (list, tuple, set)):
+            per_column = self._map_concurrently(
+                lambda cid: self.get_tasks(reverse=reverse, all_pages=all_pages, column_id=cid, fields=fields),
+                list(column_id)
+            )
+            return merge_pages(per_column)
         
-        while True:
-            result = self.get(f"{endpoint}?limit={limit}&offset={offset}")
-            
+        params = {"columnId": column_id} if column_id else None
+        
+        if not all_pages:
+            result = self.get(endpoint, params=params)
             if isinstance(result, dict) and 'content' in result:
-                all_tasks.extend(result['content'])
-                
-                # Проверяем, есть ли еще страницы
-                if not result.get('paging', {}).get('next', False):
-                    break
-                    
-                offset += limit
+                items = result['content']
             elif isinstance(result, list):
-                all_tasks.extend(result)
-                break
+                items = result
             else:
-                all_tasks.append(result)
-                break
+                items = [result]
+            return [transform(item) for item in items] if transform else items
         
-        return all_tasks
+        return self.paginator.get_all(endpoint, params=params, transform=transform)
+    
+    def iter_tasks(self, reverse: bool = False, page_size: Optional[int] = None,
+                   column_id: Optional[str] = None,
+                   fields: Optional[Iterable[str]] = None) -> Iterator[Any]:
+        """
+        Перебрать задачи постранично, не загружая весь список в память
+        
+        Следующая страница запрашивается только когда предыдущая исчерпана,
+        поэтому можно остановиться раньше (например, через itertools.islice).
+        
+        Args:
+            reverse: Если True, использует /tasks (обратный порядок)
+            page_size: Размер страницы (по умолчанию подбирается автоматически)
+            column_id: Только задачи колонки (фильтр на стороне сервера)
+            fields: Поля API для компактных моделей models.Task (см. get_tasks)
+        """
+        endpoint = "tasks" if reverse else "task-list"
+        params = {"columnId": column_id} if column_id else None
+        return self.paginator.iterate(endpoint, params=params, limit=page_size,
+                                      transform=self._task_model(fields))
+    
+    def count_tasks(self, column_id: Optional[str] = None) -> int:
+        """
+        Число задач компании (или колонки) - один запрос страницы из одного элемента
+        
+        Если сервер не сообщил общее количество, возвращается число полученных
+        элементов (то есть оценка снизу).
+        """
+        params: Dict[str, Any] = {"limit": 1, "offset": 0}
+        if column_id:
+            params["columnId"] = column_id
+        result = self.get("task-list", params=params)
+        if not isinstance(result, dict) or 'content' not in result:
+            return len(result) if isinstance(result, list) else 1
+        total = paging_total(result)
+        return total if total is not None else len(result['content'])
+    
+    def _task_model(self, fields: Optional[Iterable[str]]) -> Optional[Callable[[Dict[str, Any]], Task]]:
+        """Преобразование ответа API в models.Task с нужными полями (None - без преобразования)"""
+        if fields is None:
+            return None
+        fields = Task.check_fields(fields)
+        return lambda item: Task.from_api(item, fields, loader=self.get_task)
+    
+    def _map_concurrently(self, func: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """Применить func к items в пуле из self.concurrency потоков, сохранив порядок"""
+        if len(items) <= 1 or self.concurrency == 1:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(items))) as executor:
+            return list(executor.map(func, items))
     
     def get_task(self, task_id: str) -> Dict[str, Any]:
         """Получить задачу по ID"""
         return self.get(f"tasks/{task_id}")
     
-    def create_task(self, title: str, column_id: str, **kwargs) -> Dict[str, Any]:
+    def create_task(self, title: str, column_id: str,
+                    retry_guard: Optional[Callable[[], Any]] = None, **kwargs) -> Dict[str, Any]:
         """
         Создать новую задачу
         
         Args:
             title: Название задачи
             column_id: ID колонки
+            retry_guard: Проверка перед повтором POST (см. _request)
             **kwargs: Дополнительные параметры (description, assigned, deadline и т.д.)
         """
         data = {"title": title, "columnId": column_id}
         data.update(kwargs)
-        return self.post("tasks", data)
+        result = self.post("tasks", data, retry_guard=retry_guard)
+        if self._index is not None:
+            self._index.task_created(result.get('id'), column_id)
+        return result
     
     def update_task(self, task_id: str, **kwargs) -> Dict[str, Any]:
         """Обновить задачу"""
-        return self.put(f"tasks/{task_id}", kwargs)
+        result = self.put(f"tasks/{task_id}", kwargs)
+        if self._index is not None:
+            self._index.task_updated(task_id, kwargs)
+        return result
     
     def delete_task(self, task_id: str) -> Dict[str, Any]:
         """Удалить задачу"""
-        return self.delete(f"tasks/{task_id}")
+        result = self.delete(f"tasks/{task_id}")
+        if self._index is not None:
+            self._index.task_deleted(task_id)
+        return result
     
     # === Пользователи ===
     
     def get_users(self) -> List[Dict[str, Any]]:
-        """Получить список пользователей компании"""
-        result = self.get("users")
-        if isinstance(result, dict) and 'content' in result:
-            return result['content']
-        elif isinstance(result, list):
-            return result
-        return [result]
+        """Получить список пользователей компании (все страницы)"""
+        return self.paginator.get_all("users")
     
     def get_user(self, user_id: str) -> Dict[str, Any]:
         """Получить пользователя по ID"""
@@ -272,3 +563,12 @@ class YougileClient:
     def get_company(self) -> Dict[str, Any]:
         """Получить информацию о компании"""
         return self.get("companies")
+
+
+def _freeze(value: Any) -> Any:
+    """Хешируемое представление параметров запроса"""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value